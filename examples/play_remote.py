@@ -0,0 +1,40 @@
+import sys
+
+import anyio
+
+from bracket_city_mcp.client import SessionPool
+from bracket_city_mcp.game import Game
+
+# Plays many games at once against a running server, answering from a local
+# copy of the puzzle: python examples/play_remote.py http://localhost:8080/mcp 100
+PUZZLE_FILE = "games/json/20250110.json"
+
+
+async def play(pool: SessionPool, answers: Game) -> int:
+    game = await pool.new_game()
+    while not game.completed:
+        # Every available clue can be answered at once: one batch per round.
+        await game.answer_many([
+            (clue_id, answers.clues[clue_id].answer)
+            for clue_id in game.available_clues if not answers.clues[clue_id].is_end_clue
+        ])
+    return game.score
+
+
+async def main(url: str, games: int):
+    answers = Game.from_json_file(PUZZLE_FILE)
+    scores = []
+
+    async def play_one():
+        scores.append(await play(pool, answers))
+
+    async with SessionPool(url, size=4) as pool:
+        async with anyio.create_task_group() as tasks:
+            for _ in range(games):
+                tasks.start_soon(play_one)
+    print(f"Played {len(scores)} games with {pool.calls} calls; mean score {sum(scores) / len(scores):.1f}.")
+
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8080/mcp"
+    anyio.run(main, url, int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,276 @@
+import os
+import sys
+import json
+import time
+import argparse
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # Reported by main(); the per-puzzle analysis does not need it.
+    np = None
+
+from bracket_city_mcp.game import Game
+
+DEFAULT_JSON_DIR = os.path.join("games", "json")
+
+# Numeric per-puzzle metrics that are aggregated into the distribution report.
+METRICS = [
+    "clues",
+    "start_clues",
+    "end_clues",
+    "max_depth",
+    "max_fan_in",
+    "max_fan_out",
+    "rendered_length",
+    "max_clue_length",
+    "missing_dependencies",
+    "unreferenced_dependencies",
+]
+PERCENTILES = [50, 90, 99]
+
+
+def _longest_chain(game: Game) -> int | None:
+    """
+    Returns the number of clues on the longest dependency chain, using a
+    topological traversal of `game.adj`/`game.rev_adj`. Returns None if the
+    graph contains a cycle.
+    """
+    remaining = {clue_id: len(game.rev_adj[clue_id]) for clue_id in game.clues}
+    depth = {clue_id: 1 for clue_id, count in remaining.items() if count == 0}
+    queue = deque(depth)
+    visited = 0
+    while queue:
+        clue_id = queue.popleft()
+        visited += 1
+        for dependent_id in game.adj[clue_id]:
+            depth[dependent_id] = max(depth.get(dependent_id, 1), depth[clue_id] + 1)
+            remaining[dependent_id] -= 1
+            if remaining[dependent_id] == 0:
+                queue.append(dependent_id)
+    if visited != len(game.clues):
+        return None
+    return max(depth.values(), default=0)
+
+
+def analyze_puzzle(filepath: str) -> dict:
+    """
+    Computes structural metrics for a single puzzle file.
+
+    The dependency graph is built by Game itself. If `Game.__init__` raises
+    (for example, because the puzzle does not have exactly one end clue),
+    the error is recorded and metrics are computed from the partially
+    initialized game, whose graph is built before validation.
+
+    Args:
+        filepath: The path to a puzzle JSON file.
+
+    Returns:
+        A dictionary with "file", "errors" (a list of problems that make the
+        puzzle unplayable or suspicious) and one entry per name in METRICS
+        (None where a metric cannot be computed).
+    """
+    result: dict = {"file": filepath, "errors": []}
+    result.update({metric: None for metric in METRICS})
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            game_data = json.load(f)
+    except (OSError, ValueError) as e:
+        result["errors"].append(f"Could not load: {e}")
+        return result
+    if not isinstance(game_data, dict):
+        result["errors"].append("Top-level JSON value is not an object.")
+        return result
+
+    game = Game.__new__(Game)
+    try:
+        game.__init__(game_data)
+    except ValueError as e:
+        result["errors"].append(str(e))
+    except (AttributeError, TypeError) as e:
+        result["errors"].append(f"Malformed clue data: {e}")
+        return result
+    if not hasattr(game, "end_clues"):
+        return result
+
+    missing = 0
+    unreferenced = 0
+    for clue_obj in game.clues.values():
+        for dependency_id in clue_obj.depends_on:
+            if dependency_id not in game.clues:
+                missing += 1
+            elif dependency_id not in clue_obj.clue_text:
+                unreferenced += 1
+    if missing:
+        result["errors"].append(f"{missing} dependencies refer to clues that do not exist.")
+
+    result["clues"] = len(game.clues)
+    result["start_clues"] = len(game.start_clues)
+    result["end_clues"] = len(game.end_clues)
+    result["max_fan_in"] = max((len(deps) for deps in game.rev_adj.values()), default=0)
+    result["max_fan_out"] = max((len(deps) for deps in game.adj.values()), default=0)
+    result["max_clue_length"] = max((len(c.clue_text) for c in game.clues.values()), default=0)
+    result["missing_dependencies"] = missing
+    result["unreferenced_dependencies"] = unreferenced
+    result["max_depth"] = _longest_chain(game)
+
+    if result["max_depth"] is None:
+        result["errors"].append("Dependency graph contains a cycle.")
+    elif game.end_clues and not missing:
+        # Rendering looks up every dependency, so it is skipped for puzzles
+        # with missing ones; those are already reported above.
+        try:
+            result["rendered_length"] = max(
+                len(game.get_rendered_clue_text(end_clue_id)) for end_clue_id in game.end_clues
+            )
+        except RecursionError:
+            result["errors"].append("Rendering exceeded the recursion limit.")
+    return result
+
+
+def _find_puzzles(json_dir: str) -> list[str]:
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(json_dir):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        paths.extend(
+            os.path.join(dirpath, filename)
+            for filename in sorted(filenames)
+            if filename.endswith(".json") and not filename.startswith('.')
+        )
+    return paths
+
+
+def build_report(results: list[dict], top: int = 5) -> dict:
+    """
+    Aggregates per-puzzle results into a distribution report with NumPy.
+
+    Args:
+        results: Per-puzzle dictionaries as returned by `analyze_puzzle`.
+        top: The number of most extreme puzzles to list for each metric.
+
+    Returns:
+        A dictionary with "puzzles" (the input results), "invalid" (files
+        with errors), "summary" (min, percentiles, max and mean per metric)
+        and "worst" (the `top` highest-valued files per metric).
+    """
+    files = np.array([r["file"] for r in results], dtype=object)
+    values = np.array(
+        [[np.nan if r[m] is None else r[m] for m in METRICS] for r in results],
+        dtype=float,
+    ).reshape(len(results), len(METRICS))
+    counts = (~np.isnan(values)).sum(axis=0)
+    columns = {}
+    if len(results):
+        with warnings.catch_warnings():
+            # Metrics that are missing for every puzzle produce all-NaN columns.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            columns["min"] = np.nanmin(values, axis=0)
+            columns["max"] = np.nanmax(values, axis=0)
+            columns["mean"] = np.nanmean(values, axis=0)
+            for p, row in zip(PERCENTILES, np.nanpercentile(values, PERCENTILES, axis=0)):
+                columns[f"p{p}"] = row
+    # Rank puzzles per metric, highest first, with missing values last.
+    ranking = np.argsort(-np.nan_to_num(values, nan=-np.inf), axis=0, kind="stable")
+
+    summary = {}
+    worst = {}
+    for column, metric in enumerate(METRICS):
+        count = int(counts[column])
+        summary[metric] = {"count": count}
+        if count:
+            summary[metric].update({name: float(row[column]) for name, row in columns.items()})
+        worst[metric] = [
+            {"file": files[i], "value": float(values[i, column])}
+            for i in ranking[:min(top, count), column]
+        ]
+
+    return {
+        "puzzles": results,
+        "invalid": [{"file": r["file"], "errors": r["errors"]} for r in results if r["errors"]],
+        "summary": summary,
+        "worst": worst,
+    }
+
+
+def format_table(report: dict) -> str:
+    """Formats the summary section of a report as a plain-text table."""
+    columns = ["count", "min"] + [f"p{p}" for p in PERCENTILES] + ["max", "mean"]
+    width = max(len(m) for m in METRICS)
+    lines = [f"{'metric':<{width}}  " + "  ".join(f"{c:>9}" for c in columns)]
+    for metric in METRICS:
+        stats = report["summary"][metric]
+        cells = []
+        for c in columns:
+            value = stats.get(c)
+            cells.append(f"{'-':>9}" if value is None else f"{value:>9.4g}")
+        lines.append(f"{metric:<{width}}  " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def main():
+    """
+    Main function to run the script from the command line.
+    Analyzes every puzzle in a directory and prints a distribution table.
+    """
+    parser = argparse.ArgumentParser(
+        description="Report structural statistics for every puzzle in a directory of game JSON files."
+    )
+    parser.add_argument(
+        "json_dir",
+        nargs="?",
+        default=DEFAULT_JSON_DIR,
+        help=f"Directory to search recursively for puzzle JSON files (default: {DEFAULT_JSON_DIR})."
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the full JSON report to this path."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)."
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Number of most extreme puzzles to list per metric (default: 5)."
+    )
+    args = parser.parse_args()
+
+    if np is None:
+        print("Error: numpy is required for this script. Install it with: pip install -e .[analysis]")
+        sys.exit(1)
+    if not os.path.isdir(args.json_dir):
+        print(f"Error: Puzzle directory not found at '{args.json_dir}'")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    paths = _find_puzzles(args.json_dir)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        chunksize = max(1, len(paths) // ((args.workers or os.cpu_count() or 1) * 4))
+        results = list(executor.map(analyze_puzzle, paths, chunksize=chunksize))
+    report = build_report(results, top=args.top)
+    elapsed = time.perf_counter() - start
+
+    print(format_table(report))
+    for metric in ("max_depth", "max_fan_in", "rendered_length"):
+        if report["worst"][metric]:
+            entries = ", ".join(f"{w['file']} ({w['value']:g})" for w in report["worst"][metric])
+            print(f"Largest {metric}: {entries}")
+    for entry in report["invalid"]:
+        print(f"Problem in '{entry['file']}': {'; '.join(entry['errors'])}")
+    print(f"Analyzed {len(results)} puzzles ({len(report['invalid'])} with problems) in {elapsed:.2f}s.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved report to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
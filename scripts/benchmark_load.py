@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+# Synthetic puzzle shapes: "chain" (each clue depends on the previous one)
+# and "wide" (a tree in which each clue depends on FANOUT others).
+SHAPES = ("chain", "wide")
+FANOUT = 8
+BACKENDS = ("ijson", "stdlib")
+WORDS = ("harbor", "lantern", "mosaic", "orchard", "quarry", "saddle", "thimble", "velvet", "walnut", "zephyr")
+
+
+def generate_puzzle(path: str, clue_count: int, shape: str = "chain"):
+    """
+    Writes a synthetic puzzle of `clue_count` clues to `path`, in the game
+    JSON format, about 240 bytes per clue. Each clue's text embeds the IDs
+    of the clues it depends on, as real puzzles do.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n    "clues": {\n')
+        for i in range(clue_count):
+            clue_id = f"CLUE-C{i + 1}"
+            if shape == "chain":
+                depends_on = [f"CLUE-C{i}"] if i else []
+            else:
+                # Heap layout: clue 1 is the end clue and the leaves are the start clues.
+                children = range(i * FANOUT + 1, min(i * FANOUT + FANOUT, clue_count - 1) + 1)
+                depends_on = [f"CLUE-C{j + 1}" for j in children]
+            words = " ".join(WORDS[(i * 7 + k) % len(WORDS)] for k in range(12))
+            entry = {
+                "clue": f"{words} near the {' and '.join(depends_on) or 'old gate'} of the city",
+                "answer": f"{WORDS[i % len(WORDS)]}{i}",
+                "depends_on": depends_on,
+            }
+            separator = ",\n" if i < clue_count - 1 else "\n"
+            f.write(f"        {json.dumps(clue_id)}: {json.dumps(entry)}{separator}")
+        f.write("    }\n}\n")
+
+
+def measure(path: str, backend: str) -> dict:
+    """
+    Loads `path` with `Game.from_json_file` in a fresh interpreter, forcing
+    the given loader backend, and returns the load time in seconds and the
+    child's peak RSS in MB.
+    """
+    code = (
+        "import sys, time, resource\n"
+        "from bracket_city_mcp.game import loader\n"
+        "from bracket_city_mcp.game import Game\n"
+        f"if {backend!r} == 'stdlib': loader.ijson = None\n"
+        "start = time.perf_counter()\n"
+        "game = Game.from_json_file(sys.argv[1])\n"
+        "print(time.perf_counter() - start, len(game.clues))\n"
+        "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code, path], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    timing, maxrss = result.stdout.splitlines()
+    seconds, clues = timing.split()
+    return {"backend": backend, "clues": int(clues), "seconds": float(seconds), "peak_rss_mb": int(maxrss) / 1024}
+
+
+def main():
+    """
+    Main function to run the script from the command line.
+    Generates (or reuses) a puzzle file and reports how long each loader
+    backend takes to load it, and at what peak memory.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark loading a large puzzle with each JSON backend.")
+    parser.add_argument("--clues", type=int, default=200_000, help="Clues in the generated puzzle (default: 200000).")
+    parser.add_argument("--shape", choices=SHAPES, default="chain", help="Dependency shape (default: chain).")
+    parser.add_argument("--file", help="Benchmark this puzzle file instead of generating one.")
+    parser.add_argument("--output-dir", default=".", help="Where to write the generated puzzle (default: .).")
+    parser.add_argument("--backend", choices=BACKENDS, action="append",
+                        help="Backend to measure; repeat for several (default: both).")
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        path = os.path.join(args.output_dir, f"bench-{args.shape}-{args.clues}.json")
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            generate_puzzle(path, args.clues, args.shape)
+            print(f"Generated {path} in {time.perf_counter() - start:.1f}s")
+    print(f"{path}: {os.path.getsize(path) / 2**20:.1f} MB")
+    for backend in args.backend or BACKENDS:
+        if backend == "ijson":
+            try:
+                import ijson  # noqa: F401
+            except ImportError:
+                print("ijson: not installed")
+                continue
+        result = measure(path, backend)
+        print(f"{backend:>7}: {result['clues']} clues in {result['seconds']:.2f}s, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+import sys
+import json
+import random
+import argparse
+import importlib
+from typing import Any, Callable
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.render_cache import RenderCache
+
+DEFAULT_CASES = 500
+DEFAULT_MAX_CLUES = 12
+DEFAULT_STEPS = 40
+# A small vocabulary, so that answers repeat across clues as in real puzzles.
+ANSWERS = ["pig", "den", "body", "bound", "nomer", "Café", "ice cream", "tv", "a", "mississippi"]
+WORDS = ["kind", "of", "shop", "for", "a", "_", "home", "bear", "(not", "from)", "tails", "é"]
+# Relative frequency of each kind of generated step.
+STEP_KINDS = {
+    "correct": 5,    # The right answer to an active clue.
+    "variant": 1,    # The right answer to an active clue, respelled (case, spacing).
+    "wrong": 3,      # A wrong answer to an active clue.
+    "inactive": 2,   # The right answer to a completed or locked clue.
+    "end": 1,        # Any answer to the end clue.
+    "unknown": 1,    # An ID that is not in the puzzle.
+}
+
+
+class ReferenceEngine:
+    """
+    The behaviour every engine must match: a Game played through its
+    mutable clue flags (`answer_clue`, `active_clues`, `get_rendered_game_text`).
+
+    An engine is constructed from a game's JSON data and provides `answer`
+    and `observe`. Alternates may implement the same two methods in any way.
+    """
+
+    def __init__(self, game_data: dict):
+        self.game = Game(game_data)
+
+    def answer(self, clue_id: str, answer: str) -> bool:
+        return self.game.answer_clue(clue_id, answer)
+
+    def observe(self) -> dict[str, Any]:
+        return {
+            "active_clues": sorted(self.game.active_clues),
+            "rendered": self.game.get_rendered_game_text(),
+            "incorrect_guesses": self.game.incorrect_guesses,
+            "is_complete": self.game.is_complete,
+        }
+
+
+class MaskEngine:
+    """The stateless play path: a completion bitmask and a guess count, as carried in state tokens."""
+
+    def __init__(self, game_data: dict):
+        self.game = Game(game_data)
+        self.completed_mask = 0
+        self.incorrect_guesses = 0
+
+    def answer(self, clue_id: str, answer: str) -> bool:
+        game = self.game
+        if clue_id not in game.clues:
+            return False
+        if not game.is_available(clue_id, self.completed_mask):
+            return False
+        if game.clues[clue_id].is_end_clue:
+            return False
+        if game.clues[clue_id].check_answer(answer):
+            self.completed_mask |= 1 << game.clue_index[clue_id]
+            return True
+        self.incorrect_guesses += 1
+        return False
+
+    def render(self) -> str:
+        return self.game.render_clue_text_for_mask(self.game.end_clues[0], self.completed_mask)
+
+    def observe(self) -> dict[str, Any]:
+        return {
+            "active_clues": sorted(self.game.active_clues_for_mask(self.completed_mask)),
+            "rendered": self.render(),
+            "incorrect_guesses": self.incorrect_guesses,
+            "is_complete": self.game.is_complete_mask(self.completed_mask),
+        }
+
+
+class CachedEngine(MaskEngine):
+    """The mask path rendered through a RenderCache, as the server does."""
+
+    def __init__(self, game_data: dict):
+        super().__init__(game_data)
+        self.cache = RenderCache()
+
+    def render(self) -> str:
+        # Render every clue first so the full-game render reuses partial keys.
+        for clue_id in self.game.clue_ids:
+            self.cache.render(self.game, self.completed_mask, clue_id)
+        return self.cache.render(self.game, self.completed_mask)
+
+
+class SnapshotEngine(ReferenceEngine):
+    """A Game observed through its published, immutable GameState."""
+
+    def observe(self) -> dict[str, Any]:
+        state = self.game.state
+        return {
+            "active_clues": sorted(state.active_clues),
+            "rendered": self.game.render_state(state),
+            "incorrect_guesses": state.incorrect_guesses,
+            "is_complete": self.game.is_complete_mask(state.completed_mask),
+        }
+
+
+ENGINES: dict[str, Callable[[dict], Any]] = {
+    "mask": MaskEngine,
+    "cached": CachedEngine,
+    "snapshot": SnapshotEngine,
+}
+
+
+def load_engine(spec: str) -> Callable[[dict], Any]:
+    """Returns a built-in engine by name, or any engine given as 'module:attribute'."""
+    if spec in ENGINES:
+        return ENGINES[spec]
+    module_name, separator, attribute = spec.partition(":")
+    if not separator:
+        raise ValueError(f"Unknown engine '{spec}'. Use one of {', '.join(ENGINES)} or 'module:attribute'.")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def random_puzzle(rng: random.Random, max_clues: int) -> dict:
+    """
+    Generates a valid puzzle: a random DAG of 1 to `max_clues` clues whose
+    text mentions their dependencies, plus one end clue depending on every
+    clue nothing else depends on.
+    """
+    count = rng.randint(1, max_clues)
+    ids = [f"#C{i + 1}#" for i in range(count)]
+    clues = {}
+    has_dependents = set()
+    for i, clue_id in enumerate(ids):
+        depends_on = rng.sample(ids[:i], rng.randint(0, min(i, 3)))
+        has_dependents.update(depends_on)
+        parts = rng.sample(WORDS, rng.randint(0, 4)) + depends_on
+        rng.shuffle(parts)
+        clue = {"clue": " ".join(parts), "answer": rng.choice(ANSWERS), "depends_on": depends_on}
+        if rng.random() < 0.2:
+            clue["alternates"] = [rng.choice(ANSWERS)]
+        clues[clue_id] = clue
+    sinks = [clue_id for clue_id in ids if clue_id not in has_dependents]
+    clues["#END#"] = {"clue": "Finally, " + " and ".join(sinks), "answer": "", "depends_on": sinks}
+    return {"clues": clues}
+
+
+def _respell(answer: str, rng: random.Random) -> str:
+    respelled = "".join(c.upper() if rng.random() < 0.5 else c for c in answer)
+    return "  " + respelled.replace(" ", "   ") + " "
+
+
+def random_steps(game_data: dict, rng: random.Random, count: int) -> list[tuple[str, str]]:
+    """
+    Generates `count` (clue_id, answer) steps, playing them on a scratch
+    Game so that "correct" steps target clues that are actually active.
+    """
+    game = Game(game_data)
+    clues = game_data["clues"]
+    end_clue_id = game.end_clues[0]
+    kinds, weights = zip(*STEP_KINDS.items())
+    steps = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        active = sorted(clue_id for clue_id in game.active_clues if clue_id != end_clue_id)
+        inactive = sorted(set(clues) - game.active_clues - {end_clue_id})
+        if kind in ("correct", "variant", "wrong") and active:
+            clue_id = rng.choice(active)
+            answer = clues[clue_id]["answer"]
+            if kind == "variant":
+                answer = _respell(answer, rng)
+            elif kind == "wrong":
+                answer = rng.choice([a for a in ANSWERS if a != answer] + [answer + "x", ""])
+        elif kind == "inactive" and inactive:
+            clue_id = rng.choice(inactive)
+            answer = clues[clue_id]["answer"]
+        elif kind == "unknown":
+            clue_id, answer = "#NOPE#", rng.choice(ANSWERS)
+        else:
+            clue_id, answer = end_clue_id, rng.choice(ANSWERS + [""])
+        game.answer_clue(clue_id, answer)
+        steps.append((clue_id, answer))
+    return steps
+
+
+def _run_engine(factory: Callable, game_data: dict, steps: list[tuple[str, str]]) -> list:
+    """
+    Plays `steps`, returning the observation after construction and after
+    each step. An exception ends the list, described as a string.
+    """
+    observations = []
+    try:
+        engine = factory(game_data)
+        observations.append(engine.observe())
+        for clue_id, answer in steps:
+            correct = engine.answer(clue_id, answer)
+            observations.append(dict(engine.observe(), correct=correct))
+    except Exception as e:
+        observations.append(f"{type(e).__name__}: {e}")
+    return observations
+
+
+def find_divergence(game_data: dict, steps: list[tuple[str, str]], engine: Callable,
+                    reference: Callable = ReferenceEngine) -> dict | None:
+    """
+    Plays `steps` on the reference and on `engine` in lockstep.
+
+    Returns:
+        None if they agree after every step. Otherwise a dictionary with the
+        "step" (0 before any answer, n after the n-th), the differing
+        "field" and the "expected" and "actual" values.
+    """
+    expected = _run_engine(reference, game_data, steps)
+    actual = _run_engine(engine, game_data, steps)
+    for step, (want, got) in enumerate(zip(expected, actual)):
+        if isinstance(want, str) or isinstance(got, str):
+            if want != got:
+                return {"step": step, "field": "exception", "expected": want, "actual": got}
+            return None
+        for field in want:
+            if want[field] != got.get(field):
+                return {"step": step, "field": field, "expected": want[field], "actual": got.get(field)}
+    return None
+
+
+def _without_clue(game_data: dict, clue_id: str) -> dict:
+    clues = {}
+    for other_id, clue in game_data["clues"].items():
+        if other_id == clue_id:
+            continue
+        clue = dict(clue)
+        if clue_id in clue["depends_on"]:
+            clue["depends_on"] = [d for d in clue["depends_on"] if d != clue_id]
+            clue["clue"] = clue["clue"].replace(clue_id, "")
+        clues[other_id] = clue
+    return {"clues": clues}
+
+
+def _is_valid(game_data: dict) -> bool:
+    try:
+        Game(game_data)
+    except ValueError:
+        return False
+    return True
+
+
+def shrink(game_data: dict, steps: list[tuple[str, str]], engine: Callable,
+           reference: Callable = ReferenceEngine) -> tuple[dict, list[tuple[str, str]], dict]:
+    """
+    Reduces a failing case to a minimal one that still diverges: drops the
+    steps after the divergence, then greedily removes steps, clues, clue
+    text and alternates while the engines still disagree.
+
+    Returns:
+        The shrunk (game_data, steps, divergence).
+    """
+    def fails(data, candidate_steps):
+        return _is_valid(data) and find_divergence(data, candidate_steps, engine, reference) is not None
+
+    divergence = find_divergence(game_data, steps, engine, reference)
+    steps = steps[:divergence["step"]]
+    changed = True
+    while changed:
+        changed = False
+        # Remove chunks of steps, halving the chunk size down to single steps.
+        chunk = max(len(steps) // 2, 1)
+        while chunk:
+            i = 0
+            while i < len(steps):
+                candidate = steps[:i] + steps[i + chunk:]
+                if fails(game_data, candidate):
+                    steps, changed = candidate, True
+                else:
+                    i += chunk
+            chunk //= 2
+        for clue_id in list(game_data["clues"]):
+            candidate = _without_clue(game_data, clue_id)
+            if clue_id in game_data["clues"] and fails(candidate, steps):
+                game_data, changed = candidate, True
+        for clue_id, clue in list(game_data["clues"].items()):
+            simpler = dict(clue, clue=" ".join(clue["depends_on"]))
+            simpler.pop("alternates", None)
+            if simpler != clue:
+                candidate = {"clues": dict(game_data["clues"], **{clue_id: simpler})}
+                if fails(candidate, steps):
+                    game_data, changed = candidate, True
+    return game_data, steps, find_divergence(game_data, steps, engine, reference)
+
+
+def fuzz(engine: Callable, cases: int, seed: int | None, max_clues: int = DEFAULT_MAX_CLUES,
+         step_count: int = DEFAULT_STEPS, reference: Callable = ReferenceEngine) -> dict | None:
+    """
+    Compares `engine` with the reference on `cases` random puzzles.
+
+    Returns:
+        None if every case agreed, otherwise the shrunk failing case as a
+        dictionary with "game", "steps" and "divergence".
+    """
+    rng = random.Random(seed)
+    for _ in range(cases):
+        game_data = random_puzzle(rng, max_clues)
+        steps = random_steps(game_data, rng, step_count)
+        if find_divergence(game_data, steps, engine, reference) is not None:
+            game_data, steps, divergence = shrink(game_data, steps, engine, reference)
+            return {"game": game_data, "steps": steps, "divergence": divergence}
+    return None
+
+
+def main():
+    """
+    Main function to run the script from the command line.
+    Fuzzes each engine against the reference Game and reports minimal repros.
+    """
+    parser = argparse.ArgumentParser(
+        description="Check alternate game engines against the reference Game on random puzzles."
+    )
+    parser.add_argument(
+        "--engine",
+        action="append",
+        help=f"Engine to check: one of {', '.join(ENGINES)} or 'module:attribute'. "
+             f"May be repeated (default: all built-in engines)."
+    )
+    parser.add_argument(
+        "--cases",
+        type=int,
+        default=DEFAULT_CASES,
+        help=f"Random puzzles per engine (default: {DEFAULT_CASES})."
+    )
+    parser.add_argument(
+        "--max-clues",
+        type=int,
+        default=DEFAULT_MAX_CLUES,
+        help=f"Largest generated puzzle, not counting the end clue (default: {DEFAULT_MAX_CLUES})."
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=DEFAULT_STEPS,
+        help=f"Answers played per puzzle (default: {DEFAULT_STEPS})."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed, for reproducible runs."
+    )
+    parser.add_argument(
+        "--output",
+        help="Write any minimal failing cases to this JSON file."
+    )
+    args = parser.parse_args()
+
+    try:
+        engines = {spec: load_engine(spec) for spec in args.engine or ENGINES}
+    except (ValueError, ImportError, AttributeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    failures = {}
+    for spec, engine in engines.items():
+        failure = fuzz(engine, args.cases, args.seed, args.max_clues, args.steps)
+        if failure is None:
+            print(f"{spec}: {args.cases} cases agree with the reference.")
+            continue
+        failures[spec] = failure
+        divergence = failure["divergence"]
+        print(f"{spec}: diverges at step {divergence['step']} on '{divergence['field']}': "
+              f"expected {divergence['expected']!r}, got {divergence['actual']!r}")
+        print(f"  puzzle: {json.dumps(failure['game'])}")
+        print(f"  steps: {json.dumps(failure['steps'])}")
+
+    if args.output and failures:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(failures, f, indent=2)
+        print(f"Saved failing cases to '{args.output}'")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
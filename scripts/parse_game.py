@@ -1,15 +1,35 @@
 import json
-import re
+import os
+import time
+import hashlib
 import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from bracket_city_mcp.game import parser as tokenizer
+from bracket_city_mcp.game.parser import (
+    DEFAULT_CHUNK_SIZE,
+    BracketParseError,
+    parse_clues,
+    read_chunks,
+)
+
+DEFAULT_RAW_DIR = os.path.join("games", "raw")
+DEFAULT_JSON_DIR = os.path.join("games", "json")
+# Records the content hash of every raw file converted by the last batch run.
+MANIFEST_FILENAME = ".parse_manifest.json"
+# The source files that determine the JSON a raw file converts to: this
+# script and the tokenizer it uses.
+CONVERSION_SOURCES = (os.path.abspath(__file__), os.path.abspath(tokenizer.__file__))
+
 
 def parse_bracket_city(game_string: str) -> str:
     """
     Parses a 'bracket city' game string into a structured JSON format.
 
-    The function works by repeatedly finding the innermost bracketed clue,
-    extracting its content, assigning it a unique ID (e.g., #C1#), and
-    then replacing the original bracketed text with this ID in the main string.
-    This process continues until no brackets are left.
+    Each bracketed clue is assigned a unique ID (e.g., #C1#) and its nested
+    clues are replaced with their IDs in its text. See
+    `bracket_city_mcp.game.parser` for details of the single-pass algorithm.
 
     Args:
         game_string: The string containing the nested bracket puzzle.
@@ -17,80 +37,266 @@ def parse_bracket_city(game_string: str) -> str:
     Returns:
         A JSON formatted string representing the parsed clues, their
         dependencies, and an empty placeholder for the answer.
+
+    Raises:
+        BracketParseError: If the brackets in `game_string` are unbalanced.
+    """
+    return json.dumps({"clues": parse_clues([game_string])}, indent=2)
+
+
+def parse_bracket_city_file(filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Parses a 'bracket city' puzzle file into a structured JSON format,
+    streaming the file in chunks rather than reading it whole.
+
+    Args:
+        filepath: The path to the input text file containing the puzzle string.
+        chunk_size: The number of characters to read at a time.
+
+    Returns:
+        A JSON formatted string, as returned by `parse_bracket_city`.
+
+    Raises:
+        FileNotFoundError: If the filepath does not exist.
+        BracketParseError: If the brackets in the file are unbalanced.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        clues = parse_clues(read_chunks(f, chunk_size))
+    return json.dumps({"clues": clues}, indent=2)
+
+
+def _file_sha256(filepath: str) -> str:
+    """Returns the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parser_version() -> str:
+    """
+    Returns a fingerprint of the CONVERSION_SOURCES: this script and
+    `bracket_city_mcp.game.parser`. Stored in the manifest so that any change
+    to either invalidates every previously converted file.
+    """
+    digest = hashlib.sha256()
+    for source in CONVERSION_SOURCES:
+        digest.update(_file_sha256(source).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _write_atomic(filepath: str, content: str):
+    """
+    Writes `content` to `filepath` via a temporary file in the same directory
+    and an atomic rename, so readers never observe a partially written file.
+    """
+    directory = os.path.dirname(filepath) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        # mkstemp creates files readable only by the owner; use the usual mode.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _convert_one(raw_path: str, json_path: str) -> tuple[str, float, str | None]:
+    """
+    Converts a single raw puzzle file; runs in a worker process.
+
+    Returns:
+        A tuple of (raw_path, elapsed seconds, error message or None).
+    """
+    start = time.perf_counter()
+    try:
+        _write_atomic(json_path, parse_bracket_city_file(raw_path))
+        error = None
+    except Exception as e:
+        error = str(e)
+    return raw_path, time.perf_counter() - start, error
+
+
+def _load_manifest(manifest_path: str) -> dict:
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def batch_convert(raw_dir: str = DEFAULT_RAW_DIR, json_dir: str = DEFAULT_JSON_DIR,
+                  workers: int | None = None, force: bool = False) -> dict:
     """
-    clues = {}
-    clue_counter = 1
-    
-    processing_string = game_string
-
-    # Loop as long as there are opening brackets in the string
-    while '[' in processing_string:
-        last_open_bracket_pos = processing_string.rfind('[')
-        
-        first_close_bracket_pos = processing_string.find(']', last_open_bracket_pos)
-
-        if first_close_bracket_pos == -1:
-            print("Error: Mismatched brackets found.")
-            break
-            
-        clue_text = processing_string[last_open_bracket_pos + 1 : first_close_bracket_pos]
-        
-        clue_id = f"#C{clue_counter}#"
-        
-        dependencies = sorted([f"#C{num}#" for num in re.findall(r'#C(\d+)#', clue_text)])
-        
-        clues[clue_id] = {
-            "clue": clue_text.strip(),
-            "answer": "",
-            "depends_on": dependencies
-        }
-        
-        full_clue_substring = processing_string[last_open_bracket_pos : first_close_bracket_pos + 1]
-        processing_string = processing_string.replace(full_clue_substring, clue_id, 1)
-        
-        clue_counter += 1
-
-    sorted_clue_keys = sorted(clues.keys(), key=lambda x: int(re.search(r'(\d+)', x).group(1)))
-    
-    sorted_clues = {key: clues[key] for key in sorted_clue_keys}
-    
-    final_json_output = {
-        "clues": sorted_clues
+    Converts every raw puzzle under `raw_dir` into a JSON file in `json_dir`,
+    parsing files in parallel on a process pool.
+
+    A manifest in `json_dir` records the content hash of each raw file and the
+    parser version used. Files whose hash is unchanged since the previous run
+    (and whose output still exists) are skipped unless `force` is set.
+    Outputs are written atomically. The output for `raw_dir/a/b.md` is
+    `json_dir/a/b.json`.
+
+    Args:
+        raw_dir: Directory to search recursively for raw puzzle files.
+        json_dir: Directory to write JSON outputs and the manifest into.
+        workers: Number of worker processes (defaults to the CPU count).
+        force: Reconvert every file regardless of the manifest.
+
+    Returns:
+        A summary dictionary with "converted", "skipped" and "failed" lists of
+        raw paths, "errors" (raw path -> message), "timings" (raw path ->
+        seconds) and "elapsed" (total seconds).
+    """
+    start = time.perf_counter()
+    manifest_path = os.path.join(json_dir, MANIFEST_FILENAME)
+    parser_version = _parser_version()
+    previous = _load_manifest(manifest_path)
+    previous_files = previous.get("files", {}) if previous.get("parser_version") == parser_version else {}
+
+    pending: dict[str, tuple[str, str]] = {}  # relative raw path -> (json path, digest)
+    files: dict[str, dict] = {}
+    skipped = []
+    for dirpath, dirnames, filenames in os.walk(raw_dir):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.startswith('.'):
+                continue
+            raw_path = os.path.join(dirpath, filename)
+            relative = os.path.relpath(raw_path, raw_dir)
+            json_path = os.path.join(json_dir, os.path.splitext(relative)[0] + ".json")
+            digest = _file_sha256(raw_path)
+            entry = {"sha256": digest, "output": os.path.relpath(json_path, json_dir)}
+            if (not force and previous_files.get(relative) == entry
+                    and os.path.exists(json_path)):
+                files[relative] = entry
+                skipped.append(raw_path)
+            else:
+                pending[relative] = (json_path, digest)
+
+    converted, failed = [], []
+    errors: dict[str, str] = {}
+    timings: dict[str, float] = {}
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                relative: executor.submit(_convert_one, os.path.join(raw_dir, relative), json_path)
+                for relative, (json_path, _) in pending.items()
+            }
+            for relative, future in futures.items():
+                raw_path, elapsed, error = future.result()
+                timings[raw_path] = elapsed
+                if error is None:
+                    json_path, digest = pending[relative]
+                    files[relative] = {"sha256": digest, "output": os.path.relpath(json_path, json_dir)}
+                    converted.append(raw_path)
+                else:
+                    errors[raw_path] = error
+                    failed.append(raw_path)
+
+    manifest = {"parser_version": parser_version, "files": dict(sorted(files.items()))}
+    _write_atomic(manifest_path, json.dumps(manifest, indent=2))
+
+    return {
+        "converted": converted,
+        "skipped": skipped,
+        "failed": failed,
+        "errors": errors,
+        "timings": timings,
+        "elapsed": time.perf_counter() - start,
     }
-    
-    return json.dumps(final_json_output, indent=2)
+
+
+def _print_batch_summary(summary: dict, workers: int | None):
+    for raw_path in summary["failed"]:
+        print(f"Error: Failed to parse '{raw_path}': {summary['errors'][raw_path]}")
+    if summary["timings"]:
+        slowest = max(summary["timings"], key=summary["timings"].get)
+        print(f"Slowest file: '{slowest}' ({summary['timings'][slowest]:.3f}s)")
+    print(
+        f"Converted {len(summary['converted'])}, skipped {len(summary['skipped'])} unchanged, "
+        f"failed {len(summary['failed'])} in {summary['elapsed']:.2f}s "
+        f"using {workers or os.cpu_count()} workers."
+    )
+
 
 def main():
     """
     Main function to run the script from the command line.
-    Handles reading from an input file and writing to an output file.
+    Handles reading from an input file and writing to an output file, or
+    converting a whole directory of raw puzzles with --batch.
     """
     parser = argparse.ArgumentParser(
         description="Parse a 'bracket city' puzzle from a text file and save it as JSON."
     )
     parser.add_argument(
-        "input_file", 
+        "input_file",
+        nargs="?",
         help="The path to the input text file containing the puzzle string."
     )
     parser.add_argument(
-        "output_file", 
+        "output_file",
+        nargs="?",
         help="The path to the output JSON file where the result will be saved."
     )
-    
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Convert every file in --raw-dir into --json-dir instead of a single file."
+    )
+    parser.add_argument(
+        "--raw-dir",
+        default=DEFAULT_RAW_DIR,
+        help=f"Directory of raw puzzle files for --batch (default: {DEFAULT_RAW_DIR})."
+    )
+    parser.add_argument(
+        "--json-dir",
+        default=DEFAULT_JSON_DIR,
+        help=f"Output directory for --batch (default: {DEFAULT_JSON_DIR})."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for --batch (default: CPU count)."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --batch, reconvert files even if they are unchanged since the last run."
+    )
+
     args = parser.parse_args()
 
+    if args.batch:
+        if not os.path.isdir(args.raw_dir):
+            print(f"Error: Raw puzzle directory not found at '{args.raw_dir}'")
+            return
+        summary = batch_convert(args.raw_dir, args.json_dir, workers=args.workers, force=args.force)
+        _print_batch_summary(summary, args.workers)
+        return
+
+    if args.input_file is None or args.output_file is None:
+        parser.error("input_file and output_file are required unless --batch is given")
+
     try:
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            raw_game_string = f.read()
+        parsed_json = parse_bracket_city_file(args.input_file)
     except FileNotFoundError:
         print(f"Error: Input file not found at '{args.input_file}'")
         return
+    except BracketParseError as e:
+        print(f"Error: Mismatched brackets found. {e}")
+        return
     except Exception as e:
         print(f"An error occurred while reading the input file: {e}")
         return
 
-    parsed_json = parse_bracket_city(raw_game_string)
-
     try:
         with open(args.output_file, 'w', encoding='utf-8') as f:
             f.write(parsed_json)
@@ -0,0 +1,276 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.game.answers import AnswerNormalizer
+from bracket_city_mcp.sessions import CheckpointStore
+
+DEFAULT_PUZZLE_DIR = "games/json"
+# Sessions replayed per task sent to a worker process.
+SESSIONS_PER_TASK = 2000
+# Fields of each recorded answer that replay must reproduce.
+COMPARED_FIELDS = ("correct", "clue_id", "incorrect_guesses", "completed")
+
+# Per worker process: the replay settings and each puzzle, loaded once.
+_puzzle_dir = DEFAULT_PUZZLE_DIR
+_normalizer: AnswerNormalizer | None = None
+_games: dict[str, Game | None] = {}
+
+
+def load_sessions(paths: list[str]) -> list[dict]:
+    """
+    Reads answer logs written with `--answer-log` and groups the records by
+    session, keeping each session's answers in recorded order. A "switch"
+    record starts a new play of the puzzle it names, replayed separately.
+
+    Returns:
+        One dictionary per play with "source" (the log file), "session",
+        "game", "fingerprint" and "events": (tool, clue_id, answer, recorded)
+        tuples, where `recorded` is a tuple of the COMPARED_FIELDS values.
+        For checkpoint and rollback events, `answer` is the checkpoint ID.
+    """
+    plays: list[dict] = []
+    current: dict[tuple[str, str], dict] = {}
+    for path in paths:
+        source = os.path.basename(path)
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = (source, record["session"])
+                session = current.get(key)
+                if session is None or record["tool"] == "switch":
+                    session = current[key] = {
+                        "source": source,
+                        "session": record["session"],
+                        "game": record["game"],
+                        "fingerprint": record["fingerprint"],
+                        "events": [],
+                    }
+                    plays.append(session)
+                if record["tool"] == "switch":
+                    continue
+                session["events"].append((
+                    record["tool"], record["clue_id"], record.get("checkpoint", record["answer"]),
+                    tuple(record[field] for field in COMPARED_FIELDS),
+                ))
+    return plays
+
+
+def _init_worker(puzzle_dir: str, normalizer: AnswerNormalizer | None):
+    global _puzzle_dir, _normalizer
+    _puzzle_dir = puzzle_dir
+    _normalizer = normalizer
+    _games.clear()
+
+
+def _get_game(game_id: str) -> Game | None:
+    """Returns the puzzle `game_id` from the puzzle directory, or None if it cannot be loaded."""
+    if game_id not in _games:
+        try:
+            game = Game.from_json_file(os.path.join(_puzzle_dir, f"{game_id}.json"))
+        except (OSError, ValueError):
+            game = None
+        if game is not None and _normalizer is not None:
+            game.set_answer_normalizer(_normalizer)
+        _games[game_id] = game
+    return _games[game_id]
+
+
+def replay_answer(game: Game, tool: str, clue_id: str | None, answer: str, checkpoints: CheckpointStore) -> tuple:
+    """
+    Applies one recorded answer, checkpoint or rollback as the server's
+    session tools do, and returns the resulting values of COMPARED_FIELDS.
+    `answer` is the checkpoint ID for checkpoints and rollbacks.
+    """
+    if tool == "checkpoint":
+        checkpoints.add(game.checkpoint())
+        correct = True
+    elif tool == "rollback":
+        state = checkpoints.get(answer)
+        if state is not None:
+            game.rollback(state)
+        correct = state is not None
+    elif tool == "answer_any":
+        clue_id = game.answer_any(answer)
+        correct = clue_id is not None
+    elif clue_id not in game.clues:
+        correct = False
+    elif game.clues[clue_id].is_end_clue:
+        # Naming the end clue succeeds once everything else is solved.
+        correct = game.is_complete
+    else:
+        correct = game.answer_clue(clue_id, answer)
+    return correct, clue_id, game.incorrect_guesses, game.is_complete
+
+
+def _outcome(game: Game, incorrect_guesses: int, completed: bool) -> dict:
+    return {"completed": completed, "score": len(game.clues) - incorrect_guesses if completed else None}
+
+
+def replay_session(game: Game, session: dict) -> dict:
+    """
+    Replays one session's answers on a fresh play of `game` and diffs them
+    against the recorded results.
+
+    Returns:
+        A dictionary with the session's "source", "session" and "game", its
+        "events" count, the "first_difference" (the event index, field,
+        recorded and replayed values, or None) and the "recorded" and
+        "replayed" outcomes (completion and score).
+    """
+    game.reset()
+    checkpoints = CheckpointStore()
+    first_difference = None
+    replayed = recorded = (False, None, 0, False)
+    for index, (tool, clue_id, answer, recorded) in enumerate(session["events"]):
+        replayed = replay_answer(game, tool, clue_id, answer, checkpoints)
+        if replayed != recorded and first_difference is None:
+            field = next(i for i in range(len(COMPARED_FIELDS)) if replayed[i] != recorded[i])
+            first_difference = {
+                "event": index,
+                "field": COMPARED_FIELDS[field],
+                "recorded": recorded[field],
+                "replayed": replayed[field],
+            }
+    return {
+        "source": session["source"],
+        "session": session["session"],
+        "game": session["game"],
+        "events": len(session["events"]),
+        "first_difference": first_difference,
+        "recorded": _outcome(game, recorded[2], recorded[3]),
+        "replayed": _outcome(game, replayed[2], replayed[3]),
+    }
+
+
+def _replay_chunk(sessions: list[dict]) -> dict:
+    """
+    Replays a chunk of sessions in a worker process. Returns counts, plus
+    the full result of every session that did not replay identically.
+    """
+    summary = {"sessions": 0, "events": 0, "skipped": [], "changed_puzzle": 0, "differences": []}
+    for session in sessions:
+        game = _get_game(session["game"])
+        if game is None:
+            summary["skipped"].append(session["game"])
+            continue
+        if game.fingerprint.hex() != session["fingerprint"]:
+            summary["changed_puzzle"] += 1
+        result = replay_session(game, session)
+        summary["sessions"] += 1
+        summary["events"] += result["events"]
+        if result["first_difference"] is not None:
+            summary["differences"].append(result)
+    return summary
+
+
+def replay(paths: list[str], puzzle_dir: str = DEFAULT_PUZZLE_DIR, normalizer: AnswerNormalizer | None = None,
+           workers: int | None = None) -> dict:
+    """
+    Replays every session in the answer logs `paths` across a process pool.
+
+    Args:
+        paths: Answer log files.
+        puzzle_dir: Where to find each session's puzzle, as `<game>.json`.
+        normalizer: Replaces the puzzles' answer normalization, to re-score
+                    sessions under a rule change. None keeps the default.
+        workers: Worker processes (default: CPU count).
+
+    Returns:
+        A dictionary with "sessions" and "events" replayed, "skipped"
+        (sessions whose puzzle could not be loaded), "changed_puzzle"
+        (sessions whose puzzle differs from the recorded fingerprint),
+        "rescored" (sessions whose completion or score changed) and
+        "differences" (every session that did not replay identically).
+    """
+    sessions = load_sessions(paths)
+    chunks = [sessions[i:i + SESSIONS_PER_TASK] for i in range(0, len(sessions), SESSIONS_PER_TASK)]
+    total = {"sessions": 0, "events": 0, "skipped": 0, "changed_puzzle": 0, "differences": []}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(puzzle_dir, normalizer)) as executor:
+        for summary in executor.map(_replay_chunk, chunks):
+            total["sessions"] += summary["sessions"]
+            total["events"] += summary["events"]
+            total["skipped"] += len(summary["skipped"])
+            total["changed_puzzle"] += summary["changed_puzzle"]
+            total["differences"].extend(summary["differences"])
+    total["rescored"] = sum(1 for result in total["differences"] if result["recorded"] != result["replayed"])
+    return total
+
+
+def main():
+    """
+    Main function to run the script from the command line.
+    Replays recorded sessions and reports any that replay differently.
+    """
+    parser = argparse.ArgumentParser(
+        description="Replay recorded session answers against the puzzle definitions and diff the outcomes."
+    )
+    parser.add_argument("logs", nargs="+", help="Answer log files written by the server's --answer-log.")
+    parser.add_argument(
+        "--puzzle-dir",
+        default=DEFAULT_PUZZLE_DIR,
+        help=f"Directory holding each session's puzzle as <game>.json (default: {DEFAULT_PUZZLE_DIR})."
+    )
+    parser.add_argument("--no-unicode-compatibility", action="store_true",
+                        help="Replay without NFKC normalization of answers.")
+    parser.add_argument("--no-casefold", action="store_true", help="Replay with case-sensitive answers.")
+    parser.add_argument("--no-fold-punctuation", action="store_true",
+                        help="Replay with punctuation significant in answers.")
+    parser.add_argument("--fold-whitespace", action="store_true",
+                        help="Replay ignoring whitespace in answers, so \"ice cream\" matches \"icecream\".")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)."
+    )
+    parser.add_argument(
+        "--output",
+        help="Write every session that replayed differently to this JSON file."
+    )
+    args = parser.parse_args()
+
+    missing = [path for path in args.logs if not os.path.isfile(path)]
+    if missing:
+        print(f"Error: Answer log not found: {', '.join(missing)}")
+        sys.exit(1)
+    normalizer = None
+    if args.no_unicode_compatibility or args.no_casefold or args.no_fold_punctuation or args.fold_whitespace:
+        normalizer = AnswerNormalizer(
+            unicode_compatibility=not args.no_unicode_compatibility,
+            casefold=not args.no_casefold,
+            fold_punctuation=not args.no_fold_punctuation,
+            fold_whitespace=args.fold_whitespace,
+        )
+
+    start = time.perf_counter()
+    result = replay(args.logs, args.puzzle_dir, normalizer, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {result['sessions']} sessions, {result['events']} answers in {elapsed:.2f}s "
+          f"({result['events'] / elapsed * 60:,.0f} answers/minute).")
+    print(f"{len(result['differences'])} sessions replayed differently; {result['rescored']} changed outcome.")
+    if result["skipped"]:
+        print(f"Skipped {result['skipped']} sessions whose puzzle could not be loaded.")
+    if result["changed_puzzle"]:
+        print(f"{result['changed_puzzle']} sessions were recorded on a different version of their puzzle.")
+    for difference in result["differences"][:10]:
+        first = difference["first_difference"]
+        print(f"  {difference['source']} {difference['session']}: answer {first['event']} "
+              f"'{first['field']}' recorded {first['recorded']!r}, replayed {first['replayed']!r}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved results to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
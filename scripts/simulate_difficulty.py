@@ -0,0 +1,300 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # Reported by main().
+    np = None
+
+from bracket_city_mcp.game import Game
+
+from analyze_corpus import DEFAULT_JSON_DIR, _find_puzzles
+
+DEFAULT_PLAYS = 100_000
+# Plays simulated together; bounds memory at roughly BATCH_SIZE * clues bytes per array.
+BATCH_SIZE = 10_000
+PERCENTILES = [10, 50, 90]
+# The probability that any single guess is wrong, per error model.
+UNIFORM_ERROR_RATE = 0.25
+# Cap on the per-guess error probability of the "length" model.
+MAX_ERROR_RATE = 0.9
+ERROR_MODELS = ["perfect", "uniform", "length"]
+
+
+def _error_rates(model: str, clue_lengths: "np.ndarray") -> "np.ndarray":
+    """
+    Returns the per-guess probability of a wrong answer for each clue.
+
+    Models:
+        perfect: Every guess is right.
+        uniform: Every guess is wrong with probability UNIFORM_ERROR_RATE.
+        length: Longer clue text is harder; the median-length clue has the
+                uniform model's error rate.
+    """
+    if model == "perfect":
+        return np.zeros(len(clue_lengths))
+    if model == "uniform":
+        return np.full(len(clue_lengths), UNIFORM_ERROR_RATE)
+    if model == "length":
+        median = max(float(np.median(clue_lengths)), 1.0) if len(clue_lengths) else 1.0
+        return np.minimum(UNIFORM_ERROR_RATE * clue_lengths / median, MAX_ERROR_RATE)
+    raise ValueError(f"Unknown error model '{model}'.")
+
+
+def simulation_inputs(game: Game) -> tuple[list[str], list[list[int]], list[int] | None, "np.ndarray"]:
+    """
+    Converts the dependency graph built by `Game._build_graph` into index
+    lists over the solvable (non-end) clues.
+
+    Returns:
+        The clue IDs, each clue's dependencies (as positions in the ID
+        list), a topological order of the positions (None if the graph has
+        a cycle) and each clue's text length.
+    """
+    clue_ids = [clue_id for clue_id in game.clue_ids if not game.clues[clue_id].is_end_clue]
+    position = {clue_id: i for i, clue_id in enumerate(clue_ids)}
+    dependencies = [
+        [position[dependency_id] for dependency_id in game.rev_adj[clue_id] if dependency_id in position]
+        for clue_id in clue_ids
+    ]
+    dependents: list[list[int]] = [[] for _ in clue_ids]
+    remaining = [len(deps) for deps in dependencies]
+    for i, deps in enumerate(dependencies):
+        for dependency in deps:
+            dependents[dependency].append(i)
+    order = [i for i, count in enumerate(remaining) if count == 0]
+    for i in order:  # Kahn's algorithm; `order` grows while iterating.
+        for dependent in dependents[i]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                order.append(dependent)
+    lengths = np.array([len(game.clues[clue_id].clue_text) for clue_id in clue_ids], dtype=float)
+    return clue_ids, dependencies, order if len(order) == len(clue_ids) else None, lengths
+
+
+def simulate_orders(dependencies: list[list[int]], topological_order: list[int], plays: int,
+                    rng: "np.random.Generator", batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Plays `plays` games in random valid solve orders, where at every step
+    the next clue solved is chosen uniformly from the active clues.
+
+    Instead of stepping each play clue by clue, every clue gets an
+    exponentially distributed solve time that starts when it becomes active
+    (when its last dependency is solved). Exponential clocks are memoryless,
+    so whichever active clue finishes first is a uniform choice among them
+    at every step. Finish times are one vectorized pass over the clues in
+    topological order, and sorting them gives each play's solve order.
+
+    Returns:
+        A dictionary with "active_histogram" (counts[step, active set size])
+        and "forced" (per clue, how often it was solved as the only active
+        clue).
+    """
+    n = len(dependencies)
+    histogram = np.zeros((n, n + 1), dtype=np.int64)
+    forced = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return {"active_histogram": histogram, "forced": forced}
+    for start in range(0, plays, batch_size):
+        size = min(batch_size, plays - start)
+        durations = rng.standard_exponential((size, n))
+        activated = np.zeros((size, n))
+        finished = np.empty((size, n))
+        for i in topological_order:
+            if dependencies[i]:
+                activated[:, i] = finished[:, dependencies[i]].max(axis=1)
+            finished[:, i] = activated[:, i] + durations[:, i]
+
+        solve_order = finished.argsort(axis=1)
+        solve_times = np.take_along_axis(finished, solve_order, axis=1)
+        # Before step t, the active clues are those activated by the time of
+        # step t - 1 (time 0 for t = 0), minus the t clues already solved.
+        # Offsetting each play's times into its own range lets a single
+        # searchsorted count within every row at once.
+        offsets = (np.arange(size) * (solve_times[:, -1].max() + 1.0))[:, None]
+        previous_times = np.concatenate([np.zeros((size, 1)), solve_times[:, :-1]], axis=1)
+        activated_by = np.searchsorted(
+            (np.sort(activated, axis=1) + offsets).ravel(), (previous_times + offsets).ravel(), side="right"
+        ).reshape(size, n) - np.arange(size)[:, None] * n
+        active_counts = activated_by - np.arange(n)
+
+        for step in range(n):
+            histogram[step] += np.bincount(active_counts[:, step], minlength=n + 1)
+        forced += np.bincount(solve_order[active_counts == 1], minlength=n)
+    return {"active_histogram": histogram, "forced": forced}
+
+
+def _histogram_percentiles(histogram: "np.ndarray", percentiles: list[int]) -> dict[str, list[int]]:
+    """Returns per-step percentiles of the active set size from a step x size histogram."""
+    cumulative = histogram.cumsum(axis=1)
+    totals = cumulative[:, -1:]
+    return {
+        f"p{p}": (cumulative * 100 < totals * p).sum(axis=1).tolist()
+        for p in percentiles
+    }
+
+
+def simulate_guesses(error_rates: "np.ndarray", plays: int, rng: "np.random.Generator",
+                     batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Samples the total number of guesses per play when each guess at a clue
+    is wrong with that clue's error rate (guesses per clue are geometric).
+    """
+    totals = np.empty(plays, dtype=np.int64)
+    for start in range(0, plays, batch_size):
+        size = min(batch_size, plays - start)
+        totals[start:start + size] = rng.geometric(1.0 - error_rates, size=(size, len(error_rates))).sum(axis=1)
+    summary = {"mean": float(totals.mean()) if plays else 0.0}
+    if plays:
+        for p, value in zip(PERCENTILES, np.percentile(totals, PERCENTILES)):
+            summary[f"p{p}"] = float(value)
+    return summary
+
+
+def simulate_puzzle(filepath: str, plays: int = DEFAULT_PLAYS, seed: int | None = None,
+                    error_models: list[str] = ERROR_MODELS) -> dict:
+    """
+    Runs the Monte Carlo simulation for a single puzzle file.
+
+    Args:
+        filepath: The path to a puzzle JSON file.
+        plays: The number of simulated plays.
+        seed: Seed for the random generator, for reproducible results.
+        error_models: Names of the error models to sample guesses under.
+
+    Returns:
+        A dictionary with "file", "errors" and, for playable puzzles,
+        "clues", "plays", "openness" (mean active set size over the whole
+        game), "forced_move_rate" (fraction of moves with only one active
+        clue), "active_set" (mean and percentiles of the active set size at
+        each step), "bottlenecks" (clues most often solved as the only
+        option) and "guesses" (total guesses per error model).
+    """
+    result: dict = {"file": filepath, "errors": []}
+    try:
+        game = Game.from_json_file(filepath)
+    except (OSError, ValueError) as e:
+        result["errors"].append(f"Could not load: {e}")
+        return result
+
+    rng = np.random.default_rng(seed)
+    clue_ids, dependencies, topological_order, lengths = simulation_inputs(game)
+    if topological_order is None:
+        result["errors"].append("Dependency graph contains a cycle.")
+        return result
+    orders = simulate_orders(dependencies, topological_order, plays, rng)
+
+    histogram = orders["active_histogram"]
+    sizes = np.arange(histogram.shape[1])
+    moves = histogram.sum()
+    result["clues"] = len(clue_ids)
+    result["plays"] = plays
+    result["openness"] = float((histogram * sizes).sum() / moves) if moves else 0.0
+    result["forced_move_rate"] = float(histogram[:, 1].sum() / moves) if moves else 0.0
+    result["active_set"] = {
+        "mean": ((histogram * sizes).sum(axis=1) / max(plays, 1)).tolist(),
+        **_histogram_percentiles(histogram, PERCENTILES),
+    }
+    ranking = np.argsort(-orders["forced"], kind="stable")
+    result["bottlenecks"] = [
+        {"clue_id": clue_ids[i], "forced_rate": float(orders["forced"][i] / plays)}
+        for i in ranking[:5] if orders["forced"][i]
+    ]
+    result["guesses"] = {
+        model: simulate_guesses(_error_rates(model, lengths), plays, rng)
+        for model in error_models
+    }
+    return result
+
+
+def _simulate(args: tuple) -> dict:
+    return simulate_puzzle(*args)
+
+
+def main():
+    """
+    Main function to run the script from the command line.
+    Simulates every puzzle in a directory and ranks them by openness.
+    """
+    parser = argparse.ArgumentParser(
+        description="Simulate random valid play of every puzzle in a directory to estimate difficulty."
+    )
+    parser.add_argument(
+        "json_dir",
+        nargs="?",
+        default=DEFAULT_JSON_DIR,
+        help=f"Directory to search recursively for puzzle JSON files (default: {DEFAULT_JSON_DIR})."
+    )
+    parser.add_argument(
+        "--plays",
+        type=int,
+        default=DEFAULT_PLAYS,
+        help=f"Simulated plays per puzzle (default: {DEFAULT_PLAYS})."
+    )
+    parser.add_argument(
+        "--error-models",
+        default=",".join(ERROR_MODELS),
+        help=f"Comma-separated error models to sample guesses under (default: {','.join(ERROR_MODELS)})."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed, for reproducible results."
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the full JSON results to this path."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)."
+    )
+    args = parser.parse_args()
+
+    if np is None:
+        print("Error: numpy is required for this script. Install it with: pip install -e .[analysis]")
+        sys.exit(1)
+    if not os.path.isdir(args.json_dir):
+        print(f"Error: Puzzle directory not found at '{args.json_dir}'")
+        sys.exit(1)
+    error_models = [model.strip() for model in args.error_models.split(",") if model.strip()]
+    unknown = [model for model in error_models if model not in ERROR_MODELS]
+    if unknown:
+        print(f"Error: Unknown error models: {', '.join(unknown)}. Choose from {', '.join(ERROR_MODELS)}.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    paths = _find_puzzles(args.json_dir)
+    # Give each puzzle its own seed so results do not depend on scheduling.
+    seeds = np.random.SeedSequence(args.seed).spawn(len(paths))
+    tasks = [(path, args.plays, seed.generate_state(1)[0], error_models) for path, seed in zip(paths, seeds)]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(_simulate, tasks))
+    elapsed = time.perf_counter() - start
+
+    playable = sorted((r for r in results if not r["errors"]), key=lambda r: r["openness"])
+    for r in playable:
+        guesses = ", ".join(f"{model} {stats['mean']:.1f}" for model, stats in r["guesses"].items())
+        bottlenecks = ", ".join(b["clue_id"] for b in r["bottlenecks"]) or "-"
+        print(f"{r['file']}: openness {r['openness']:.2f}, forced moves {r['forced_move_rate']:.0%}, "
+              f"mean guesses ({guesses}), bottlenecks {bottlenecks}")
+    for r in results:
+        if r["errors"]:
+            print(f"Problem in '{r['file']}': {'; '.join(r['errors'])}")
+    print(f"Simulated {len(results)} puzzles x {args.plays} plays in {elapsed:.2f}s.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"plays": args.plays, "error_models": error_models, "puzzles": results}, f, indent=2)
+        print(f"Saved results to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
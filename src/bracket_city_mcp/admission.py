@@ -0,0 +1,213 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+import anyio
+
+# Buckets for (caller, tool) pairs beyond this many are forgotten, least
+# recently used first; a forgotten bucket starts full again.
+MAX_BUCKETS = 100_000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float, now: float):
+        """
+        Initializes a TokenBucket that refills at `rate` tokens per second up
+        to `burst` tokens, starting full.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def try_acquire(self, now: float, cost: float = 1.0) -> float:
+        """
+        Takes `cost` tokens if at least one is available. Returns 0.0 on
+        success, otherwise the number of seconds until a token will be
+        available. A cost above the tokens left puts the bucket in debt, so
+        one call worth several can still be made, and later calls wait
+        until the debt is repaid.
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= cost
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    def __init__(self, rate: float = 0.0, burst: float = 10.0, max_buckets: int = MAX_BUCKETS):
+        """
+        Initializes a RateLimiter with one token bucket per (caller, tool),
+        where a caller is a session or, without one, a client.
+
+        Args:
+            rate: Sustained calls per second allowed per caller and tool.
+                  0 disables rate limiting.
+            burst: Calls a caller may make in a burst before being limited.
+            max_buckets: The maximum number of buckets kept.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_buckets = max_buckets
+        self._buckets: OrderedDict[tuple[str | None, str], TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, caller: str | None, tool: str, cost: float = 1.0) -> float:
+        """
+        Records a call worth `cost` calls. Returns 0.0 if it is allowed,
+        otherwise the number of seconds after which the caller should retry.
+        """
+        if self.rate <= 0:
+            return 0.0
+        key = (caller, tool)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, max(self.burst, 1.0), now)
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.try_acquire(now, cost)
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, target_latency: float = 0.0, initial_limit: int = 32,
+                 min_limit: int = 1, max_limit: int = 256, backoff: float = 0.9):
+        """
+        Initializes an AdaptiveConcurrencyLimiter, which caps the number of
+        tool calls running at once and adapts the cap to latency (AIMD):
+        every call slower than `target_latency` multiplies the limit by
+        `backoff`, and every faster call raises it by 1/limit, i.e. by about
+        one per limit's worth of calls.
+
+        Args:
+            target_latency: The latency target in seconds. 0 disables the limiter.
+            initial_limit: The starting concurrency limit.
+            min_limit: The limit never drops below this.
+            max_limit: The limit never rises above this.
+            backoff: The factor applied to the limit after a slow call.
+        """
+        self.target_latency = target_latency
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.target_latency > 0
+
+    def try_acquire(self) -> bool:
+        """Starts a call if under the current limit. Returns False to shed it."""
+        with self._lock:
+            if self.enabled and self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float):
+        """Ends a call started with `try_acquire` and adapts the limit."""
+        with self._lock:
+            self.in_flight -= 1
+            if not self.enabled:
+                return
+            if latency > self.target_latency:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+
+class AdmissionController:
+    def __init__(self, rate_limiter: RateLimiter | None = None,
+                 concurrency_limiter: AdaptiveConcurrencyLimiter | None = None):
+        """
+        Initializes an AdmissionController, which decides whether each tool
+        call may run: first against the caller's per-tool rate
+        limit, then against the global adaptive concurrency limit. Rejected
+        calls get an immediate "retry later" response instead of queueing.
+        """
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.concurrency_limiter = concurrency_limiter or AdaptiveConcurrencyLimiter()
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self._latency_ewma = 0.0
+        self._lock = threading.Lock()
+
+    def _rejection(self, reason: str, message: str, retry_after: float) -> dict[str, Any]:
+        return {
+            "error": reason,
+            "message": message,
+            "retry_after": round(retry_after, 3),
+        }
+
+    def guard(self, tool_name: str, fn: Callable, caller: Callable[[], str | None],
+              rate_key: str | None = None, cost: Callable[..., float] | None = None) -> Callable:
+        """
+        Wraps a synchronous tool function for registration with FastMCP.
+
+        The returned coroutine function admits or rejects the call and runs
+        admitted calls in a worker thread, so slow calls do not block the
+        event loop and concurrent calls really are concurrent.
+
+        Args:
+            tool_name: The tool's name, for per-tool limits.
+            fn: The tool implementation.
+            caller: Returns the key of the caller's rate limits, e.g. its
+                    session ID.
+            rate_key: The tool whose rate limit the call counts against
+                      (default: `tool_name`), e.g. so that a batch tool
+                      shares the limit of the tool it batches.
+            cost: Returns how many calls a call is worth, given the call's
+                  arguments (default: 1).
+        """
+        rate_key = rate_key or tool_name
+
+        @functools.wraps(fn)
+        async def guarded(*args, **kwargs):
+            calls = cost(*args, **kwargs) if cost is not None else 1.0
+            retry_after = self.rate_limiter.check(caller(), rate_key, calls)
+            if retry_after:
+                with self._lock:
+                    self.rate_limited += 1
+                return self._rejection(
+                    "rate_limited", f"Too many '{tool_name}' calls. Retry later.", retry_after
+                )
+            if not self.concurrency_limiter.try_acquire():
+                with self._lock:
+                    self.shed += 1
+                return self._rejection(
+                    "overloaded", "The server is overloaded. Retry later.",
+                    self.concurrency_limiter.target_latency
+                )
+            with self._lock:
+                self.admitted += 1
+            start = time.monotonic()
+            try:
+                return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+            finally:
+                latency = time.monotonic() - start
+                self.concurrency_limiter.release(latency)
+                with self._lock:
+                    self._latency_ewma += 0.1 * (latency - self._latency_ewma)
+
+        return guarded
+
+    def stats(self) -> dict:
+        """Returns admission counters and the current concurrency limit."""
+        return {
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "shed": self.shed,
+            "in_flight": self.concurrency_limiter.in_flight,
+            "concurrency_limit": int(self.concurrency_limiter.limit) if self.concurrency_limiter.enabled else None,
+            "latency_ewma_ms": round(self._latency_ewma * 1000, 3),
+        }
@@ -0,0 +1,61 @@
+import json
+import os
+import threading
+import time
+
+from bracket_city_mcp.game.game import Game
+
+
+class AnswerLog:
+    def __init__(self, directory: str):
+        """
+        Initializes an AnswerLog, which appends every answer given in a
+        server-side session to `<directory>/answers-<pid>.jsonl`, one JSON
+        object per line, for offline replay (see scripts/replay_sessions.py).
+
+        Each record has "session", "game" (the puzzle's game_id),
+        "fingerprint" (hex), "tool" ("answer_clue" or "answer_any"),
+        "clue_id" (the clue named, or solved by answer_any), "answer",
+        "correct", the game's "incorrect_guesses" and "completed" after
+        the answer, and "time" (Unix time).
+
+        Other changes to a session's game are recorded too, so replay can
+        follow them. "checkpoint" and "rollback" records carry the
+        "checkpoint" ID, and "correct" says whether the rollback found it.
+        A "switch" record means the session now plays the puzzle it names,
+        from the start.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"answers-{os.getpid()}.jsonl")
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def record(self, session_id: str | None, game: Game, tool: str, clue_id: str | None, answer: str, correct: bool,
+               checkpoint: str | None = None):
+        record = {
+            "session": session_id or "default",
+            "game": game.game_id,
+            "fingerprint": game.fingerprint.hex(),
+            "tool": tool,
+            "clue_id": clue_id,
+            "answer": answer,
+            "correct": correct,
+            "incorrect_guesses": game.incorrect_guesses,
+            "completed": game.is_complete,
+            "time": round(time.time(), 3),
+        }
+        if checkpoint is not None:
+            record["checkpoint"] = checkpoint
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.records += 1
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,203 @@
+import itertools
+import json
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, AsyncContextManager
+
+import anyio
+from mcp import ClientSession
+from mcp.types import CallToolResult
+
+# Admission control rejections (see bracket_city_mcp.admission) that are
+# retried after the server's retry_after hint.
+RETRYABLE_ERRORS = ("rate_limited", "overloaded")
+# The batch tool used when the server offers it.
+BATCH_TOOL = "answer_batch"
+
+
+class ServerError(RuntimeError):
+    """A tool call failed on the server, or kept being rejected as overloaded."""
+
+
+@asynccontextmanager
+async def http_session(url: str, headers: dict[str, str] | None = None) -> AsyncIterator[ClientSession]:
+    """Opens an initialized MCP session to a streamable HTTP server, e.g. "http://localhost:8080/mcp"."""
+    from mcp.client.streamable_http import streamablehttp_client
+
+    async with streamablehttp_client(url, headers=headers) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+def _unwrap(result: CallToolResult) -> Any:
+    """Returns a tool's return value from its MCP result."""
+    if result.isError:
+        raise ServerError(" ".join(getattr(block, "text", "") for block in result.content))
+    if result.structuredContent is not None:
+        # FastMCP wraps return values that are not objects with a schema.
+        return result.structuredContent.get("result", result.structuredContent)
+    text = "".join(getattr(block, "text", "") for block in result.content)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class SessionPool:
+    def __init__(self, url: str | None = None, size: int = 4, max_in_flight: int = 32, max_retries: int = 5,
+                 connect: Callable[[], AsyncContextManager[ClientSession]] | None = None):
+        """
+        Initializes a SessionPool: persistent MCP sessions to one BracketCity
+        server, shared by any number of concurrent games.
+
+        Calls are spread round-robin over the sessions, and each session
+        carries up to `max_in_flight` calls at once, so callers can issue
+        many calls without waiting for each reply. Games are played with
+        client-held state tokens (see `new_game`), so any session can carry
+        any game and sessions never need to be reopened.
+
+        Use as `async with SessionPool(url) as pool: ...`.
+
+        Args:
+            url: The server's streamable HTTP endpoint, e.g. "http://localhost:8080/mcp".
+            size: The number of sessions to open.
+            max_in_flight: The most concurrent calls per session.
+            max_retries: How often a call rejected as rate limited or
+                         overloaded is retried before ServerError is raised.
+            connect: Opens one initialized session; defaults to `http_session(url)`.
+        """
+        if connect is None:
+            if url is None:
+                raise ValueError("Either url or connect must be given.")
+            connect = lambda: http_session(url)
+        self._connect = connect
+        self.size = size
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self._sessions: list[tuple[ClientSession, anyio.Semaphore]] = []
+        self._next = itertools.count()
+        self._stack: AsyncExitStack | None = None
+        self.tools: set[str] = set()
+        self.calls = 0
+        self.retries = 0
+
+    async def __aenter__(self) -> 'SessionPool':
+        self._stack = AsyncExitStack()
+        try:
+            for _ in range(self.size):
+                session = await self._stack.enter_async_context(self._connect())
+                self._sessions.append((session, anyio.Semaphore(self.max_in_flight)))
+            listed = await self._sessions[0][0].list_tools()
+            self.tools = {tool.name for tool in listed.tools}
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._sessions = []
+        await self._stack.aclose()
+
+    @property
+    def supports_batch(self) -> bool:
+        return BATCH_TOOL in self.tools
+
+    async def call(self, tool: str, arguments: dict[str, Any] | None = None) -> Any:
+        """
+        Calls a tool on the next session and returns its result. Calls the
+        server rejects as rate limited or overloaded are retried after the
+        delay it asks for.
+
+        Raises:
+            ServerError: If the call fails, or is still rejected after `max_retries` retries.
+        """
+        if not self._sessions:
+            raise RuntimeError("The pool is not open. Use 'async with SessionPool(...)'.")
+        session, in_flight = self._sessions[next(self._next) % len(self._sessions)]
+        self.calls += 1
+        for attempt in range(self.max_retries + 1):
+            async with in_flight:
+                value = _unwrap(await session.call_tool(tool, arguments or {}))
+            if not (isinstance(value, dict) and value.get("error") in RETRYABLE_ERRORS):
+                return value
+            if attempt < self.max_retries:
+                self.retries += 1
+                await anyio.sleep(value.get("retry_after") or 0.05)
+        raise ServerError(value.get("message", value["error"]))
+
+    async def pipeline(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """
+        Issues several tool calls at once, without waiting for each reply,
+        and returns their results in the order given. The calls may run in
+        any order on the server, so they must not depend on each other.
+        """
+        results: list[Any] = [None] * len(calls)
+
+        async def run(index: int, tool: str, arguments: dict[str, Any]):
+            results[index] = await self.call(tool, arguments)
+
+        async with anyio.create_task_group() as tasks:
+            for index, (tool, arguments) in enumerate(calls):
+                tasks.start_soon(run, index, tool, arguments)
+        return results
+
+    async def read(self, uri: str) -> str:
+        """Reads a resource (e.g. "bracketcity://metrics") and returns its text."""
+        session, in_flight = self._sessions[next(self._next) % len(self._sessions)]
+        async with in_flight:
+            result = await session.read_resource(uri)
+        return "".join(getattr(content, "text", "") for content in result.contents)
+
+    async def new_game(self) -> 'RemoteGame':
+        """Starts a new game of the server's current puzzle."""
+        started = await self.call("start_game")
+        return RemoteGame(self, started["state"], started["available_clues"])
+
+
+class RemoteGame:
+    def __init__(self, pool: SessionPool, state: str, available_clues: list[str]):
+        """
+        Initializes a RemoteGame: one game played through a SessionPool. The
+        game's state token is kept here and sent with every call.
+        """
+        self.pool = pool
+        self.state = state
+        self.available_clues = available_clues
+        self.completed = False
+        self.score: int | None = None
+
+    def _update(self, response: dict[str, Any]):
+        if "state" not in response:
+            raise ServerError(response.get("message", "The server returned no state."))
+        self.state = response["state"]
+        self.available_clues = response["available_clues"]
+        self.completed = response["game_completed"]
+        self.score = response.get("score", self.score)
+
+    async def answer(self, clue_id: str, answer: str) -> dict[str, Any]:
+        """Answers a clue and returns the server's answer_clue response."""
+        response = await self.pool.call("answer_clue", {"clue_id": clue_id, "answer": answer, "state": self.state})
+        self._update(response)
+        return response
+
+    async def answer_many(self, answers: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """
+        Answers several clues in order and returns one response per answer.
+        Uses a single answer_batch call when the server offers it.
+        """
+        if not answers:
+            return []
+        if not self.pool.supports_batch:
+            return [await self.answer(clue_id, answer) for clue_id, answer in answers]
+        batch = await self.pool.call(BATCH_TOOL, {
+            "answers": [{"clue_id": clue_id, "answer": answer} for clue_id, answer in answers],
+            "state": self.state,
+        })
+        if not batch["results"]:
+            raise ServerError(batch.get("message", "The batch was rejected."))
+        self._update(batch["results"][-1])
+        return batch["results"]
+
+    async def text(self) -> str:
+        """Returns the rendered puzzle text in this game's current state."""
+        return await self.pool.read(f"bracketcity://state/{self.state}/game")
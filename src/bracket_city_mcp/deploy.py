@@ -0,0 +1,379 @@
+import argparse
+import hashlib
+import itertools
+import multiprocessing
+import os
+import secrets
+import socket
+import time
+import zoneinfo
+from contextlib import asynccontextmanager
+
+from mcp.server.fastmcp import FastMCP
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+SESSION_HEADER = "mcp-session-id"
+# Must match bracket_city_mcp.main.TOKEN_SECRET_ENV; duplicated to avoid
+# importing (and loading the game in) the router process.
+TOKEN_SECRET_ENV = "BRACKET_CITY_TOKEN_SECRET"
+# Must match bracket_city_mcp.main.CLIENT_HEADER. The router passes each
+# client's address to the workers in it, since they only see the router's.
+CLIENT_HEADER = "x-bracket-city-client"
+# Headers that apply to a single connection and must not be forwarded.
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host",
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses the server's command-line options."""
+    parser = argparse.ArgumentParser(description="Run the BracketCity MCP server.")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on (default: 0.0.0.0).")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080).")
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default="streamable-http",
+        help="MCP transport to serve (default: streamable-http)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes. Values above 1 require the streamable-http transport."
+    )
+    parser.add_argument(
+        "--worker-base-port",
+        type=int,
+        default=None,
+        help="First local port used by worker processes (default: --port + 1)."
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to let in-flight requests finish on shutdown (default: 30)."
+    )
+    parser.add_argument(
+        "--stateless",
+        action="store_true",
+        help="Keep no per-session state: clients carry their play state in signed tokens, "
+             "so any worker can serve any request."
+    )
+    parser.add_argument(
+        "--prerender-workers",
+        type=int,
+        default=0,
+        help="Background threads per worker that render likely next game states "
+             "after each correct answer (default: 0, disabled)."
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Sustained calls per second allowed per session and tool (default: 0, unlimited)."
+    )
+    parser.add_argument(
+        "--rate-burst",
+        type=float,
+        default=10.0,
+        help="Calls per session and tool allowed in a burst above --rate-limit (default: 10)."
+    )
+    parser.add_argument(
+        "--latency-target-ms",
+        type=float,
+        default=0.0,
+        help="Tool latency target per worker. Concurrent tool calls are limited adaptively and "
+             "excess calls are rejected with a retry-later response when calls get slower "
+             "than this (default: 0, disabled)."
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=64,
+        help="Upper bound for the adaptive concurrency limit per worker (default: 64)."
+    )
+    parser.add_argument(
+        "--rotate-daily",
+        action="store_true",
+        help="Serve each day's puzzle from --puzzle-dir/<YYYYMMDD>.json, switching at midnight."
+    )
+    parser.add_argument(
+        "--puzzle",
+        default=None,
+        help="Puzzle file to serve (default: $BRACKET_CITY_PUZZLE, or games/json/20250110.json "
+             "in the source checkout)."
+    )
+    parser.add_argument(
+        "--puzzle-dir",
+        default="games/json",
+        help="Directory of daily puzzle files for --rotate-daily (default: games/json)."
+    )
+    parser.add_argument(
+        "--rotation-timezone",
+        default=None,
+        help="IANA time zone whose midnight starts a new puzzle day, e.g. America/New_York "
+             "(default: the server's local time)."
+    )
+    parser.add_argument(
+        "--prewarm-minutes",
+        type=float,
+        default=10.0,
+        help="Minutes before midnight to load and render the next day's puzzle (default: 10)."
+    )
+    parser.add_argument(
+        "--answer-log",
+        default=None,
+        help="Directory to record every session answer in, one JSON Lines file per worker, "
+             "for scripts/replay_sessions.py (default: not recorded)."
+    )
+    parser.add_argument(
+        "--session-memory-mb",
+        type=float,
+        default=None,
+        help="Estimated memory per worker for server-side sessions, in MiB. Beyond it, the least "
+             "recently used idle sessions are spilled to disk and reloaded on their next request "
+             "(default: unlimited)."
+    )
+    parser.add_argument(
+        "--spill-dir",
+        default=None,
+        help="Directory for spilled sessions (default: the system temporary directory)."
+    )
+    parser.add_argument(
+        "--session-ttl-minutes",
+        type=float,
+        default=24 * 60,
+        help="Minutes without a request after which a server-side session, in memory or spilled, "
+             "is removed (default: 1440)."
+    )
+    parser.add_argument("--log-level", default="info", help="Log level (default: info).")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.prerender_workers < 0:
+        parser.error("--prerender-workers must not be negative")
+    if args.rate_limit < 0 or args.latency_target_ms < 0:
+        parser.error("--rate-limit and --latency-target-ms must not be negative")
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    if args.prewarm_minutes < 0:
+        parser.error("--prewarm-minutes must not be negative")
+    if args.session_memory_mb is not None and args.session_memory_mb <= 0:
+        parser.error("--session-memory-mb must be positive")
+    if args.session_ttl_minutes <= 0:
+        parser.error("--session-ttl-minutes must be positive")
+    if args.rotation_timezone is not None:
+        try:
+            zoneinfo.ZoneInfo(args.rotation_timezone)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            parser.error(f"--rotation-timezone: unknown time zone '{args.rotation_timezone}'")
+    if args.workers > 1 and args.transport != "streamable-http":
+        parser.error("--workers above 1 requires --transport streamable-http")
+    if args.worker_base_port is None:
+        args.worker_base_port = args.port + 1
+    return args
+
+
+def encode_session_id(worker_index: int, worker_session_id: str) -> str:
+    """Returns the public session ID for a session owned by `worker_index`."""
+    return f"w{worker_index}-{worker_session_id}"
+
+
+def decode_session_id(session_id: str, workers: int) -> tuple[int, str]:
+    """
+    Returns the (worker index, worker-local session ID) for a public session ID.
+
+    IDs minted by the router embed their worker index. Any other ID is
+    routed by a stable hash and forwarded unchanged.
+    """
+    prefix, separator, worker_session_id = session_id.partition("-")
+    if separator and prefix[:1] == "w" and prefix[1:].isdigit() and int(prefix[1:]) < workers:
+        return int(prefix[1:]), worker_session_id
+    digest = hashlib.sha1(session_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % workers, session_id
+
+
+def create_router_app(worker_urls: list[str], transport=None):
+    """
+    Creates the ASGI app that fronts the worker processes.
+
+    Requests that carry a session ID go to the worker that owns that
+    session. New sessions (requests without an ID) are spread round-robin,
+    and the worker's session ID is rewritten on the way out so later
+    requests find their way back to the same worker. The client's address
+    is passed on in CLIENT_HEADER. Responses, including
+    SSE streams, are streamed through unchanged.
+
+    Args:
+        worker_urls: Base URLs of the workers, e.g. "http://127.0.0.1:8081".
+        transport: Optional httpx transport, used by tests.
+    """
+    import httpx
+    from starlette.applications import Starlette
+    from starlette.background import BackgroundTask
+    from starlette.responses import PlainTextResponse, StreamingResponse
+    from starlette.routing import Route
+
+    client = httpx.AsyncClient(timeout=None, transport=transport)
+    next_worker = itertools.count()
+
+    async def forward(request):
+        public_session_id = request.headers.get(SESSION_HEADER)
+        if public_session_id is None:
+            worker_index = next(next_worker) % len(worker_urls)
+            worker_session_id = None
+        else:
+            worker_index, worker_session_id = decode_session_id(public_session_id, len(worker_urls))
+
+        headers = [
+            (name, value) for name, value in request.headers.items()
+            if name not in HOP_BY_HOP_HEADERS and name not in (SESSION_HEADER, CLIENT_HEADER)
+        ]
+        if request.client is not None:
+            headers.append((CLIENT_HEADER, request.client.host))
+        if worker_session_id is not None:
+            headers.append((SESSION_HEADER, worker_session_id))
+        url = worker_urls[worker_index] + request.url.path
+        if request.url.query:
+            url += "?" + request.url.query
+
+        upstream_request = client.build_request(
+            request.method, url, headers=headers, content=await request.body()
+        )
+        try:
+            upstream = await client.send(upstream_request, stream=True)
+        except httpx.TransportError:
+            return PlainTextResponse("Worker unavailable, retry later.", status_code=503)
+
+        response_headers = {
+            name: value for name, value in upstream.headers.items()
+            if name not in HOP_BY_HOP_HEADERS
+        }
+        if SESSION_HEADER in upstream.headers:
+            response_headers[SESSION_HEADER] = encode_session_id(worker_index, upstream.headers[SESSION_HEADER])
+        return StreamingResponse(
+            upstream.aiter_raw(),
+            status_code=upstream.status_code,
+            headers=response_headers,
+            background=BackgroundTask(upstream.aclose),
+        )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await client.aclose()
+
+    methods = ["GET", "POST", "DELETE", "PUT", "PATCH", "OPTIONS", "HEAD"]
+    return Starlette(routes=[Route("/{path:path}", forward, methods=methods)], lifespan=lifespan)
+
+
+def _run_worker(port: int, args: argparse.Namespace):
+    """Worker process entry point: serves the MCP app on a local port."""
+    import uvicorn
+    from bracket_city_mcp import main
+
+    # Leave the terminal's process group so Ctrl+C reaches only the router,
+    # which drains first and then stops the workers.
+    os.setpgrp()
+    main.mcp.settings.stateless_http = args.stateless
+    main.configure(args)
+    config = uvicorn.Config(
+        main.mcp.streamable_http_app(),
+        host="127.0.0.1",
+        port=port,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.drain_timeout,
+    )
+    uvicorn.Server(config).run()
+
+
+def _wait_for_port(port: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def serve_workers(args: argparse.Namespace):
+    """
+    Runs `args.workers` worker processes behind a session-affine router.
+
+    On SIGINT/SIGTERM the router stops accepting connections and waits up to
+    `args.drain_timeout` seconds for in-flight requests. The workers are then
+    asked to shut down in the same way, and any still running after a
+    further `args.drain_timeout` seconds are killed.
+    """
+    import uvicorn
+
+    # Workers inherit the environment, so they all sign state tokens with the
+    # same secret and any of them can verify a token minted by another.
+    os.environ.setdefault(TOKEN_SECRET_ENV, secrets.token_hex(32))
+    context = multiprocessing.get_context("spawn")
+    ports = [args.worker_base_port + i for i in range(args.workers)]
+    processes = [
+        context.Process(
+            target=_run_worker,
+            args=(port, args),
+            daemon=True,
+        )
+        for port in ports
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for port in ports:
+            if not _wait_for_port(port, timeout=60):
+                raise RuntimeError(f"Worker on port {port} did not start.")
+
+        config = uvicorn.Config(
+            create_router_app([f"http://127.0.0.1:{port}" for port in ports]),
+            host=args.host,
+            port=args.port,
+            log_level=args.log_level,
+            timeout_graceful_shutdown=args.drain_timeout,
+        )
+        uvicorn.Server(config).run()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + args.drain_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+
+
+def serve(mcp: FastMCP, args: argparse.Namespace, configure=None):
+    """
+    Runs the server as configured by `args` (see `parse_args`): a single
+    process for one worker, otherwise `serve_workers`.
+
+    Args:
+        mcp: The server to run in single-process mode.
+        args: The parsed command-line options.
+        configure: Called with `args` to apply server options (such as
+                   `bracket_city_mcp.main.configure`) in single-process mode.
+                   Worker processes call `main.configure` themselves.
+    """
+    if args.workers > 1:
+        serve_workers(args)
+        return
+    if configure is not None:
+        configure(args)
+    mcp.settings.stateless_http = args.stateless
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    mcp.settings.log_level = args.log_level.upper()
+    mcp.run(transport=args.transport)
+
+
+if __name__ == "__main__":
+    from bracket_city_mcp.main import configure, mcp as main_mcp
+    serve(main_mcp, parse_args(), configure)
@@ -1 +1,2 @@
 from .game import Game
+from .parser import BracketParseError, parse_clues
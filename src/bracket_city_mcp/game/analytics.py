@@ -0,0 +1,125 @@
+import math
+import warnings
+from array import array
+from typing import Iterable
+
+NOT_RECORDED = math.nan
+
+
+def _numpy():
+    """
+    Imports NumPy on first use, or returns None if it is not installed.
+    Only aggregation needs it, and importing it would slow server startup.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class ClueAnalytics:
+    def __init__(self, clue_count: int):
+        """
+        Initializes ClueAnalytics: per-clue play statistics for one game,
+        kept in flat typed arrays indexed by `Game.clue_index`.
+
+        Recording is a few array stores per answer, and the arrays can be
+        viewed by NumPy without copying when many games are aggregated.
+
+        Args:
+            clue_count: The number of clues in the game.
+        """
+        self.clue_count = clue_count
+        # Wrong answers given for each clue.
+        self.wrong_attempts = array('I', bytes(4 * clue_count))
+        # time.monotonic() when each clue became active / was solved, or NaN.
+        self.revealed_at = array('d', [NOT_RECORDED]) * clue_count
+        self.solved_at = array('d', [NOT_RECORDED]) * clue_count
+        self.attempted = False
+
+    def reset(self):
+        """Clears everything recorded so far."""
+        self.wrong_attempts = array('I', bytes(4 * self.clue_count))
+        self.revealed_at = array('d', [NOT_RECORDED]) * self.clue_count
+        self.solved_at = array('d', [NOT_RECORDED]) * self.clue_count
+        self.attempted = False
+
+    @property
+    def started_at(self) -> float:
+        """time.monotonic() when the first clues were revealed, i.e. when play started, or NaN."""
+        return min((t for t in self.revealed_at if not math.isnan(t)), default=NOT_RECORDED)
+
+    def record_reveal(self, index: int, now: float):
+        if math.isnan(self.revealed_at[index]):
+            self.revealed_at[index] = now
+
+    def record_attempt(self, index: int, correct: bool, now: float):
+        self.attempted = True
+        if correct:
+            self.solved_at[index] = now
+        else:
+            self.wrong_attempts[index] += 1
+
+
+def aggregate_clue_stats(clue_ids: list[str], analytics: Iterable[ClueAnalytics]) -> dict:
+    """
+    Reduces the analytics of many games of the same puzzle to per-clue
+    difficulty statistics with NumPy.
+
+    Args:
+        clue_ids: The puzzle's clue IDs, in `Game.clue_ids` order.
+        analytics: One ClueAnalytics per game (e.g. per session).
+
+    Returns:
+        A dictionary with "games" (the number of games aggregated) and
+        "clues", mapping each clue ID to "revealed" and "solved" (numbers of
+        games), "abandoned" (games where the clue was revealed but never
+        solved), "wrong_attempts" (mean wrong answers before solving, over
+        games that solved it) and "solve_seconds" (mean, median and 90th
+        percentile time from reveal to solve).
+
+    Raises:
+        RuntimeError: If NumPy is not installed.
+    """
+    np = _numpy()
+    if np is None:
+        raise RuntimeError("numpy is required for clue statistics. Install it with: pip install -e .[analysis]")
+    analytics = [a for a in analytics if a.clue_count == len(clue_ids)]
+    games = len(analytics)
+    n = len(clue_ids)
+    wrong = np.array([np.frombuffer(a.wrong_attempts, dtype=np.uint32) for a in analytics]).reshape(games, n)
+    revealed_at = np.array([np.frombuffer(a.revealed_at) for a in analytics]).reshape(games, n)
+    solved_at = np.array([np.frombuffer(a.solved_at) for a in analytics]).reshape(games, n)
+
+    revealed = ~np.isnan(revealed_at)
+    solved = ~np.isnan(solved_at)
+    abandoned = revealed & ~solved
+    solve_seconds = np.where(solved & revealed, solved_at - revealed_at, np.nan)
+    revealed_counts = revealed.sum(axis=0)
+    solved_counts = solved.sum(axis=0)
+    abandoned_counts = abandoned.sum(axis=0)
+    wrong_before_solve = np.where(solved, wrong, 0).sum(axis=0)
+    timed = (~np.isnan(solve_seconds)).any(axis=0)
+    with warnings.catch_warnings():
+        # Clues no game has solved yet produce all-NaN columns.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean_seconds = np.nanmean(solve_seconds, axis=0)
+        p50_seconds, p90_seconds = (
+            np.nanpercentile(solve_seconds, [50, 90], axis=0) if games else np.full((2, n), np.nan)
+        )
+
+    clues = {}
+    for i, clue_id in enumerate(clue_ids):
+        clues[clue_id] = {
+            "revealed": int(revealed_counts[i]),
+            "solved": int(solved_counts[i]),
+            "abandoned": int(abandoned_counts[i]),
+            "wrong_attempts": float(wrong_before_solve[i] / solved_counts[i]) if solved_counts[i] else None,
+            "solve_seconds": {
+                "mean": float(mean_seconds[i]),
+                "p50": float(p50_seconds[i]),
+                "p90": float(p90_seconds[i]),
+            } if timed[i] else None,
+        }
+    return {"games": games, "clues": clues}
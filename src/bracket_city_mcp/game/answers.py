@@ -0,0 +1,199 @@
+import sys
+import unicodedata
+from typing import Iterable
+
+
+class AnswerNormalizer:
+    def __init__(self, unicode_compatibility: bool = True, casefold: bool = True,
+                 fold_punctuation: bool = True, fold_whitespace: bool = False):
+        """
+        Initializes an AnswerNormalizer, which maps answers that should be
+        treated as equal to the same string.
+
+        Args:
+            unicode_compatibility: Apply NFKC normalization, so e.g. full-width
+                                   letters and ligatures match their plain forms.
+            casefold: Compare case-insensitively (Unicode casefolding).
+            fold_punctuation: Treat punctuation as whitespace, so "well-known"
+                              matches "well known".
+            fold_whitespace: Ignore whitespace entirely, so "ice cream" matches
+                             "icecream". Off by default, as it makes puzzles
+                             accept answers they used to reject; runs of
+                             whitespace are then collapsed and leading and
+                             trailing whitespace dropped.
+        """
+        self.unicode_compatibility = unicode_compatibility
+        self.casefold = casefold
+        self.fold_punctuation = fold_punctuation
+        self.fold_whitespace = fold_whitespace
+
+    def __call__(self, text: str) -> str:
+        if self.unicode_compatibility:
+            text = unicodedata.normalize("NFKC", text)
+        if self.casefold:
+            text = text.casefold()
+        if self.fold_punctuation:
+            text = "".join(" " if unicodedata.category(c).startswith("P") else c for c in text)
+        return "".join(text.split()) if self.fold_whitespace else " ".join(text.split())
+
+
+DEFAULT_NORMALIZER = AnswerNormalizer()
+# The largest edit distance reported as a near miss.
+DEFAULT_MAX_DISTANCE = 2
+
+
+def _deletions(word: str, max_deletions: int) -> set[str]:
+    """Returns `word` and every string obtained by deleting up to `max_deletions` characters."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_deletions):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """
+    Checks whether the edit distance between `a` and `b` (insertions,
+    deletions, substitutions and adjacent transpositions) is at most `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    before_previous_row = previous_row = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        previous_row, row = row, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], before_previous_row[j - 2] + 1)
+        before_previous_row = previous_row
+        if min(row) > limit:
+            return False
+    return row[len(b)] <= limit
+
+
+class _NearMissIndex:
+    def __init__(self, accepted: tuple[str, ...], max_distance: int):
+        """
+        Initializes a _NearMissIndex: a deletion-neighbourhood index over
+        normalized accepted answers. Two strings within edit distance d
+        share a variant with at most d deletions each, so a guess is only
+        compared with the answers that share a variant with it.
+        """
+        self._limits: dict[str, int] = {}
+        # Deletion variant -> accepted answers it was derived from.
+        index: dict[str, list[str]] = {}
+        for answer in accepted:
+            limit = min(max_distance, len(answer) // 4)
+            if limit == 0:
+                continue
+            self._limits[answer] = limit
+            for variant in _deletions(answer, limit):
+                index.setdefault(variant, []).append(answer)
+        # Tuples, unlike lists, carry no spare capacity.
+        self._index: dict[str, tuple[str, ...]] = {variant: tuple(found) for variant, found in index.items()}
+        self._max_limit = max(self._limits.values(), default=0)
+        self._min_length = min(map(len, self._limits), default=0) - self._max_limit
+        self._max_length = max(map(len, self._limits), default=0) + self._max_limit
+
+    def is_close(self, guess: str) -> bool:
+        """Checks whether a normalized guess is within the near-miss distance of an indexed answer."""
+        if not self._min_length <= len(guess) <= self._max_length:
+            return False
+        checked = set()
+        for variant in _deletions(guess, self._max_limit):
+            for answer in self._index.get(variant, ()):
+                if answer not in checked:
+                    checked.add(answer)
+                    if _within_distance(guess, answer, self._limits[answer]):
+                        return True
+        return False
+
+
+class AnswerMatcher:
+    # Every clue has a matcher, so they are kept small.
+    __slots__ = ("normalizer", "accepted", "max_distance", "_near_misses")
+
+    def __init__(self, answers: Iterable[str], normalizer: AnswerNormalizer = DEFAULT_NORMALIZER,
+                 max_distance: int = DEFAULT_MAX_DISTANCE):
+        """
+        Initializes an AnswerMatcher for a clue's accepted answers.
+
+        The normalized accepted answers are computed here. The
+        deletion-neighbourhood index used for near misses is much larger and
+        slower to build, and most clues never get a wrong guess, so it is
+        built on the first call to `is_close`. An answer of length n allows
+        a near-miss distance of min(max_distance, n // 4), so short answers
+        only match exactly. Matchers are shared rather than copied by
+        deepcopy.
+
+        Args:
+            answers: The accepted answers: the clue's answer and any alternates.
+            normalizer: Maps equivalent spellings to the same string.
+            max_distance: The largest edit distance reported as a near miss.
+        """
+        self.normalizer = normalizer
+        # A tuple of the distinct answers: clues rarely have more than two,
+        # and a tuple is a fraction of a frozenset's size.
+        self.accepted: tuple[str, ...] = tuple(dict.fromkeys(sys.intern(normalizer(answer)) for answer in answers))
+        self.max_distance = max_distance
+        self._near_misses: _NearMissIndex | None = None
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def matches(self, provided_answer: str) -> bool:
+        """Checks whether a guess is one of the accepted answers once normalized."""
+        return self.normalizer(provided_answer) in self.accepted
+
+    def is_close(self, provided_answer: str) -> bool:
+        """
+        Checks whether a guess is not accepted but within the near-miss edit
+        distance of an accepted answer.
+        """
+        near_misses = self._near_misses
+        if near_misses is None:
+            # Building twice in a race is harmless; the results are equal.
+            near_misses = self._near_misses = _NearMissIndex(self.accepted, self.max_distance)
+        guess = self.normalizer(provided_answer)
+        if guess in self.accepted:
+            return False
+        return near_misses.is_close(guess)
+
+
+class AnswerIndex:
+    def __init__(self, matchers: list[AnswerMatcher | None]):
+        """
+        Initializes an AnswerIndex: a hash index from normalized accepted
+        answers to the positions of the clues that accept them.
+
+        Args:
+            matchers: Each clue's AnswerMatcher, in `Game.clue_ids` order, or
+                      None for clues that cannot be answered (end clues).
+        """
+        # One index per distinct normalizer in use (normally just one).
+        self._indices: list[tuple[AnswerNormalizer, dict[str, tuple[int, ...]]]] = []
+        for position, matcher in enumerate(matchers):
+            if matcher is None:
+                continue
+            index = next((i for n, i in self._indices if n is matcher.normalizer), None)
+            if index is None:
+                index = {}
+                self._indices.append((matcher.normalizer, index))
+            for answer in matcher.accepted:
+                index[answer] = index.get(answer, ()) + (position,)
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def lookup(self, provided_answer: str) -> tuple[int, ...]:
+        """Returns the positions of the clues accepting `provided_answer`, in ascending order."""
+        if len(self._indices) == 1:
+            normalizer, index = self._indices[0]
+            return index.get(normalizer(provided_answer), ())
+        positions = set()
+        for normalizer, index in self._indices:
+            positions.update(index.get(normalizer(provided_answer), ()))
+        return tuple(sorted(positions))
@@ -1,11 +1,18 @@
-from typing import TYPE_CHECKING
+import sys
+from typing import TYPE_CHECKING, Callable
+
+from .answers import DEFAULT_NORMALIZER, AnswerMatcher, AnswerNormalizer
 
 if TYPE_CHECKING:
     from .game import Game
 
 
 class Clue:
-    def __init__(self, clue_id: str, clue_text: str, answer: str, depends_on: list[str], is_end_clue: bool = False):
+    __slots__ = ("clue_id", "clue_text", "alternates", "normalizer", "_answer", "matcher",
+                 "depends_on", "completed", "is_end_clue")
+
+    def __init__(self, clue_id: str, clue_text: str, answer: str, depends_on: list[str], is_end_clue: bool = False,
+                 alternates: list[str] | None = None, normalizer: AnswerNormalizer = DEFAULT_NORMALIZER):
         """
         Initializes a Clue object.
 
@@ -15,17 +22,40 @@ class Clue:
             answer: The correct answer to the clue.
             depends_on: A list of clue IDs that this clue depends on.
             is_end_clue: Whether this clue is an end clue.
+            alternates: Other answers that are also accepted.
+            normalizer: Decides which spellings of an answer are equivalent.
         """
-        self.clue_id = clue_id
+        # IDs and answers repeat across puzzles ("#C1#", common words), so
+        # every puzzle loaded in the process shares one copy of each.
+        self.clue_id = sys.intern(clue_id)
         self.clue_text = clue_text
+        self.alternates = [sys.intern(alternate) for alternate in alternates or [] if alternate]
+        self.normalizer = normalizer
         self.answer = answer
-        self.depends_on = depends_on
+        self.depends_on = [sys.intern(dependency_id) for dependency_id in depends_on]
         self.completed = False
         self.is_end_clue = is_end_clue
 
         if self.is_end_clue:
             self.answer = ""
 
+    @property
+    def answer(self) -> str:
+        return self._answer
+
+    @answer.setter
+    def answer(self, value: str):
+        self._answer = sys.intern(value)
+        self.rebuild_matcher()
+
+    def rebuild_matcher(self):
+        """
+        Rebuilds the answer matcher from the answer, alternates and
+        normalizer. Setting `answer` does this; call it after changing
+        `alternates` or `normalizer`.
+        """
+        self.matcher = AnswerMatcher([self._answer, *self.alternates], self.normalizer)
+
     def __repr__(self):
         return f"Clue(id='{self.clue_id}', completed={self.completed}, depends_on={self.depends_on})"
 
@@ -40,27 +70,64 @@ class Clue:
         Returns:
             True if the answer is correct, False otherwise.
         """
-        if self.is_end_clue:
-            return False
-        # Case-insensitive comparison
-        if provided_answer.strip().lower() == self.answer.strip().lower():
+        if self.check_answer(provided_answer):
             self.completed = True
             return True
         return False
 
+    def check_answer(self, provided_answer: str) -> bool:
+        """
+        Checks if the provided answer is correct for this clue without
+        changing its completion status.
+
+        Args:
+            provided_answer: The answer provided by the user.
+
+        Returns:
+            True if the answer is correct, False otherwise (always False
+            for end clues).
+        """
+        if self.is_end_clue:
+            return False
+        return self.matcher.matches(provided_answer)
+
+    def is_near_miss(self, provided_answer: str) -> bool:
+        """
+        Checks if a wrong answer is close to an accepted one (within a small
+        edit distance, e.g. a typo or a plural), so the player can be told
+        they are nearly there.
+        """
+        if self.is_end_clue:
+            return False
+        return self.matcher.is_close(provided_answer)
+
     def get_rendered_text(self, game: 'Game') -> str:
-        if self.completed:
+        return self.render_text(game, lambda clue_id: game.clues[clue_id].completed)
+
+    def render_text(self, game: 'Game', is_completed: Callable[[str], bool]) -> str:
+        """
+        Renders this clue's text for an arbitrary completion state, without
+        reading or changing any Clue's `completed` flag.
+
+        Args:
+            game: The game the clue belongs to.
+            is_completed: Returns whether the clue with the given ID is completed.
+
+        Returns:
+            The rendered text of the clue.
+        """
+        if is_completed(self.clue_id):
             return self.answer
 
         current_text = self.clue_text
         for dependency_id in self.depends_on:
             dependent_clue = game.clues[dependency_id]
             # Recursively get the text from the dependent clue
-            rendered_dependency_text = dependent_clue.get_rendered_text(game)
+            rendered_dependency_text = dependent_clue.render_text(game, is_completed)
 
             # If the dependent clue is NOT completed, its entire rendered output
             # (which might include its own resolved dependencies) should be bracketed.
-            if not dependent_clue.completed:
+            if not is_completed(dependency_id):
                 rendered_dependency_text = f"[{rendered_dependency_text}]"
 
             current_text = current_text.replace(dependency_id, rendered_dependency_text)
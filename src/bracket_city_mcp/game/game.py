@@ -1,6 +1,22 @@
-import json
+import hashlib
+import os
+import sys
+import time
+from array import array
 from collections import defaultdict, deque # Added deque for topological sort
+from itertools import compress
+from typing import Collection
+from .analytics import ClueAnalytics
+from .answers import AnswerIndex, AnswerNormalizer
 from .clue import Clue
+from .loader import load_clues
+from .parser import parse_clue_definitions
+from .search import ClueSearchIndex
+from .state import GameState
+
+# Translate between the binary digits of a completion mask and one 0/1 byte per clue.
+_DIGITS_TO_FLAGS = bytes.maketrans(b"01", b"\0\1")
+_FLAGS_TO_DIGITS = bytes.maketrans(b"\0\1", b"01")
 
 class Game:
     def __init__(self, game_data: dict):
@@ -15,20 +31,32 @@ class Game:
         Raises:
             ValueError: If the game does not have exactly one end clue.
         """
-        self.clues: dict[str, Clue] = {}
-        # adj: dependency_id -> [list of clue_ids that depend on it]
-        self.adj: defaultdict[str, list[str]] = defaultdict(list)
-        # rev_adj: clue_id -> [list of clue_ids it depends on]
-        self.rev_adj: defaultdict[str, list[str]] = defaultdict(list)
-
+        clues: dict[str, Clue] = {}
         if "clues" in game_data:
             for clue_id, clue_info in game_data["clues"].items():
-                self.clues[clue_id] = Clue(
+                clues[clue_id] = Clue(
                     clue_id=clue_id,
                     clue_text=clue_info.get("clue", ""),
                     answer=clue_info.get("answer", ""),
-                    depends_on=clue_info.get("depends_on", [])
+                    depends_on=clue_info.get("depends_on", []),
+                    alternates=clue_info.get("alternates", [])
                 )
+        self._initialize(clues)
+
+    def _initialize(self, clues: dict[str, Clue]):
+        """
+        Sets up the game from already constructed Clue objects: builds the
+        dependency graph, identifies start and end clues and resets play state.
+
+        Raises:
+            ValueError: If the game does not have exactly one end clue.
+        """
+        # Key by interned IDs so the dictionary shares the Clues' strings.
+        self.clues: dict[str, Clue] = {sys.intern(clue_id): clue for clue_id, clue in clues.items()}
+        # adj: dependency_id -> [list of clue_ids that depend on it]
+        self.adj: defaultdict[str, list[str]] = defaultdict(list)
+        # rev_adj: clue_id -> [list of clue_ids it depends on]
+        self.rev_adj: defaultdict[str, list[str]] = defaultdict(list)
 
         self._build_graph()
         self._perform_initial_sort()
@@ -48,12 +76,26 @@ class Game:
 
         self.active_clues: set[str] = set(self.start_clues)
         self.incorrect_guesses: int = 0
+        # Identifies the puzzle, e.g. its file name; set by loaders that know it.
+        self.game_id: str = ""
+        self._fingerprint: bytes | None = None
+
+        self._build_indices()
+        self.state: GameState = GameState(0, frozenset(self.active_clues), 0, 0)
+        self.analytics = ClueAnalytics(len(self.clue_ids))
+        self.search_index = ClueSearchIndex(self.clue_ids, self.clues)
+        self._build_answer_index()
+        self._record_reveals(self.active_clues)
 
     @classmethod
     def from_json_file(cls, filepath: str) -> 'Game':
         """
         Loads a game from a JSON file.
 
+        The "clues" mapping is streamed and each Clue is built and validated
+        as it is read (see `loader.load_clues`), so the parsed JSON document
+        is never held in memory alongside the Clue objects.
+
         Args:
             filepath: The path to the JSON file.
 
@@ -63,10 +105,141 @@ class Game:
         Raises:
             FileNotFoundError: If the filepath does not exist.
             json.JSONDecodeError: If the file is not valid JSON.
+            ValueError: If a clue entry does not match the game file schema,
+                        or the game does not have exactly one end clue.
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            game_data = json.load(f)
-        return cls(game_data)
+        game = cls._from_clues(load_clues(filepath))
+        game.game_id = os.path.splitext(os.path.basename(filepath))[0]
+        return game
+
+    @classmethod
+    def _from_clues(cls, clues: dict[str, Clue]) -> 'Game':
+        """Creates a game directly from Clue objects, bypassing the JSON dictionary form."""
+        game = cls.__new__(cls)
+        game._initialize(clues)
+        return game
+
+    @classmethod
+    def from_bracket_string(cls, game_string: str, answers: dict[str, str] | None = None) -> 'Game':
+        """
+        Creates a game straight from a raw 'bracket city' puzzle string,
+        without converting it to JSON first.
+
+        Clue IDs are assigned by the parser (#C1#, #C2#, ...) exactly as
+        `scripts/parse_game.py` would assign them.
+
+        Args:
+            game_string: The string containing the nested bracket puzzle.
+            answers: An optional mapping of clue ID to answer. Clues without
+                     an entry get an empty answer.
+
+        Returns:
+            A Game instance.
+
+        Raises:
+            BracketParseError: If the brackets in `game_string` are unbalanced.
+            ValueError: If the game does not have exactly one end clue.
+        """
+        answers = answers or {}
+        clues = {
+            clue_id: Clue(
+                clue_id=clue_id,
+                clue_text=clue_text,
+                answer=answers.get(clue_id, ""),
+                depends_on=depends_on
+            )
+            for clue_id, clue_text, depends_on in parse_clue_definitions([game_string])
+        }
+        return cls._from_clues(clues)
+
+    def reset(self):
+        """
+        Resets all play state: no clue is completed, only the start clues
+        are active and the incorrect guess count is zero.
+        """
+        for clue_obj in self.clues.values():
+            clue_obj.completed = False
+        self.active_clues = set(self.start_clues)
+        self.incorrect_guesses = 0
+        self._publish_state(0)
+        self.analytics.reset()
+        self._record_reveals(self.active_clues)
+
+    def _record_reveals(self, clue_ids):
+        now = time.monotonic()
+        for clue_id in clue_ids:
+            self.analytics.record_reveal(self.clue_index[clue_id], now)
+
+    def set_answer_normalizer(self, normalizer: AnswerNormalizer):
+        """
+        Changes which spellings of an answer are accepted, for every clue.
+        Answer matchers are rebuilt immediately rather than on each guess.
+        """
+        for clue_obj in self.clues.values():
+            clue_obj.normalizer = normalizer
+            clue_obj.rebuild_matcher()
+        self._build_answer_index()
+
+    def _build_answer_index(self):
+        self.answer_index = AnswerIndex([
+            None if self.clues[clue_id].is_end_clue else self.clues[clue_id].matcher
+            for clue_id in self.clue_ids
+        ])
+
+    def _publish_state(self, completed_mask: int):
+        """
+        Publishes the current play state as a new immutable snapshot. This
+        is a single reference assignment, so concurrent readers of
+        `self.state` see either the old or the new snapshot, never a mix.
+        """
+        self.state = GameState(
+            completed_mask,
+            frozenset(self.active_clues),
+            self.incorrect_guesses,
+            self.state.version + 1,
+        )
+
+    def render_state(self, state: GameState, clue_id: str | None = None) -> str:
+        """
+        Renders a clue (by default the end clue, i.e. the whole game) as of
+        the snapshot `state`. Only immutable clue data is read, so this is
+        safe to call while another thread is answering clues.
+        """
+        if clue_id is None:
+            clue_id = self.end_clues[0]
+        return self.render_clue_text_for_mask(clue_id, state.completed_mask)
+
+    def checkpoint(self) -> GameState:
+        """
+        Returns a checkpoint of the current play state, to be passed to
+        `rollback` later. Snapshots are immutable and already published,
+        so this is O(1) and checkpoints share all unchanged data.
+        """
+        return self.state
+
+    def rollback(self, checkpoint: GameState):
+        """
+        Restores the play state saved by `checkpoint`. Only clues whose
+        completion differs between the current state and the checkpoint are
+        touched. A new snapshot is published, so the version keeps increasing.
+
+        The incorrect guess count is not restored: it counts every wrong
+        guess made in this game, including those on abandoned branches, so
+        rolling back cannot improve the score (clues minus incorrect guesses).
+
+        Raises:
+            ValueError: If the checkpoint does not belong to this puzzle.
+        """
+        if checkpoint.completed_mask & ~self.all_clues_mask or not checkpoint.active_clues <= self.clues.keys():
+            raise ValueError("Checkpoint does not belong to this game.")
+        changed = self.completion_flags(self.state.completed_mask ^ checkpoint.completed_mask)
+        completed = self.completion_flags(checkpoint.completed_mask)
+        i = changed.find(1)
+        while i != -1:
+            self.clues[self.clue_ids[i]].completed = bool(completed[i])
+            i = changed.find(1, i + 1)
+        self.active_clues = set(checkpoint.active_clues)
+        self._publish_state(checkpoint.completed_mask)
 
     @property
     def is_complete(self) -> bool:
@@ -121,6 +294,145 @@ class Game:
                 self.rev_adj[clue_id] = []
 
 
+    def _build_indices(self):
+        """
+        Assigns each clue a stable integer index (its position in self.clues)
+        and lists, per clue, the indices of its dependencies and dependents.
+        These allow a completion state to be represented as a single integer.
+
+        The lists are stored flat: the dependencies of clue i are
+        dependency_indices[dependency_offsets[i]:dependency_offsets[i + 1]],
+        and likewise for dependents. Memory is linear in the number of
+        dependency edges.
+        """
+        self.clue_ids: list[str] = list(self.clues)
+        self.clue_index: dict[str, int] = {clue_id: i for i, clue_id in enumerate(self.clue_ids)}
+        self.dependency_offsets, self.dependency_indices = self._flatten(self.rev_adj)
+        self.dependent_offsets, self.dependent_indices = self._flatten(self.adj)
+        self.start_indices: list[int] = sorted(self.clue_index[clue_id] for clue_id in self.start_clues)
+        self.end_clue_mask: int = 0
+        for clue_id in self.end_clues:
+            self.end_clue_mask |= 1 << self.clue_index[clue_id]
+        self.all_clues_mask: int = (1 << len(self.clue_ids)) - 1
+
+    def _flatten(self, adjacency: dict[str, list[str]]) -> tuple[array, array]:
+        """Returns (offsets, indices) listing adjacency[clue_id] as indices, for each clue in index order."""
+        offsets = array('I', [0])
+        indices = array('I')
+        for clue_id in self.clue_ids:
+            indices.extend(self.clue_index[other_id] for other_id in adjacency[clue_id])
+            offsets.append(len(indices))
+        return offsets, indices
+
+    @property
+    def fingerprint(self) -> bytes:
+        """
+        A SHA-256 digest of the puzzle definition (clue IDs, texts, answers
+        and dependencies). Two games share a fingerprint only if they are the
+        same version of the same puzzle.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for clue_id in self.clue_ids:
+                clue_obj = self.clues[clue_id]
+                for field in (clue_id, clue_obj.clue_text, clue_obj.answer, *clue_obj.depends_on):
+                    digest.update(field.encode("utf-8"))
+                    digest.update(b"\0")
+                digest.update(b"\1")
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    def completion_flags(self, completed_mask: int) -> bytes:
+        """
+        Returns one byte per clue index, 1 if its bit is set in
+        `completed_mask` and 0 otherwise. Testing a bit of a large integer
+        costs time proportional to its size, so code that tests many bits
+        converts the mask once and indexes the result instead.
+        """
+        flags = format(completed_mask, "b").encode()[::-1].translate(_DIGITS_TO_FLAGS)
+        return flags.ljust(len(self.clue_ids), b"\0")
+
+    def mask_from_flags(self, flags: bytes | bytearray) -> int:
+        """Returns the completion mask with the bits set whose bytes are 1 in `flags`; the inverse of `completion_flags`."""
+        return int(bytes(flags).translate(_FLAGS_TO_DIGITS)[::-1] or b"0", 2)
+
+    def completed_mask(self) -> int:
+        """Returns the current completion state as a bitmask over clue indices."""
+        return self.mask_from_flags(bytes(self.clues[clue_id].completed for clue_id in self.clue_ids))
+
+    def completed_ids(self, completed_mask: int) -> set[str]:
+        """Returns the IDs of the clues whose bits are set in `completed_mask`."""
+        return set(compress(self.clue_ids, self.completion_flags(completed_mask)))
+
+    def is_available(self, clue_id: str, completed_mask: int) -> bool:
+        """
+        Checks whether a clue would be active in the completion state
+        `completed_mask`: not completed, with every dependency completed.
+        """
+        index = self.clue_index[clue_id]
+        if completed_mask >> index & 1:
+            return False
+        offsets = self.dependency_offsets
+        return all(completed_mask >> dependency & 1
+                   for dependency in self.dependency_indices[offsets[index]:offsets[index + 1]])
+
+    def active_clues_for_mask(self, completed_mask: int) -> list[str]:
+        """
+        Returns the clues that would be active for a completion state: those
+        not completed whose dependencies are all completed, in clue order.
+
+        Only the start clues and the dependents of completed clues can be
+        active, so just those are checked, against the mask converted once
+        by `completion_flags`.
+        """
+        completed = self.completion_flags(completed_mask)
+        dependency_offsets, dependency_indices = self.dependency_offsets, self.dependency_indices
+        dependent_offsets, dependent_indices = self.dependent_offsets, self.dependent_indices
+        candidates = set(self.start_indices)
+        i = completed.find(1)
+        while i != -1:
+            candidates.update(dependent_indices[dependent_offsets[i]:dependent_offsets[i + 1]])
+            i = completed.find(1, i + 1)
+        clue_ids = self.clue_ids
+        return [
+            clue_ids[i] for i in sorted(candidates)
+            if not completed[i]
+            and all(completed[dependency]
+                    for dependency in dependency_indices[dependency_offsets[i]:dependency_offsets[i + 1]])
+        ]
+
+    def search_clues(self, query: str, visible: Collection[str] | None = None) -> list[str]:
+        """
+        Returns the IDs of the visible clues whose text contains every word
+        of `query`, in clue order.
+
+        Args:
+            query: The words to search for (case-insensitive).
+            visible: The clue IDs that may be returned, as a set. Defaults
+                     to the active clues of the current state snapshot.
+        """
+        if visible is None:
+            visible = self.state.active_clues
+        return self.search_index.search(query, visible, self.clue_index)
+
+    def is_complete_mask(self, completed_mask: int) -> bool:
+        """Checks if every non-end clue is completed in `completed_mask`."""
+        return completed_mask | self.end_clue_mask == self.all_clues_mask
+
+    def render_clue_text_for_mask(self, clue_id: str, completed_mask: int) -> str:
+        """
+        Renders a clue as it would appear in the completion state
+        `completed_mask`, without reading or changing the live game state.
+
+        Raises:
+            ValueError: If the clue_id does not exist.
+        """
+        if clue_id not in self.clues:
+            raise ValueError(f"Clue ID '{clue_id}' not found in game.")
+        index = self.clue_index
+        completed = self.completion_flags(completed_mask)
+        return self.clues[clue_id].render_text(self, lambda c: bool(completed[index[c]]))
+
     def _perform_initial_sort(self):
         """
         Identifies start clues (no dependencies) and end clues (nothing depends on them).
@@ -164,17 +476,46 @@ class Game:
         clue_to_answer = self.clues[clue_id]
 
         is_correct = clue_to_answer.answer_clue(provided_answer)
+        if not clue_to_answer.is_end_clue:
+            self.analytics.record_attempt(self.clue_index[clue_id], is_correct, time.monotonic())
 
         if is_correct:
             self.active_clues.discard(clue_id)
             self._reveal_new_clues(clue_id)
+            self._publish_state(self.state.completed_mask | 1 << self.clue_index[clue_id])
         else:
             # Only increment incorrect guesses for actual clues, not end clues
             if not clue_to_answer.is_end_clue:
                 self.incorrect_guesses += 1
+                self._publish_state(self.state.completed_mask)
 
         return is_correct
 
+    def clues_for_answer(self, provided_answer: str) -> list[str]:
+        """
+        Returns every clue (active or not, excluding end clues) that accepts
+        `provided_answer`, in clue order, with a single hash lookup.
+        """
+        return [self.clue_ids[position] for position in self.answer_index.lookup(provided_answer)]
+
+    def answer_any(self, provided_answer: str) -> str | None:
+        """
+        Answers whichever active clue accepts `provided_answer`. If several
+        active clues share the answer, the first in clue order is solved; the
+        others stay active for later submissions of the same answer.
+
+        Returns:
+            The ID of the solved clue, or None if no active clue accepts the
+            answer, in which case one incorrect guess is counted.
+        """
+        for clue_id in self.clues_for_answer(provided_answer):
+            if clue_id in self.active_clues:
+                self.answer_clue(clue_id, provided_answer)
+                return clue_id
+        self.incorrect_guesses += 1
+        self._publish_state(self.state.completed_mask)
+        return None
+
     def _reveal_new_clues(self, completed_clue_id: str):
         """
         Reveals new clues based on a completed clue.
@@ -204,6 +545,7 @@ class Game:
 
             if all_dependencies_met:
                 self.active_clues.add(potential_new_clue_id)
+                self._record_reveals([potential_new_clue_id])
 
     def __repr__(self):
         return f"Game(clues={len(self.clues)}, active_clues={len(self.active_clues)}, start_clues={len(self.start_clues)}, end_clues={len(self.end_clues)})"
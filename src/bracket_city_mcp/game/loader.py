@@ -0,0 +1,295 @@
+import json
+import re
+from typing import Iterator, TextIO
+
+from .clue import Clue
+
+try:
+    import ijson
+except ImportError:  # Optional; the stdlib streaming reader is used instead.
+    ijson = None
+
+# Number of characters (or bytes, for ijson) read from a file per chunk.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_WHITESPACE_CHARS = ' \t\n\r'
+
+
+class _JSONStream:
+    """
+    A minimal incremental reader over a JSON text file.
+
+    Only as much of the file as is needed to decode the next value is kept
+    in memory; consumed text is dropped whenever more input is read.
+    Individual values are decoded with the stdlib `json` decoder. Errors
+    report their position in the whole file, not in the current buffer.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        # Position of the start of `_buf` in the file: character offset,
+        # line number, and characters before it on that line.
+        self._offset = 0
+        self._line = 1
+        self._column = 0
+
+    def _error(self, msg: str, pos: int) -> json.JSONDecodeError:
+        """Returns a JSONDecodeError for position `pos` of `_buf`, located in the whole file."""
+        newlines = self._buf.count('\n', 0, pos)
+        if newlines:
+            column = pos - self._buf.rfind('\n', 0, pos)
+        else:
+            column = self._column + pos + 1
+        error = json.JSONDecodeError(msg, "", 0)
+        error.pos = self._offset + pos
+        error.lineno = self._line + newlines
+        error.colno = column
+        error.args = (f"{msg}: line {error.lineno} column {error.colno} (char {error.pos})",)
+        return error
+
+    def _fill(self, size: int) -> bool:
+        """Reads up to `size` more characters. Returns False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._f.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        dropped = self._pos
+        newlines = self._buf.count('\n', 0, dropped)
+        if newlines:
+            self._line += newlines
+            self._column = dropped - self._buf.rfind('\n', 0, dropped) - 1
+        else:
+            self._column += dropped
+        self._offset += dropped
+        self._buf = self._buf[dropped:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, or '' at end of file."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def expect(self, char: str, description: str):
+        if self.peek() != char:
+            raise self._error(f"Expecting {description}", self._pos)
+        self._pos += 1
+
+    def value(self):
+        """Decodes and returns the next complete JSON value."""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill(size):
+                    size *= 2
+                    continue
+                raise self._error(e.msg, e.pos) from None
+            # A number at the very end of the buffer may continue in the next chunk.
+            if end == len(self._buf) and self._fill(size):
+                size *= 2
+                continue
+            self._pos = end
+            return value
+
+    def at_end(self) -> bool:
+        return self.peek() == ""
+
+    def _key(self) -> str:
+        if self.peek() != '"':
+            raise self._error("Expecting property name enclosed in double quotes", self._pos)
+        key = self.value()
+        self.expect(':', "':' delimiter")
+        return key
+
+    def _end_of_member(self) -> bool:
+        """Consumes the ',' or '}' after an object member. Returns True at '}'."""
+        if self.peek() == '}':
+            self._pos += 1
+            return True
+        self.expect(',', "',' delimiter")
+        return False
+
+    def keys(self) -> Iterator[str]:
+        """
+        Yields the keys of the JSON object at the current position. The
+        caller must consume each key's value (for example with `value()`)
+        before asking for the next key.
+        """
+        self.expect('{', "'{'")
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            yield self._key()
+            if self._end_of_member():
+                return
+
+    def items(self) -> Iterator[tuple[str, object]]:
+        """
+        Yields the (key, value) pairs of the JSON object at the current
+        position, decoding each value completely.
+        """
+        scan = self._decoder.scan_once
+        match_ws = _WHITESPACE.match
+        self.expect('{', "'{'")
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            # Fast path: decode the whole member straight from the buffer.
+            # Anything unusual (including reaching the end of the buffer)
+            # falls back to the general path, which reads more input and
+            # reports errors at the right position.
+            # Whitespace is only matched when present, as in `json.decoder`.
+            buf = self._buf
+            try:
+                pos = self._pos
+                if buf[pos] in _WHITESPACE_CHARS:
+                    pos = match_ws(buf, pos).end()
+                if buf[pos] == '"':
+                    key, pos = scan(buf, pos)
+                    if buf[pos] in _WHITESPACE_CHARS:
+                        pos = match_ws(buf, pos).end()
+                    if buf[pos] == ':':
+                        pos += 1
+                        if buf[pos] in _WHITESPACE_CHARS:
+                            pos = match_ws(buf, pos).end()
+                        value, pos = scan(buf, pos)
+                        if buf[pos] in _WHITESPACE_CHARS:
+                            pos = match_ws(buf, pos).end()
+                        separator = buf[pos]
+                        if separator == ',' or separator == '}':
+                            self._pos = pos + 1
+                            yield key, value
+                            if separator == '}':
+                                return
+                            continue
+            except (IndexError, StopIteration, json.JSONDecodeError):
+                pass
+            key = self._key()
+            yield key, self.value()
+            if self._end_of_member():
+                return
+
+
+def _iter_stdlib(f: TextIO, chunk_size: int) -> Iterator[tuple[str, object]]:
+    """Yields the entries of the top-level "clues" object using `_JSONStream`."""
+    stream = _JSONStream(f, chunk_size)
+    if stream.peek() != '{':
+        raise ValueError("Game file must contain a JSON object.")
+    for key in stream.keys():
+        if key == "clues":
+            if stream.peek() != '{':
+                raise ValueError("'clues' must be a JSON object.")
+            yield from stream.items()
+        else:
+            stream.value()
+    if not stream.at_end():
+        raise stream._error("Extra data", stream._pos)
+
+
+def _locate_error(filepath: str, chunk_size: int) -> json.JSONDecodeError | None:
+    """
+    Re-reads a file that ijson rejected with the stdlib reader, which
+    reports where the error is. Returns None if it finds no JSON error.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        try:
+            for _ in _iter_stdlib(f, chunk_size):
+                pass
+        except json.JSONDecodeError as e:
+            return e
+        except ValueError:
+            pass
+    return None
+
+
+def _iter_ijson(filepath: str, chunk_size: int) -> Iterator[tuple[str, object]]:
+    """Yields the entries of the top-level "clues" object using ijson."""
+    with open(filepath, 'rb') as f:
+        try:
+            yield from ijson.kvitems(f, 'clues', buf_size=chunk_size)
+        except ijson.JSONError as e:
+            # ijson's messages carry no position; find it with the stdlib reader.
+            error = _locate_error(filepath, chunk_size)
+            if error is None:
+                error = json.JSONDecodeError(str(e), "", 0)
+            raise error from e
+
+
+def _build_clue(clue_id: str, clue_info) -> Clue:
+    """
+    Validates a single clue entry and constructs its Clue object.
+    Missing fields default exactly as in `Game.__init__`.
+
+    Raises:
+        ValueError: If the entry does not match the game file schema.
+    """
+    if not isinstance(clue_info, dict):
+        raise ValueError(f"Clue '{clue_id}' must be a JSON object.")
+    clue_text = clue_info.get("clue", "")
+    answer = clue_info.get("answer", "")
+    depends_on = clue_info.get("depends_on", [])
+    alternates = clue_info.get("alternates", [])
+    if not isinstance(clue_text, str):
+        raise ValueError(f"Clue '{clue_id}': 'clue' must be a string.")
+    if not isinstance(answer, str):
+        raise ValueError(f"Clue '{clue_id}': 'answer' must be a string.")
+    if not isinstance(depends_on, list):
+        raise ValueError(f"Clue '{clue_id}': 'depends_on' must be a list of strings.")
+    for dependency_id in depends_on:
+        if not isinstance(dependency_id, str):
+            raise ValueError(f"Clue '{clue_id}': 'depends_on' must be a list of strings.")
+    if not isinstance(alternates, list) or not all(isinstance(a, str) for a in alternates):
+        raise ValueError(f"Clue '{clue_id}': 'alternates' must be a list of strings.")
+    return Clue(clue_id=clue_id, clue_text=clue_text, answer=answer, depends_on=depends_on,
+                alternates=alternates)
+
+
+def load_clues(filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict[str, Clue]:
+    """
+    Streams the "clues" mapping of a game JSON file, validating each entry
+    and constructing its Clue object as soon as it has been read.
+
+    The whole document is never held in memory at once, so peak memory is
+    roughly the size of the resulting Clue objects rather than the file
+    text plus a parsed copy of it. ijson is used when installed; otherwise
+    a streaming reader built on the stdlib `json` decoder is used.
+
+    Args:
+        filepath: The path to the JSON file.
+        chunk_size: The amount of the file to read at a time.
+
+    Returns:
+        A dictionary mapping clue IDs to Clue objects, in file order.
+
+    Raises:
+        FileNotFoundError: If the filepath does not exist.
+        json.JSONDecodeError: If the file is not valid JSON.
+        ValueError: If the file does not match the game file schema.
+    """
+    clues: dict[str, Clue] = {}
+    if ijson is not None:
+        for clue_id, clue_info in _iter_ijson(filepath, chunk_size):
+            clues[clue_id] = _build_clue(clue_id, clue_info)
+        return clues
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for clue_id, clue_info in _iter_stdlib(f, chunk_size):
+            clues[clue_id] = _build_clue(clue_id, clue_info)
+    return clues
@@ -0,0 +1,158 @@
+from typing import Iterable, Iterator, TextIO
+
+# Number of characters read from a file per chunk.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class BracketParseError(ValueError):
+    """
+    Raised when a puzzle string contains unbalanced brackets.
+
+    Attributes:
+        offset: The zero-based character offset of the offending bracket.
+        line: The one-based line number of the offending bracket.
+        column: The one-based column number of the offending bracket.
+    """
+
+    def __init__(self, message: str, offset: int, line: int, column: int):
+        super().__init__(f"{message} at line {line}, column {column} (offset {offset})")
+        self.offset = offset
+        self.line = line
+        self.column = column
+
+
+def read_chunks(f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yields the contents of an open text file in chunks of `chunk_size` characters."""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_clue_definitions(chunks: Iterable[str]) -> list[tuple[str, str, list[str]]]:
+    """
+    Tokenizes a 'bracket city' game string, supplied as an iterable of text
+    chunks, into clue definitions.
+
+    The input is scanned once. Each '[' pushes a new frame onto a stack and
+    each ']' pops it, so nested clues are collected in a single linear pass.
+    The text of a closed clue is stored as a list of literal pieces and
+    references to its child clues, which are resolved to IDs at the end.
+
+    IDs are assigned in the same order as the original innermost-first
+    algorithm: the clue whose '[' appears last in the input is #C1#, the
+    one before it #C2#, and so on.
+
+    Args:
+        chunks: The puzzle string, possibly split across several chunks.
+
+    Returns:
+        A list of (clue_id, clue_text, depends_on) tuples in ascending
+        numeric ID order. Nested clues appear in clue_text as their IDs.
+
+    Raises:
+        BracketParseError: If a ']' has no matching '[' or a '[' is never closed.
+    """
+    # Each frame is [open_index, offset, line, column, parts]; parts holds
+    # literal strings and the open_index (an int) of each child clue.
+    stack: list[list] = []
+    closed_parts: dict[int, list] = {}
+    open_count = 0
+
+    offset = 0  # Offset of the start of the current chunk
+    line = 1
+    line_start = 0  # Offset of the first character of the current line
+
+    for chunk in chunks:
+        pos = 0
+        # Next known bracket positions; each is only searched for again once
+        # the scan has moved past it, so every character is visited once.
+        open_pos = chunk.find('[')
+        close_pos = chunk.find(']')
+        while True:
+            if open_pos != -1 and open_pos < pos:
+                open_pos = chunk.find('[', pos)
+            if close_pos != -1 and close_pos < pos:
+                close_pos = chunk.find(']', pos)
+            if open_pos == -1 and close_pos == -1:
+                break
+            if open_pos == -1 or (close_pos != -1 and close_pos < open_pos):
+                bracket_pos = close_pos
+            else:
+                bracket_pos = open_pos
+
+            newlines = chunk.count('\n', pos, bracket_pos)
+            if newlines:
+                line += newlines
+                line_start = offset + chunk.rfind('\n', pos, bracket_pos) + 1
+
+            if stack and bracket_pos > pos:
+                stack[-1][4].append(chunk[pos:bracket_pos])
+
+            absolute = offset + bracket_pos
+            column = absolute - line_start + 1
+            if chunk[bracket_pos] == '[':
+                stack.append([open_count, absolute, line, column, []])
+                open_count += 1
+            else:
+                if not stack:
+                    raise BracketParseError("Unmatched ']'", absolute, line, column)
+                frame = stack.pop()
+                closed_parts[frame[0]] = frame[4]
+                if stack:
+                    stack[-1][4].append(frame[0])
+            pos = bracket_pos + 1
+
+        if stack and pos < len(chunk):
+            stack[-1][4].append(chunk[pos:])
+        newlines = chunk.count('\n', pos)
+        if newlines:
+            line += newlines
+            line_start = offset + chunk.rfind('\n', pos) + 1
+        offset += len(chunk)
+
+    if stack:
+        _, absolute, err_line, err_column, _ = stack[-1]
+        raise BracketParseError("Unclosed '['", absolute, err_line, err_column)
+
+    def clue_id_for(open_index: int) -> str:
+        return f"#C{open_count - open_index}#"
+
+    definitions = []
+    for open_index in range(open_count - 1, -1, -1):
+        parts = closed_parts[open_index]
+        text_parts = []
+        dependencies = []
+        for part in parts:
+            if isinstance(part, int):
+                child_id = clue_id_for(part)
+                text_parts.append(child_id)
+                dependencies.append(child_id)
+            else:
+                text_parts.append(part)
+        definitions.append(
+            (clue_id_for(open_index), "".join(text_parts).strip(), sorted(dependencies))
+        )
+    return definitions
+
+
+def parse_clues(chunks: Iterable[str]) -> dict[str, dict]:
+    """
+    Parses a 'bracket city' game string into the "clues" mapping of the
+    JSON game format.
+
+    Args:
+        chunks: The puzzle string, possibly split across several chunks.
+
+    Returns:
+        A dictionary mapping clue IDs (in ascending numeric order) to
+        {"clue", "answer", "depends_on"} dictionaries with empty answers.
+
+    Raises:
+        BracketParseError: If the brackets in the input are unbalanced.
+    """
+    return {
+        clue_id: {"clue": clue_text, "answer": "", "depends_on": depends_on}
+        for clue_id, clue_text, depends_on in parse_clue_definitions(chunks)
+    }
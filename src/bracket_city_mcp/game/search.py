@@ -0,0 +1,90 @@
+import re
+import sys
+from array import array
+from typing import Collection
+
+from .clue import Clue
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into casefolded word tokens."""
+    return _TOKEN.findall(text.casefold())
+
+
+def visible_text(clue: Clue) -> str:
+    """
+    Returns a clue's text without the IDs of the clues it depends on.
+    Players never see those IDs, only the dependencies' rendered text, so
+    matching on them would reveal the puzzle's hidden structure.
+    """
+    text = clue.clue_text
+    for dependency_id in clue.depends_on:
+        text = text.replace(dependency_id, " ")
+    return text
+
+
+class ClueSearchIndex:
+    def __init__(self, clue_ids: list[str], clues: dict[str, Clue]):
+        """
+        Initializes a ClueSearchIndex: an inverted index from the word tokens
+        of each clue's text to the clues containing them. Dependency IDs
+        embedded in the text are not indexed (see `visible_text`).
+
+        The index depends only on the puzzle definition. It is immutable and
+        shared, not copied, when a game is deepcopied for a new session.
+        Tokens are interned, so puzzles sharing a word share its string.
+
+        Args:
+            clue_ids: The clue IDs in `Game.clue_ids` order.
+            clues: The game's clues.
+        """
+        self._clue_ids = clue_ids
+        # Each clue's distinct tokens; a tuple is a fraction of a frozenset's size.
+        self._clue_tokens: list[tuple[str, ...]] = []
+        postings: dict[str, array] = {}
+        for index, clue_id in enumerate(clue_ids):
+            tokens = tuple(dict.fromkeys(map(sys.intern, tokenize(visible_text(clues[clue_id])))))
+            self._clue_tokens.append(tokens)
+            for token in tokens:
+                postings.setdefault(token, array('I')).append(index)
+        self._postings = postings
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def search(self, query: str, visible: Collection[str], clue_index: dict[str, int]) -> list[str]:
+        """
+        Returns the IDs of the clues in `visible` whose text contains every
+        word of `query`, in clue order.
+
+        The cost is bounded by the smaller of the visible set and the
+        rarest query word's posting list, not by the size of the puzzle.
+
+        Args:
+            query: The words to search for.
+            visible: The IDs of the clues that may be returned.
+            clue_index: Maps clue IDs to their positions (`Game.clue_index`).
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        rarest = min(terms, key=lambda term: len(self._postings.get(term, ())))
+        posting = self._postings.get(rarest)
+        if posting is None:
+            return []
+        clue_tokens = self._clue_tokens
+        if len(visible) <= len(posting):
+            matches = [
+                index for index in map(clue_index.__getitem__, visible)
+                if terms.issubset(clue_tokens[index])
+            ]
+            matches.sort()
+        else:
+            clue_ids = self._clue_ids
+            matches = [
+                index for index in posting
+                if clue_ids[index] in visible and terms.issubset(clue_tokens[index])
+            ]
+        return [self._clue_ids[index] for index in matches]
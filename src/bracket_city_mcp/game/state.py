@@ -0,0 +1,16 @@
+from typing import NamedTuple
+
+
+class GameState(NamedTuple):
+    """
+    An immutable snapshot of a game's play state.
+
+    Game publishes a new GameState after every change by swapping a single
+    reference, so a reader that grabs `game.state` once sees a consistent
+    state for as long as it holds it, without taking any lock.
+    """
+    completed_mask: int
+    active_clues: frozenset[str]
+    incorrect_guesses: int
+    # Incremented on every publish; identifies the snapshot within one game.
+    version: int
@@ -0,0 +1,222 @@
+import bisect
+import math
+import threading
+import weakref
+from array import array
+from typing import Iterator
+
+from bracket_city_mcp.game.game import Game
+
+# Entries are packed into one int64 that sorts best-first: the score
+# (negated, offset to stay non-negative) in the high bits and the solve time
+# in milliseconds in the low 32 bits, so ties on score go to the faster solve.
+_SCORE_OFFSET = 1 << 30
+_MILLIS_BITS = 32
+_MAX_MILLIS = (1 << _MILLIS_BITS) - 1
+
+# Target size of each sorted block; blocks split at twice this.
+_BLOCK_SIZE = 1024
+
+
+def _pack(score: int, seconds: float) -> int:
+    millis = min(max(int(seconds * 1000), 0), _MAX_MILLIS)
+    return (_SCORE_OFFSET - score) << _MILLIS_BITS | millis
+
+
+def _unpack(key: int) -> tuple[int, float]:
+    return _SCORE_OFFSET - (key >> _MILLIS_BITS), (key & _MAX_MILLIS) / 1000
+
+
+class OrderStatisticList:
+    def __init__(self):
+        """
+        Initializes an OrderStatisticList: a sorted multiset of integers
+        supporting insertion, rank and select in O(log n).
+
+        Values are kept in sorted blocks of about `_BLOCK_SIZE` int64s, so
+        memory is 8 bytes per value and an insertion moves at most one
+        block's worth of memory. A Fenwick tree over the block sizes turns
+        a position within a block into a global rank and back.
+        """
+        self._blocks: list[array] = []
+        self._maxes: list[int] = []
+        self._tree: list[int] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _rebuild_tree(self):
+        tree = [0] * (len(self._blocks) + 1)
+        for i, block in enumerate(self._blocks, 1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _prefix(self, block_index: int) -> int:
+        """Returns the number of values in blocks before `block_index`."""
+        total = 0
+        i = block_index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def add(self, value: int):
+        self._size += 1
+        if not self._blocks:
+            self._blocks.append(array('q', [value]))
+            self._maxes.append(value)
+            self._rebuild_tree()
+            return
+        index = min(bisect.bisect_left(self._maxes, value), len(self._blocks) - 1)
+        block = self._blocks[index]
+        bisect.insort(block, value)
+        self._maxes[index] = block[-1]
+        if len(block) > 2 * _BLOCK_SIZE:
+            # Splitting changes the block layout; the tree is rebuilt, which
+            # happens once per _BLOCK_SIZE insertions at most.
+            self._blocks[index:index + 1] = [block[:_BLOCK_SIZE], block[_BLOCK_SIZE:]]
+            self._maxes[index:index + 1] = [block[_BLOCK_SIZE - 1], block[-1]]
+            self._rebuild_tree()
+            return
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += 1
+            i += i & -i
+
+    def count_less(self, value: int) -> int:
+        """Returns the number of values smaller than `value`."""
+        index = bisect.bisect_left(self._maxes, value)
+        if index == len(self._blocks):
+            return self._size
+        return self._prefix(index) + bisect.bisect_left(self._blocks[index], value)
+
+    def __getitem__(self, rank: int) -> int:
+        """Returns the value at 0-based position `rank` in sorted order."""
+        if not 0 <= rank < self._size:
+            raise IndexError("rank out of range")
+        # Descend the Fenwick tree to the block holding position `rank`.
+        index = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            following = index + step
+            if following < len(self._tree) and self._tree[following] <= rank:
+                index = following
+                rank -= self._tree[following]
+            step >>= 1
+        return self._blocks[index][rank]
+
+    def __iter__(self) -> Iterator[int]:
+        for block in self._blocks:
+            yield from block
+
+
+class Leaderboard:
+    def __init__(self):
+        """
+        Initializes a Leaderboard for one puzzle: the scores and solve times
+        of completed games, ranked by highest score, then fastest solve.
+
+        Each game is recorded at most once, on its first completion. Games
+        are remembered weakly, so sessions that expire leave only their
+        8-byte entry behind.
+        """
+        self._entries = OrderStatisticList()
+        self._recorded: weakref.WeakKeyDictionary[Game, int] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, game: Game, score: int, seconds: float) -> int:
+        """
+        Records a completed game, unless it was recorded before.
+
+        Returns:
+            The game's 1-based rank.
+        """
+        with self._lock:
+            key = self._recorded.get(game)
+            if key is None:
+                key = self._recorded[game] = _pack(score, seconds)
+                self._entries.add(key)
+            return self._entries.count_less(key) + 1
+
+    def entry_of(self, game: Game) -> int | None:
+        """Returns the packed entry recorded for `game`, or None if it has not been recorded."""
+        with self._lock:
+            return self._recorded.get(game)
+
+    def transfer(self, game: Game, entry: int):
+        """
+        Attributes an entry returned by `entry_of` to `game`, e.g. when a
+        spilled session is reloaded as a new Game object. Nothing is added
+        to the ranking.
+        """
+        with self._lock:
+            self._recorded[game] = entry
+
+    def _describe(self, key: int, rank: int) -> dict:
+        score, seconds = _unpack(key)
+        return {"rank": rank, "score": score, "seconds": seconds}
+
+    def rank_of(self, game: Game) -> dict | None:
+        """
+        Returns the rank, score and solve time of a recorded game, with
+        "percentile": the percentage of completions it beat. Returns None if
+        the game has not been recorded.
+        """
+        with self._lock:
+            key = self._recorded.get(game)
+            if key is None:
+                return None
+            better = self._entries.count_less(key)
+            worse = len(self._entries) - self._entries.count_less(key + 1)
+            entry = self._describe(key, better + 1)
+            entry["percentile"] = round(100 * worse / len(self._entries), 2)
+            return entry
+
+    def top(self, limit: int) -> list[dict]:
+        """Returns the best `limit` entries. Tied entries share a rank."""
+        entries = []
+        with self._lock:
+            previous = None
+            for position, key in enumerate(self._entries):
+                if position == limit:
+                    break
+                rank = entries[-1]["rank"] if key == previous else position + 1
+                entries.append(self._describe(key, rank))
+                previous = key
+        return entries
+
+    def at_percentile(self, percentile: float) -> dict | None:
+        """
+        Returns the entry at `percentile` (0-100): the score and time needed
+        to rank ahead of that percentage of completions, at the nearest rank.
+        Returns None if nothing has been recorded.
+        """
+        with self._lock:
+            count = len(self._entries)
+            if not count:
+                return None
+            position = min(max(math.ceil((100 - percentile) / 100 * count) - 1, 0), count - 1)
+            key = self._entries[position]
+            return self._describe(key, self._entries.count_less(key) + 1)
+
+
+class LeaderboardStore:
+    def __init__(self):
+        """Initializes a LeaderboardStore, which keeps one Leaderboard per puzzle."""
+        self._boards: dict[bytes, Leaderboard] = {}
+        self._lock = threading.Lock()
+
+    def for_game(self, game: Game) -> Leaderboard:
+        """Returns the leaderboard of the puzzle `game` is playing."""
+        with self._lock:
+            board = self._boards.get(game.fingerprint)
+            if board is None:
+                board = self._boards[game.fingerprint] = Leaderboard()
+            return board
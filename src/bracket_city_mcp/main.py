@@ -1,37 +1,782 @@
+import copy
+import os
+import secrets
+import atexit
+import threading
+import time
+import zoneinfo
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from bracket_city_mcp.admission import AdmissionController
+from bracket_city_mcp.answer_log import AnswerLog
+from bracket_city_mcp.game.analytics import aggregate_clue_stats
 from bracket_city_mcp.game.game import Game
-from typing import List, Dict, Any
+from bracket_city_mcp.leaderboard import LeaderboardStore
+from bracket_city_mcp.prerender import Prerenderer
+from bracket_city_mcp.render_cache import RenderCache
+from bracket_city_mcp.rotation import PuzzleRotation
+from bracket_city_mcp.sessions import CheckpointStore, Session, SessionStore
+from bracket_city_mcp.state_token import FINGERPRINT_BYTES, InvalidStateToken, StateTokenCodec, TokenState
+from typing import List, Dict, Any, Callable
 
-# Initialize the game
-# TODO: Make the game file path configurable
-game = Game.from_json_file("games/json/20250110.json")
+# The puzzle served when no other is configured, from the source checkout,
+# so the server does not depend on the directory it is started from.
+DEFAULT_PUZZLE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "games", "json", "20250110.json"
+)
+PUZZLE_FILE_ENV = "BRACKET_CITY_PUZZLE"
+# How long a request waits for the puzzle to finish loading at startup.
+PUZZLE_WAIT_SECONDS = 30.0
+
+# The puzzle being served. It is loaded on first use, or in the background
+# by configure, so importing this module never touches the disk. With
+# `--rotate-daily`, `rotation` replaces it with each day's puzzle.
+game: Game | None = None
+puzzle_file = os.environ.get(PUZZLE_FILE_ENV) or DEFAULT_PUZZLE_FILE
+rotation: PuzzleRotation | None = None
+_load_lock = threading.Lock()
+_loader: threading.Thread | None = None
+_loading_done = threading.Event()
+_load_error: str | None = None
 
 # Create the MCP server
 mcp = FastMCP("BracketCity")
 
-# Health check endpoint
+
+def _puzzle() -> Game:
+    """
+    Returns the puzzle being served. Handlers read it once and use that
+    reference throughout, because the daily rotation may replace it at any
+    moment.
+
+    Until the puzzle is loaded, this waits for the background loader
+    started by configure, or loads the puzzle itself if there is none.
+
+    Raises:
+        RuntimeError: If the puzzle could not be loaded in time.
+    """
+    current = game
+    if current is None:
+        if _loader is None:
+            return load_puzzle()
+        _loading_done.wait(PUZZLE_WAIT_SECONDS)
+        current = game
+        if current is None:
+            raise RuntimeError(_load_error or "The puzzle is still loading; retry when /readyz reports ready.")
+    return current
+
+
+def load_puzzle() -> Game:
+    """
+    Loads `puzzle_file` and starts serving it, unless a puzzle is already
+    being served. Returns the puzzle being served.
+
+    Raises:
+        OSError: If the puzzle file cannot be read.
+        ValueError: If the puzzle file is invalid.
+    """
+    with _load_lock:
+        if game is None:
+            _switch_puzzle(Game.from_json_file(puzzle_file))
+    return game
+
+
+def _load_in_background():
+    global _load_error
+    try:
+        if rotation is not None:
+            # Serves today's puzzle; the default puzzle is only a fallback.
+            rotation.tick()
+        load_puzzle()
+    except (OSError, ValueError) as e:
+        _load_error = f"Could not load the puzzle: {type(e).__name__}: {e}"
+    finally:
+        _loading_done.set()
+    if rotation is not None:
+        rotation.start()
+
+
+def start_loading():
+    """
+    Loads the puzzle on a background thread, so the server answers health
+    checks right away. Requests that need the puzzle wait for it, and
+    /readyz reports when it is ready.
+    """
+    global _loader
+    with _load_lock:
+        if _loader is None:
+            _loader = threading.Thread(target=_load_in_background, name="puzzle-loader", daemon=True)
+            _loader.start()
+
+
+def readiness() -> Dict[str, Any]:
+    """Returns whether a puzzle is loaded ("ready"), which one, and the last load error."""
+    current = game
+    return {
+        "ready": current is not None,
+        "puzzle": current.game_id if current is not None else None,
+        "error": _load_error,
+    }
+
+
+def _new_session_game() -> Game:
+    """
+    Creates a fresh, unplayed copy of the current puzzle for a new session.
+    Sessions keep their copy when the daily puzzle changes.
+    """
+    session_game = copy.deepcopy(_puzzle())
+    session_game.reset()
+    return session_game
+
+
+def _session_spilled(session: Session) -> int | None:
+    """Returns the leaderboard entry of a session about to be spilled to disk."""
+    return leaderboards.for_game(session.game).entry_of(session.game)
+
+
+def _session_reloaded(session: Session, entry: int | None):
+    """Gives a reloaded session's new game the leaderboard entry of the game it replaces."""
+    if entry is not None:
+        leaderboards.for_game(session.game).transfer(session.game, entry)
+
+
+# Each client session plays its own copy of the puzzle. With
+# `--session-memory-mb`, idle sessions are spilled to disk, and sessions
+# idle for `--session-ttl-minutes` are removed (see configure).
+sessions = SessionStore(_new_session_game, on_spill=_session_spilled, on_reload=_session_reloaded)
+
+
+# Rendered text shared by all sessions: sessions in the same state (or with
+# the same part of the puzzle solved) reuse one rendering.
+render_cache = RenderCache(max_entries=4096)
+# Renders likely next states after each correct answer. Disabled unless
+# `--prerender-workers` is given (see deploy.parse_args).
+prerenderer = Prerenderer(render_cache)
+
+
+# Signs client-held state tokens. Every worker serving the same clients must
+# share the secret; without one configured, a random per-process key is used.
+TOKEN_SECRET_ENV = "BRACKET_CITY_TOKEN_SECRET"
+state_tokens = StateTokenCodec(
+    os.environ[TOKEN_SECRET_ENV].encode("utf-8") if os.environ.get(TOKEN_SECRET_ENV)
+    else secrets.token_bytes(32)
+)
+
+# How long state tokens for a replaced puzzle keep working, so that
+# stateless players can finish it after the daily rotation.
+PREVIOUS_PUZZLE_GRACE_SECONDS = 6 * 3600.0
+# Replaced puzzles still accepting tokens: fingerprint prefix -> (game, expiry).
+_previous_puzzles: dict[bytes, tuple[Game, float]] = {}
+
+
+def _puzzle_for_token(state: str | None) -> Game:
+    """
+    Returns the puzzle a state token was issued for: the current puzzle, or
+    a replaced one still within its grace period. Otherwise (including for
+    invalid tokens) the current puzzle is returned, and decoding the token
+    against it reports the problem.
+    """
+    current = _puzzle()
+    if not state or not _previous_puzzles:
+        return current
+    try:
+        fingerprint = state_tokens.fingerprint_of(state)
+    except InvalidStateToken:
+        return current
+    previous_game, expires_at = _previous_puzzles.get(fingerprint, (current, 0.0))
+    if time.monotonic() >= expires_at:
+        return current
+    return previous_game
+
+
+# Set by the deploy router to the address of the client it forwards for.
+CLIENT_HEADER = "x-bracket-city-client"
+LOOPBACK_HOSTS = ("127.0.0.1", "::1")
+
+
+def _current_request() -> Request | None:
+    """Returns the HTTP request being handled, or None outside of one (stdio)."""
+    try:
+        return mcp.get_context().request_context.request
+    except ValueError:
+        return None
+
+
+def _current_session_id() -> str | None:
+    """
+    Returns the transport session ID of the request being handled, or None
+    outside of a request or on transports without sessions (stdio).
+    """
+    request = _current_request()
+    if request is None:
+        return None
+    # Streamable HTTP sends the ID as a header; SSE as a query parameter.
+    return request.headers.get("mcp-session-id") or request.query_params.get("session_id")
+
+
+def _rate_limit_key() -> str | None:
+    """
+    Returns the key of the current caller's rate limits: its session ID or,
+    for requests without one (e.g. with `--stateless`), its client address,
+    so sessionless clients do not share buckets. Calls outside of a request
+    (stdio) come from a single client and share the key None.
+    """
+    session_id = _current_session_id()
+    if session_id is not None:
+        return session_id
+    request = _current_request()
+    if request is None or request.client is None:
+        return None
+    host = request.client.host
+    # Behind the router, every request comes from the loopback address;
+    # the router passes the client's own address on. Only trust it there.
+    if host in LOOPBACK_HOSTS:
+        host = request.headers.get(CLIENT_HEADER) or host
+    return f"client:{host}"
+
+
+# Serializes writers on the shared module-level game.
+_default_game_lock = threading.Lock()
+
+
+def _get_game() -> Game:
+    """
+    Returns the game for the current session. Requests without a session
+    (stdio, or direct calls) share the module-level `game`.
+    """
+    session_id = _current_session_id()
+    if session_id is None:
+        return _puzzle()
+    return sessions.get(session_id).game
+
+
+def _get_game_and_lock() -> tuple[Game, threading.Lock]:
+    """Returns the current session's game and the lock its writers must hold."""
+    session_id = _current_session_id()
+    if session_id is None:
+        return _puzzle(), _default_game_lock
+    session = sessions.get(session_id)
+    return session.game, session.lock
+
+# Checkpoints saved on the shared module-level game.
+_default_checkpoints = CheckpointStore()
+
+
+def _get_checkpoints() -> CheckpointStore:
+    """Returns the checkpoints saved by the current session."""
+    session_id = _current_session_id()
+    if session_id is None:
+        return _default_checkpoints
+    return sessions.get(session_id).checkpoints
+
+# Scores of completed games, per puzzle. Only server-side games are
+# recorded: client-held state tokens can be replayed to complete a puzzle
+# any number of times.
+leaderboards = LeaderboardStore()
+
+
+def _record_completion(game: Game, score: int) -> int:
+    """Records a completed game on its puzzle's leaderboard and returns its rank."""
+    return leaderboards.for_game(game).record(game, score, time.monotonic() - game.analytics.started_at)
+
+# Records answers given in server-side sessions for offline replay. Off
+# unless `--answer-log` is given (see configure).
+answer_log: AnswerLog | None = None
+
+
+def _log_answer(game: Game, tool: str, clue_id: str | None, answer: str, correct: bool):
+    if answer_log is not None:
+        answer_log.record(_current_session_id(), game, tool, clue_id, answer, correct)
+
+def _log_checkpoint(game: Game, tool: str, checkpoint_id: str, success: bool):
+    if answer_log is not None:
+        answer_log.record(_current_session_id(), game, tool, None, "", success, checkpoint=checkpoint_id)
+
+# Per-caller rate limits and global load shedding for tool calls. Off
+# unless configured (see configure and deploy.parse_args).
+admission = AdmissionController()
+
+
+def _tool(name: str, rate_key: str | None = None, cost: Callable[..., float] | None = None):
+    """
+    Registers a tool with FastMCP behind admission control. Admitted calls
+    run in a worker thread. The undecorated function is returned, so it can
+    still be called directly. `rate_key` and `cost` are passed on to
+    `AdmissionController.guard`.
+    """
+    def decorator(fn):
+        mcp.add_tool(admission.guard(name, fn, _rate_limit_key, rate_key, cost), name=name)
+        return fn
+    return decorator
+
+
+def _switch_puzzle(new_game: Game):
+    """Starts serving `new_game` in place of the current puzzle."""
+    global game, _default_checkpoints
+    with _default_game_lock:
+        now = time.monotonic()
+        for fingerprint, (_, expires_at) in list(_previous_puzzles.items()):
+            if now >= expires_at:
+                del _previous_puzzles[fingerprint]
+        if game is not None and game.fingerprint != new_game.fingerprint:
+            # Tokens issued for the old puzzle stay usable for a while.
+            _previous_puzzles[game.fingerprint[:FINGERPRINT_BYTES]] = (game, now + PREVIOUS_PUZZLE_GRACE_SECONDS)
+        game = new_game
+        # Checkpoints of the shared game belong to the old puzzle.
+        _default_checkpoints = CheckpointStore()
+        if answer_log is not None:
+            # Requests without a session play the new puzzle from now on.
+            answer_log.record(None, new_game, "switch", None, "", True)
+
+
+def configure(args):
+    """Applies the server options parsed by `deploy.parse_args` to this process."""
+    global rotation, answer_log, puzzle_file
+    prerenderer.max_workers = args.prerender_workers
+    admission.rate_limiter.rate = args.rate_limit
+    admission.rate_limiter.burst = args.rate_burst
+    limiter = admission.concurrency_limiter
+    limiter.target_latency = args.latency_target_ms / 1000
+    limiter.max_limit = args.max_concurrency
+    limiter.limit = float(min(limiter.limit, limiter.max_limit))
+    if args.puzzle:
+        puzzle_file = args.puzzle
+    if args.rotate_daily and rotation is None:
+        rotation = PuzzleRotation(
+            args.puzzle_dir,
+            _switch_puzzle,
+            render_cache,
+            tz=zoneinfo.ZoneInfo(args.rotation_timezone) if args.rotation_timezone else None,
+            lead_time=args.prewarm_minutes * 60,
+        )
+    # Today's puzzle (or --puzzle) is loaded while the server starts up.
+    start_loading()
+    sessions.session_ttl = args.session_ttl_minutes * 60
+    if args.session_memory_mb is not None:
+        sessions.memory_budget = int(args.session_memory_mb * 2**20)
+        sessions.spill_dir = args.spill_dir
+        atexit.register(sessions.close)
+    if args.answer_log and answer_log is None:
+        answer_log = AnswerLog(args.answer_log)
+        atexit.register(answer_log.close)
+
+# Health check endpoint: the process is up, even while the puzzle loads.
 @mcp.tool()
 def health() -> str:
     return "OK"
 
+@mcp.tool()
+def ready() -> Dict[str, Any]:
+    """
+    Reports whether the server is ready to play: "ready" is true once the
+    puzzle is loaded. "puzzle" names it, and "error" explains a failed load.
+    """
+    return readiness()
+
+# Plain HTTP probes for load balancers and orchestrators (HTTP transports).
+@mcp.custom_route("/healthz", methods=["GET"])
+async def healthz(request: Request) -> Response:
+    return PlainTextResponse("OK")
+
+@mcp.custom_route("/readyz", methods=["GET"])
+async def readyz(request: Request) -> Response:
+    status = readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+# Resources read the game's published state snapshot rather than its live
+# clue flags, so they never need a lock and never observe a half-applied answer.
+
 @mcp.resource("bracketcity://game")
 def get_full_game_text() -> str:
-    return game.get_rendered_game_text()
+    current_game = _get_game()
+    return render_cache.render(current_game, current_game.state.completed_mask)
 
 @mcp.resource("bracketcity://clue/{clue_id}")
 def get_clue_text(clue_id: str) -> str:
+    current_game = _get_game()
     try:
-        return game.get_rendered_clue_text(clue_id)
+        return render_cache.render(current_game, current_game.state.completed_mask, clue_id)
     except ValueError as e:
         # TODO: Return a more appropriate error code
         return str(e)
 
 @mcp.resource("bracketcity://clues/available")
 def get_available_clues() -> List[str]:
-    return list(game.active_clues)
+    return list(_get_game().state.active_clues)
+
+@mcp.resource("bracketcity://state/{state}/game")
+def get_full_game_text_for_state(state: str) -> str:
+    game = _puzzle_for_token(state)
+    try:
+        token_state = state_tokens.decode(game, state)
+    except InvalidStateToken as e:
+        return str(e)
+    return render_cache.render(game, token_state.completed_mask)
+
+@mcp.resource("bracketcity://state/{state}/clue/{clue_id}")
+def get_clue_text_for_state(state: str, clue_id: str) -> str:
+    game = _puzzle_for_token(state)
+    try:
+        token_state = state_tokens.decode(game, state)
+        return render_cache.render(game, token_state.completed_mask, clue_id)
+    except ValueError as e:
+        return str(e)
+
+@mcp.resource("bracketcity://state/{state}/clues/available")
+def get_available_clues_for_state(state: str) -> List[str]:
+    game = _puzzle_for_token(state)
+    try:
+        token_state = state_tokens.decode(game, state)
+    except InvalidStateToken:
+        return []
+    return game.active_clues_for_mask(token_state.completed_mask)
+
+@mcp.resource("bracketcity://metrics")
+def get_metrics() -> Dict[str, Any]:
+    """Server-wide counters, e.g. the render cache hit rate."""
+    return {
+        "render_cache": render_cache.stats(),
+        "prerender": prerenderer.stats(),
+        "admission": admission.stats(),
+        "rotation": rotation.stats() if rotation is not None else None,
+        "sessions": sessions.stats(),
+    }
+
+@mcp.resource("bracketcity://stats/clues")
+def get_clue_stats() -> Dict[str, Any]:
+    """
+    Per-clue difficulty statistics across every game played on this worker:
+    wrong attempts before solving, time from reveal to solve, and how often
+    players stopped with the clue unsolved.
+    """
+    game = _puzzle()
+    # Spilled sessions count too: they are the idle ones, so leaving them
+    # out would undercount abandoned clues.
+    played = [
+        analytics
+        for fingerprint, analytics in [(game.fingerprint, game.analytics), *sessions.analytics()]
+        if analytics.attempted and fingerprint == game.fingerprint
+    ]
+    try:
+        return aggregate_clue_stats(game.clue_ids, played)
+    except RuntimeError as e:
+        return {"error": str(e)}
+
+@_tool("start_game")
+def start_game() -> Dict[str, Any]:
+    """
+    Starts a new game whose state is kept by the client. Pass the returned
+    "state" token to answer_clue, and use it in bracketcity://state/{state}/...
+    resources to read the game in that state.
+    """
+    game = _puzzle()
+    initial_state = TokenState(completed_mask=0, incorrect_guesses=0)
+    return {
+        "state": state_tokens.encode(game, initial_state),
+        "available_clues": game.active_clues_for_mask(0),
+    }
+
+def _answer_clue_with_token(clue_id: str, answer: str, state: str | None) -> Dict[str, Any]:
+    """
+    Token-based variant of answer_clue: the play state comes from `state`
+    (or a new game if it is None) and the updated state is returned as a
+    new token. Nothing is stored on the server.
+    """
+    game = _puzzle_for_token(state)
+    response = {
+        "correct": False,
+        "message": "",
+        "available_clues": [],
+        "game_completed": False,
+    }
+    try:
+        token_state = state_tokens.decode(game, state) if state else TokenState(0, 0)
+    except InvalidStateToken as e:
+        response["message"] = str(e)
+        return response
+
+    completed_mask, incorrect_guesses = token_state
+    if clue_id not in game.clues:
+        response["message"] = f"Clue ID '{clue_id}' not found."
+    elif game.clues[clue_id].is_end_clue:
+        if game.is_complete_mask(completed_mask):
+            response["correct"] = True
+            response["message"] = "You've reached the final clue! Congratulations, the game is complete!"
+            response["game_completed"] = True
+            response["score"] = len(game.clues) - incorrect_guesses
+        else:
+            response["message"] = "This is the final clue, but there are other mysteries to solve before the story concludes."
+    else:
+        index = game.clue_index[clue_id]
+        if completed_mask >> index & 1:
+            response["message"] = f"Clue '{clue_id}' has already been answered."
+        elif not game.is_available(clue_id, completed_mask):
+            response["message"] = f"Clue '{clue_id}' is not currently available. Solve its dependencies first."
+        else:
+            if game.clues[clue_id].check_answer(answer):
+                completed_mask |= 1 << index
+                response["correct"] = True
+                response["message"] = "Correct!"
+            else:
+                incorrect_guesses += 1
+                response["close"] = game.clues[clue_id].is_near_miss(answer)
+                response["message"] = "Incorrect answer, but close." if response["close"] else "Incorrect answer."
+            if game.is_complete_mask(completed_mask):
+                response["game_completed"] = True
+                response["message"] += " Congratulations! You've completed the game."
+                response["score"] = len(game.clues) - incorrect_guesses
+
+    response["available_clues"] = game.active_clues_for_mask(completed_mask)
+    response["state"] = state_tokens.encode(game, TokenState(completed_mask, incorrect_guesses))
+    return response
+
+@_tool("answer_clue")
+def answer_clue(clue_id: str, answer: str, state: str | None = None) -> Dict[str, Any]:
+    """
+    Answers a clue. Pass `state` (from start_game or a previous answer) to
+    play with client-held state; the response then includes the new "state".
+    On a stateless server every call uses client-held state. Wrong answers
+    include "close": true when they are a near miss, such as a typo.
+    """
+    if state is not None or mcp.settings.stateless_http:
+        return _answer_clue_with_token(clue_id, answer, state)
+
+    game, lock = _get_game_and_lock()
+    with lock:
+        return _answer_clue_in_session(game, clue_id, answer)
+
+def _answer_clue_in_session(game: Game, clue_id: str, answer: str) -> Dict[str, Any]:
+    """Answers a clue of a server-side game; the caller holds the game's lock."""
+    response = _answer_clue_locked(game, clue_id, answer)
+    _log_answer(game, "answer_clue", clue_id, answer, response["correct"])
+    if response["game_completed"]:
+        response["rank"] = _record_completion(game, response["score"])
+    elif response["correct"]:
+        prerenderer.schedule(game, game.state)
+    return response
+
+# The most answers accepted by one answer_batch call.
+MAX_BATCH_ANSWERS = 100
+
+def _batch_cost(answers: List[Dict[str, str]], state: str | None = None) -> float:
+    """Rate-limit cost of an answer_batch call: one answer_clue call per item."""
+    return max(min(len(answers), MAX_BATCH_ANSWERS), 1)
+
+@_tool("answer_batch", rate_key="answer_clue", cost=_batch_cost)
+def answer_batch(answers: List[Dict[str, str]], state: str | None = None) -> Dict[str, Any]:
+    """
+    Answers several clues in one call, in order, e.g. every available clue
+    at once. Each item has "clue_id" and "answer". Returns "results": one
+    answer_clue response per item. With client-held state, each answer
+    applies to the state left by the previous one, and the final "state"
+    is returned as well. Each item counts as one answer_clue call against
+    the rate limit.
+    """
+    if len(answers) > MAX_BATCH_ANSWERS:
+        return {"results": [], "message": f"At most {MAX_BATCH_ANSWERS} answers per batch."}
+    pairs = [(item.get("clue_id", ""), item.get("answer", "")) for item in answers]
+    if state is not None or mcp.settings.stateless_http:
+        results = []
+        for clue_id, answer in pairs:
+            response = _answer_clue_with_token(clue_id, answer, state)
+            state = response.get("state", state)
+            results.append(response)
+        return {"results": results, "state": state}
+
+    game, lock = _get_game_and_lock()
+    with lock:
+        return {"results": [_answer_clue_in_session(game, clue_id, answer) for clue_id, answer in pairs]}
+
+@_tool("answer_any")
+def answer_any(answer: str, state: str | None = None) -> Dict[str, Any]:
+    """
+    Submits an answer without naming a clue. The answer is checked against
+    every available clue at once. If it fits one, that clue is solved and
+    its ID is returned as "clue_id". If several available clues share the
+    answer, the first in puzzle order is solved. A miss counts as a single
+    incorrect guess. Pass `state` to play with client-held state.
+    """
+    if state is not None or mcp.settings.stateless_http:
+        return _answer_any_with_token(answer, state)
+
+    game, lock = _get_game_and_lock()
+    with lock:
+        clue_id = game.answer_any(answer)
+        _log_answer(game, "answer_any", clue_id, answer, clue_id is not None)
+        if clue_id is None:
+            response = {
+                "correct": False,
+                "clue_id": None,
+                "message": "That answer does not fit any available clue.",
+                "available_clues": list(game.active_clues),
+                "game_completed": False,
+            }
+        else:
+            response = {
+                "correct": True,
+                "clue_id": clue_id,
+                "message": "Correct!",
+                "available_clues": list(game.active_clues),
+                "game_completed": game.is_complete,
+            }
+            if response["game_completed"]:
+                response["message"] += " Congratulations! You've completed the game."
+                response["score"] = len(game.clues) - game.incorrect_guesses
+                response["rank"] = _record_completion(game, response["score"])
+            else:
+                prerenderer.schedule(game, game.state)
+        return response
+
+def _answer_any_with_token(answer: str, state: str | None) -> Dict[str, Any]:
+    """Token-based variant of answer_any; see _answer_clue_with_token."""
+    game = _puzzle_for_token(state)
+    try:
+        token_state = state_tokens.decode(game, state) if state else TokenState(0, 0)
+    except InvalidStateToken as e:
+        return {
+            "correct": False,
+            "clue_id": None,
+            "message": str(e),
+            "available_clues": [],
+            "game_completed": False,
+        }
+    completed_mask = token_state.completed_mask
+    for clue_id in game.clues_for_answer(answer):
+        if game.is_available(clue_id, completed_mask):
+            response = _answer_clue_with_token(clue_id, answer, state)
+            response["clue_id"] = clue_id
+            return response
+    incorrect = TokenState(completed_mask, token_state.incorrect_guesses + 1)
+    return {
+        "correct": False,
+        "clue_id": None,
+        "message": "That answer does not fit any available clue.",
+        "available_clues": game.active_clues_for_mask(completed_mask),
+        "game_completed": False,
+        "state": state_tokens.encode(game, incorrect),
+    }
+
+@_tool("search_clues")
+def search_clues(query: str, limit: int = 20, state: str | None = None) -> Dict[str, Any]:
+    """
+    Finds the currently available clues whose text contains every word of
+    `query` (case-insensitive). Returns up to `limit` matches with their
+    current text, and the total number of matches. Pass `state` to search
+    the available clues of a client-held state token.
+    """
+    response: Dict[str, Any] = {"matches": [], "total": 0}
+    if state is not None or mcp.settings.stateless_http:
+        current_game = _puzzle_for_token(state)
+        try:
+            completed_mask = state_tokens.decode(current_game, state).completed_mask if state else 0
+        except InvalidStateToken as e:
+            response["message"] = str(e)
+            return response
+        clue_ids = current_game.search_clues(query, set(current_game.active_clues_for_mask(completed_mask)))
+    else:
+        current_game = _get_game()
+        completed_mask = current_game.state.completed_mask
+        clue_ids = current_game.search_clues(query, current_game.state.active_clues)
+    response["total"] = len(clue_ids)
+    response["matches"] = [
+        {"clue_id": clue_id, "text": render_cache.render(current_game, completed_mask, clue_id)}
+        for clue_id in clue_ids[:max(limit, 0)]
+    ]
+    return response
+
+@_tool("leaderboard")
+def leaderboard(limit: int = 10) -> Dict[str, Any]:
+    """
+    Returns today's best completions: rank, score and solve time in seconds.
+    Higher scores rank first; equal scores rank by faster solve.
+    """
+    board = leaderboards.for_game(_puzzle())
+    return {"completions": len(board), "top": board.top(max(limit, 0))}
+
+@_tool("leaderboard_rank")
+def leaderboard_rank() -> Dict[str, Any]:
+    """
+    Returns this session's rank on the leaderboard of the puzzle it played,
+    and the percentage of completions it beat. Only games completed on the
+    server (not with state tokens) are ranked.
+    """
+    game = _get_game()
+    board = leaderboards.for_game(game)
+    entry = board.rank_of(game)
+    if entry is None:
+        return {"rank": None, "completions": len(board), "message": "Complete the game to get a rank."}
+    entry["completions"] = len(board)
+    return entry
+
+@_tool("leaderboard_percentile")
+def leaderboard_percentile(percentile: float) -> Dict[str, Any]:
+    """
+    Returns the score and solve time needed to beat `percentile` percent
+    (0-100) of today's completions.
+    """
+    board = leaderboards.for_game(_puzzle())
+    entry = board.at_percentile(min(max(percentile, 0.0), 100.0))
+    if entry is None:
+        return {"entry": None, "completions": 0, "message": "Nobody has completed today's puzzle yet."}
+    return {"entry": entry, "completions": len(board)}
+
+_STATELESS_CHECKPOINT_MESSAGE = (
+    "This server keeps no game state. Every state token is already a checkpoint: "
+    "keep a token and pass it to answer_clue again to branch from it."
+)
+
+@_tool("checkpoint")
+def checkpoint() -> Dict[str, Any]:
+    """
+    Saves the current game state and returns its "checkpoint" ID. Pass the
+    ID to rollback to return to this state, e.g. to explore another order
+    of answers. Checkpoints are cheap; take as many as needed.
+    """
+    if mcp.settings.stateless_http:
+        return {"checkpoint": None, "message": _STATELESS_CHECKPOINT_MESSAGE}
+    game, lock = _get_game_and_lock()
+    with lock:
+        state = game.checkpoint()
+        checkpoint_id = _get_checkpoints().add(state)
+        _log_checkpoint(game, "checkpoint", checkpoint_id, True)
+    return {
+        "checkpoint": checkpoint_id,
+        "message": f"Saved checkpoint '{checkpoint_id}'.",
+        "available_clues": list(state.active_clues),
+        "completed_clues": state.completed_mask.bit_count(),
+    }
+
+@_tool("rollback")
+def rollback(checkpoint: str) -> Dict[str, Any]:
+    """
+    Restores the game to a state saved with the checkpoint tool. The
+    checkpoint stays valid, so it can be rolled back to again.
+    """
+    response = {
+        "success": False,
+        "message": "",
+        "available_clues": [],
+        "game_completed": False,
+    }
+    if mcp.settings.stateless_http:
+        response["message"] = _STATELESS_CHECKPOINT_MESSAGE
+        return response
+    game, lock = _get_game_and_lock()
+    with lock:
+        state = _get_checkpoints().get(checkpoint)
+        if state is None:
+            response["message"] = f"Checkpoint '{checkpoint}' not found."
+        else:
+            game.rollback(state)
+            response["success"] = True
+            response["message"] = f"Rolled back to checkpoint '{checkpoint}'."
+        _log_checkpoint(game, "rollback", checkpoint, response["success"])
+        response["available_clues"] = list(game.active_clues)
+        response["game_completed"] = game.is_complete
+    return response
 
-@mcp.tool(name="answer_clue")
-def answer_clue(clue_id: str, answer: str) -> Dict[str, Any]:
+def _answer_clue_locked(game: Game, clue_id: str, answer: str) -> Dict[str, Any]:
     response = {
         "correct": False,
         "message": "",
@@ -81,7 +826,9 @@ def answer_clue(clue_id: str, answer: str) -> Dict[str, Any]:
     if is_correct:
         response["message"] = "Correct!"
     else:
-        response["message"] = "Incorrect answer."
+        # Tell the player when a wrong answer is a near miss (e.g. a typo).
+        response["close"] = clue_obj.is_near_miss(answer)
+        response["message"] = "Incorrect answer, but close." if response["close"] else "Incorrect answer."
 
     # Update available clues after the attempt
     response["available_clues"] = list(game.active_clues)
@@ -101,8 +848,8 @@ def answer_clue(clue_id: str, answer: str) -> Dict[str, Any]:
     return response
 
 if __name__ == "__main__":
-    # TODO: Make host and port configurable
-    mcp.run(host="0.0.0.0", port=8080)
+    from bracket_city_mcp.deploy import parse_args, serve
+    serve(mcp, parse_args(), configure)
 
 # TODO: Implement tests for the BracketCity MCP server.
 # The FastMCP library does not seem to provide a test_client() method.
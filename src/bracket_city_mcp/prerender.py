@@ -0,0 +1,127 @@
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from bracket_city_mcp.game.game import Game
+from bracket_city_mcp.game.state import GameState
+from bracket_city_mcp.render_cache import RenderCache
+
+
+class Prerenderer:
+    def __init__(self, cache: RenderCache, max_workers: int = 0, budget: int = 8, max_queued: int = 256):
+        """
+        Initializes a Prerenderer, which speculatively renders the states a
+        game can move to next and stores them in `cache`.
+
+        After a correct answer, any currently active clue may be solved next.
+        `schedule` renders the whole game for each of those successor states
+        on a background thread pool, so the following `bracketcity://game`
+        read is usually a cache hit.
+
+        Args:
+            cache: The render cache to fill.
+            max_workers: Background threads to use. 0 disables prerendering.
+                         The pool is created on first use, so this may be
+                         changed until then.
+            budget: The maximum number of successor states rendered per
+                    scheduled state.
+            max_queued: The maximum number of renders waiting across all
+                        games. Further work is dropped rather than queued.
+        """
+        self.cache = cache
+        self.max_workers = max_workers
+        self.budget = budget
+        self.max_queued = max_queued
+        self._executor: ThreadPoolExecutor | None = None
+        # Outstanding work per game, cancelled when the game moves on.
+        self._pending: weakref.WeakKeyDictionary[Game, list[Future]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self.scheduled = 0
+        self.rendered = 0
+        self.cancelled = 0
+        self.stale = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _successor_masks(self, game: Game, state: GameState) -> list[int]:
+        masks = []
+        for index in sorted(game.clue_index[clue_id] for clue_id in state.active_clues):
+            bit = 1 << index
+            if state.completed_mask & bit or game.end_clue_mask & bit:
+                continue
+            mask = state.completed_mask | bit
+            if self.cache.key_for(game, mask) not in self.cache:
+                masks.append(mask)
+            if len(masks) == self.budget:
+                break
+        return masks
+
+    def _render(self, game: Game, scheduled_mask: int, successor_mask: int):
+        # The game has moved on (or been reset) since this was scheduled.
+        is_stale = game.state.completed_mask != scheduled_mask
+        if not is_stale:
+            self.cache.render(game, successor_mask)
+        with self._lock:
+            self._queued -= 1
+            if is_stale:
+                self.stale += 1
+            else:
+                self.rendered += 1
+
+    def schedule(self, game: Game, state: GameState):
+        """
+        Cancels any queued prerendering for `game` and queues renders of the
+        successor states of `state`. Returns immediately; does nothing when
+        prerendering is disabled.
+        """
+        if not self.enabled:
+            return
+        masks = self._successor_masks(game, state)
+        with self._lock:
+            for future in self._pending.pop(game, []):
+                if future.cancel():
+                    self._queued -= 1
+                    self.cancelled += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="prerender"
+                )
+            futures = []
+            for mask in masks:
+                if self._queued >= self.max_queued:
+                    self.dropped += len(masks) - len(futures)
+                    break
+                self._queued += 1
+                futures.append(self._executor.submit(self._render, game, state.completed_mask, mask))
+            self.scheduled += len(futures)
+            if futures:
+                self._pending[game] = futures
+
+    def shutdown(self, cancel_pending: bool = True):
+        """
+        Stops the background threads, after cancelling queued work or, if
+        `cancel_pending` is False, after finishing it.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=cancel_pending)
+        with self._lock:
+            self._queued = 0
+
+    def stats(self) -> dict:
+        """Returns counters of scheduled, completed and abandoned renders."""
+        return {
+            "workers": self.max_workers,
+            "scheduled": self.scheduled,
+            "rendered": self.rendered,
+            "cancelled": self.cancelled,
+            "stale": self.stale,
+            "dropped": self.dropped,
+            "queued": self._queued,
+        }
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+
+from bracket_city_mcp.game.game import Game
+
+
+class RenderCache:
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initializes a RenderCache: a bounded LRU cache of rendered clue text
+        shared by every session on the server.
+
+        Entries are keyed by (game fingerprint, clue ID, completion state of
+        that clue's dependency subtree). Sessions playing the same puzzle
+        therefore share entries. A clue's entry also stays valid while
+        unrelated parts of the puzzle change.
+
+        Args:
+            max_entries: The maximum number of rendered texts to keep.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        # (fingerprint, clue_id) -> mask of the clue and everything it depends on
+        self._subtree_masks: dict[tuple[bytes, str], int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _subtree_mask(self, game: Game, clue_id: str) -> int:
+        key = (game.fingerprint, clue_id)
+        mask = self._subtree_masks.get(key)
+        if mask is None:
+            in_subtree = bytearray(len(game.clue_ids))
+            stack = [clue_id]
+            while stack:
+                current_id = stack.pop()
+                index = game.clue_index[current_id]
+                if in_subtree[index]:
+                    continue
+                in_subtree[index] = 1
+                stack.extend(game.rev_adj[current_id])
+            mask = self._subtree_masks[key] = game.mask_from_flags(in_subtree)
+        return mask
+
+    def key_for(self, game: Game, completed_mask: int, clue_id: str | None = None) -> tuple:
+        """Returns the cache key for rendering `clue_id` (default: the end clue) in a state."""
+        if clue_id is None:
+            clue_id = game.end_clues[0]
+        if clue_id not in game.clue_index:
+            raise ValueError(f"Clue ID '{clue_id}' not found in game.")
+        return (game.fingerprint, clue_id, completed_mask & self._subtree_mask(game, clue_id))
+
+    def render(self, game: Game, completed_mask: int, clue_id: str | None = None) -> str:
+        """
+        Returns the rendered text of `clue_id` (default: the whole game) for
+        the completion state `completed_mask`, rendering it only on a miss.
+
+        Raises:
+            ValueError: If the clue_id does not exist.
+        """
+        key = self.key_for(game, completed_mask, clue_id)
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+            self.misses += 1
+
+        text = game.render_clue_text_for_mask(key[1], completed_mask)
+        self.put(key, text)
+        return text
+
+    def put(self, key: tuple, text: str):
+        """Stores a rendered text under a key from `key_for`, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters, the hit rate and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
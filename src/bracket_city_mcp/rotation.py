@@ -0,0 +1,154 @@
+import datetime as dt
+import os
+import threading
+from typing import Callable
+
+from bracket_city_mcp.game.game import Game
+from bracket_city_mcp.render_cache import RenderCache
+
+DEFAULT_PUZZLE_DIR = "games/json"
+# How long before midnight the next day's puzzle is loaded and rendered.
+DEFAULT_LEAD_TIME = 600.0
+# How often a missing or invalid puzzle file is retried; also the longest
+# the scheduler sleeps, so it notices clock changes.
+RETRY_INTERVAL = 60.0
+
+
+def puzzle_path(directory: str, date: dt.date) -> str:
+    """Returns the path of the puzzle for `date`: `<directory>/<YYYYMMDD>.json`."""
+    return os.path.join(directory, date.strftime("%Y%m%d") + ".json")
+
+
+class PuzzleRotation:
+    def __init__(self, directory: str, on_switch: Callable[[Game], None], render_cache: RenderCache | None = None,
+                 tz: dt.tzinfo | None = None, lead_time: float = DEFAULT_LEAD_TIME,
+                 retry_interval: float = RETRY_INTERVAL, now: Callable[[], dt.datetime] | None = None):
+        """
+        Initializes a PuzzleRotation, which serves each day's puzzle from
+        `<directory>/<YYYYMMDD>.json`.
+
+        `lead_time` seconds before midnight, the next day's puzzle is loaded,
+        validated and its initial state rendered into `render_cache`. At
+        midnight it is handed to `on_switch`, which replaces the served
+        puzzle in a single assignment. If the file is missing or invalid,
+        the current puzzle keeps being served and loading is retried.
+
+        Args:
+            directory: The directory holding the daily puzzle files.
+            on_switch: Called with the new puzzle when the day changes.
+            render_cache: Receives the new puzzle's first renders, if given.
+            tz: The time zone whose midnight starts a new day (default: local time).
+            lead_time: Seconds before midnight to prepare the next puzzle.
+            retry_interval: Seconds between attempts to load a failing puzzle.
+            now: Returns the current time; for tests.
+        """
+        self.directory = directory
+        self.on_switch = on_switch
+        self.render_cache = render_cache
+        self.lead_time = lead_time
+        self.retry_interval = retry_interval
+        self._now = now or (lambda: dt.datetime.now(tz))
+        self.current_date: dt.date | None = None
+        self._prepared: tuple[dt.date, Game] | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.switches = 0
+        self.failures = 0
+        self.last_error: str | None = None
+
+    def prepare(self, date: dt.date) -> Game:
+        """
+        Loads and validates the puzzle for `date`, renders its initial state
+        and keeps it ready for `switch`. Safe to call again for the same date.
+
+        Raises:
+            FileNotFoundError: If there is no puzzle file for `date`.
+            ValueError: If the puzzle file is invalid.
+        """
+        with self._lock:
+            if self._prepared is not None and self._prepared[0] == date:
+                return self._prepared[1]
+        game = Game.from_json_file(puzzle_path(self.directory, date))
+        game.fingerprint  # Computed lazily; do it now rather than on a request.
+        if self.render_cache is not None:
+            # What the first players of the day read: the puzzle and its start clues.
+            self.render_cache.render(game, 0)
+            for clue_id in game.state.active_clues:
+                self.render_cache.render(game, 0, clue_id)
+        with self._lock:
+            self._prepared = (date, game)
+        return game
+
+    def switch(self, date: dt.date):
+        """
+        Starts serving the puzzle for `date`, preparing it first if `prepare`
+        has not already done so.
+
+        Raises:
+            FileNotFoundError: If there is no puzzle file for `date`.
+            ValueError: If the puzzle file is invalid.
+        """
+        game = self.prepare(date)
+        self.on_switch(game)
+        with self._lock:
+            self.current_date = date
+            self._prepared = None
+            self.switches += 1
+
+    def tick(self) -> float:
+        """
+        Does whatever is due now: switches to today's puzzle if it is not
+        being served yet, and prepares tomorrow's once within `lead_time` of
+        midnight.
+
+        Returns:
+            The number of seconds until the next call is due.
+        """
+        now = self._now()
+        today = now.date()
+        tomorrow = today + dt.timedelta(days=1)
+        until_midnight = (dt.datetime.combine(tomorrow, dt.time(), now.tzinfo) - now).total_seconds()
+        try:
+            if self.current_date != today:
+                self.switch(today)
+            elif until_midnight <= self.lead_time:
+                self.prepare(tomorrow)
+        except (OSError, ValueError) as e:
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            return min(self.retry_interval, until_midnight)
+        with self._lock:
+            prepared = self._prepared is not None and self._prepared[0] == tomorrow
+        next_event = until_midnight if prepared else until_midnight - self.lead_time
+        return min(max(next_event, 0.0), self.retry_interval)
+
+    def _run(self):
+        delay = 0.0
+        while not self._stop.wait(delay):
+            delay = self.tick()
+
+    def start(self):
+        """Runs the schedule on a daemon thread until `stop` is called."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="puzzle-rotation", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the scheduler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        """Returns the date being served, the prepared date and error counts."""
+        with self._lock:
+            prepared = self._prepared[0] if self._prepared is not None else None
+        return {
+            "current_date": self.current_date.isoformat() if self.current_date else None,
+            "prepared_date": prepared.isoformat() if prepared else None,
+            "switches": self.switches,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
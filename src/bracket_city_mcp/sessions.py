@@ -0,0 +1,511 @@
+import contextlib
+import copy
+import functools
+import hashlib
+import itertools
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+from array import array
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Iterator
+
+from bracket_city_mcp.game.analytics import ClueAnalytics
+from bracket_city_mcp.game.game import Game
+from bracket_city_mcp.game.state import GameState
+
+# Checkpoints kept per game; the oldest are forgotten beyond this.
+MAX_CHECKPOINTS = 10_000
+# Sessions used within this many seconds are never spilled to disk: a
+# request may hold a session between looking it up and taking its lock.
+MIN_IDLE_SECONDS = 5.0
+# Bumped whenever the layout of spilled sessions changes.
+_SPILL_FORMAT = 2
+# Per-entry overhead of a dict slot (hash, key and value pointers).
+_DICT_ENTRY_BYTES = 3 * 8
+# Objects that copy.deepcopy shares between copies instead of duplicating.
+_SHARED_TYPES = (str, bytes, int, float, bool, type(None), type, range,
+                 types.FunctionType, types.BuiltinFunctionType)
+
+
+def estimate_copy_bytes(root: object) -> int:
+    """
+    Estimates the memory a deep copy of `root` holds on its own, by summing
+    `sys.getsizeof` over its object graph. Objects that copies share are not
+    counted: immutable leaves such as strings and ints, and objects whose
+    `__deepcopy__` returns themselves (e.g. answer matchers and the search
+    index).
+    """
+    seen = set()
+    total = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if (id(obj) in seen or isinstance(obj, _SHARED_TYPES)
+                or (obj is not root and hasattr(type(obj), "__deepcopy__"))):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, array):
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    value = getattr(obj, slot, None)
+                    if value is not None:
+                        stack.append(value)
+    return total
+
+
+def _checkpoint_bytes(checkpoint_id: str, state: GameState) -> int:
+    """Estimates the memory one stored checkpoint holds."""
+    return (sys.getsizeof(checkpoint_id) + sys.getsizeof(state) + sys.getsizeof(state.completed_mask)
+            + sys.getsizeof(state.active_clues) + _DICT_ENTRY_BYTES)
+
+
+class CheckpointStore:
+    def __init__(self, max_checkpoints: int = MAX_CHECKPOINTS):
+        """
+        Initializes a CheckpointStore, which names saved game states so that
+        clients can roll back to them.
+
+        Args:
+            max_checkpoints: The number of checkpoints to keep. Adding more
+                             forgets the oldest.
+        """
+        self.max_checkpoints = max_checkpoints
+        self._checkpoints: dict[str, GameState] = {}
+        self._next_id = 1
+        # Estimated memory held by the stored checkpoints.
+        self.nbytes = 0
+        # Called with the change in `nbytes` after each add.
+        self.on_resize: Callable[[int], None] | None = None
+
+    def add(self, state: GameState) -> str:
+        """Stores a checkpoint and returns its ID."""
+        checkpoint_id = f"cp{self._next_id}"
+        self._next_id += 1
+        self._checkpoints[checkpoint_id] = state
+        delta = _checkpoint_bytes(checkpoint_id, state)
+        while len(self._checkpoints) > self.max_checkpoints:
+            oldest = next(iter(self._checkpoints))
+            delta -= _checkpoint_bytes(oldest, self._checkpoints.pop(oldest))
+        self.nbytes += delta
+        if self.on_resize is not None:
+            self.on_resize(delta)
+        return checkpoint_id
+
+    def get(self, checkpoint_id: str) -> GameState | None:
+        return self._checkpoints.get(checkpoint_id)
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+
+class Session:
+    def __init__(self, session_id: str, game: Game, game_bytes: int = 0):
+        """
+        Initializes a Session object.
+
+        Args:
+            session_id: The transport-level ID of the client session.
+            game: The session's private game instance.
+            game_bytes: The estimated memory held by `game` alone.
+        """
+        self.session_id = session_id
+        self.game = game
+        # Serializes writers (answers) within this session. Readers never take
+        # it: they render the immutable snapshot in `game.state`.
+        self.lock = threading.Lock()
+        self.checkpoints = CheckpointStore()
+        self.last_access = time.monotonic()
+        self.game_bytes = game_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """The estimated memory held by this session: its game and its checkpoints."""
+        return self.game_bytes + self.checkpoints.nbytes
+
+    def __repr__(self):
+        return f"Session(id='{self.session_id}', game={self.game!r})"
+
+
+class SessionStore:
+    def __init__(self, game_factory: Callable[[], Game],
+                 on_spill: Callable[[Session], Any] | None = None,
+                 on_reload: Callable[[Session, Any], None] | None = None):
+        """
+        Initializes a SessionStore, which maps session IDs to Session objects.
+
+        The store tracks the estimated memory of its sessions. When
+        `memory_budget` is set and exceeded, the least recently used idle
+        sessions are spilled to files in `spill_dir` and dropped from memory.
+        A spilled session is reloaded transparently by the next `get`.
+        Sessions idle for longer than `session_ttl` seconds, in memory or
+        spilled, are removed for good.
+
+        Spill files are written and read outside the store lock, so other
+        sessions are served meanwhile. Requests for the session being
+        written or read wait until it is done.
+
+        Args:
+            game_factory: Called to create a fresh game for each new session.
+            on_spill: Called with each session about to be spilled. Its
+                      return value (which must be picklable) is saved with
+                      the session and passed back to `on_reload`.
+            on_reload: Called with each reloaded session and the value
+                       `on_spill` returned for it.
+        """
+        self._game_factory = game_factory
+        self._on_spill = on_spill
+        self._on_reload = on_reload
+        # In least recently used order.
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+        # Estimated bytes above which idle sessions are spilled; None never spills.
+        self.memory_budget: int | None = None
+        # Where the spill directory is created; None uses the system temp directory.
+        self.spill_dir: str | None = None
+        self.min_idle = MIN_IDLE_SECONDS
+        # Seconds of inactivity after which a session is removed; None keeps
+        # sessions until `remove` is called.
+        self.session_ttl: float | None = None
+        self.nbytes = 0
+        self._game_bytes: dict[bytes, int] = {}
+        # Session ID -> (puzzle fingerprint, last access, analytics) of every
+        # spilled session, in the order they were spilled: roughly least
+        # recently used first. The per-clue analytics stay in memory, so
+        # clue statistics still cover spilled sessions.
+        self._spilled: dict[str, tuple[bytes, float, ClueAnalytics]] = {}
+        # A game of each puzzle with spilled sessions, copied to reload them.
+        self._templates: dict[bytes, Game] = {}
+        self._template_users: Counter[bytes] = Counter()
+        self._spill_path: str | None = None
+        # IDs of the sessions whose spill file is being written, read or
+        # deleted outside the store lock. Each acts as a per-session lock:
+        # other requests for the session wait on `_file_done` until it clears.
+        self._busy: set[str] = set()
+        self._file_done = threading.Condition(self._lock)
+        self.spills = 0
+        self.reloads = 0
+        self.evictions = 0
+        self._spill_seconds = 0.0
+        self._reload_seconds = 0.0
+
+    def get(self, session_id: str) -> Session:
+        """
+        Returns the session for `session_id`, reloading it if it was spilled
+        or creating it with a fresh game on first use.
+        """
+        with self._lock:
+            while session_id in self._busy:
+                self._file_done.wait()
+            expired = self._evict_expired()
+            session = self._sessions.get(session_id)
+            spilled = self._spilled.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_access = time.monotonic()
+                victims = []
+            elif spilled is None:
+                game = self._game_factory()
+                session = self._add(Session(session_id, game, self._estimate_game_bytes(game)))
+                victims = self._enforce_budget(keep=session)
+            else:
+                fingerprint, _, analytics = spilled
+                template = self._templates[fingerprint]
+                self._release_template(session_id)
+                self._busy.add(session_id)
+                path = self._path(session_id)
+        self._delete(expired)
+        if session is None:
+            start = time.perf_counter()
+            try:
+                session = self._reload(session_id, template, analytics, path)
+            except BaseException:
+                with self._lock:
+                    self._end_io(session_id)
+                raise
+            with self._lock:
+                self._end_io(session_id)
+                self._add(session)
+                self.reloads += 1
+                self._reload_seconds += time.perf_counter() - start
+                victims = self._enforce_budget(keep=session)
+        self._spill(victims)
+        return session
+
+    def _add(self, session: Session) -> Session:
+        """Puts a session in memory as the most recently used. The caller holds the store lock."""
+        session.checkpoints.on_resize = functools.partial(self._account, session)
+        session.last_access = time.monotonic()
+        self._sessions[session.session_id] = session
+        self.nbytes += session.nbytes
+        return session
+
+    def _end_io(self, session_id: str):
+        """Clears the busy mark of `session_id` and wakes requests waiting for it. The caller holds the store lock."""
+        self._busy.discard(session_id)
+        self._file_done.notify_all()
+
+    def _estimate_game_bytes(self, game: Game) -> int:
+        """Returns the estimated memory of one session's game, measured once per puzzle."""
+        size = self._game_bytes.get(game.fingerprint)
+        if size is None:
+            size = self._game_bytes[game.fingerprint] = estimate_copy_bytes(game)
+        return size
+
+    def _account(self, session: Session, delta: int):
+        with self._lock:
+            # Writers may still hold a session that has since been spilled.
+            if self._sessions.get(session.session_id) is session:
+                self.nbytes += delta
+
+    def _evict_expired(self) -> list[tuple[str, str]]:
+        """
+        Removes the sessions idle for longer than `session_ttl`. Returns the
+        IDs and spill files of the spilled ones, which stay busy until
+        `_delete` removes the files. The caller holds the store lock.
+        """
+        if self.session_ttl is None:
+            return []
+        cutoff = time.monotonic() - self.session_ttl
+        for session in list(itertools.takewhile(lambda s: s.last_access <= cutoff, self._sessions.values())):
+            # Skip sessions being spilled or with a writer in progress; the next call retries.
+            if session.session_id in self._busy or not session.lock.acquire(blocking=False):
+                continue
+            del self._sessions[session.session_id]
+            self.nbytes -= session.nbytes
+            session.lock.release()
+            self.evictions += 1
+        files = []
+        while self._spilled:
+            session_id, (_, last_access, _) = next(iter(self._spilled.items()))
+            if last_access > cutoff:
+                break
+            self._release_template(session_id)
+            self._busy.add(session_id)
+            files.append((session_id, self._path(session_id)))
+            self.evictions += 1
+        return files
+
+    def _delete(self, files: list[tuple[str, str]]):
+        """Deletes the spill files of removed sessions, outside the store lock."""
+        for session_id, path in files:
+            # The file may already be gone with the spill directory (see close).
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            with self._lock:
+                self._end_io(session_id)
+
+    def _enforce_budget(self, keep: Session) -> list[tuple[Session, str]]:
+        """
+        Picks the least recently used idle sessions to spill until the store
+        is within budget, never `keep`: the session being returned. Each is
+        returned with its spill file, marked busy and with its writer lock
+        held, for `_spill` to write out. The caller holds the store lock.
+        """
+        if self.memory_budget is None or self.nbytes <= self.memory_budget:
+            return []
+        cutoff = time.monotonic() - self.min_idle
+        excess = self.nbytes - self.memory_budget
+        victims = []
+        for session in self._sessions.values():
+            if excess <= 0 or session is keep or session.last_access > cutoff:
+                break
+            if session.session_id in self._busy:
+                # Already being spilled by another request.
+                excess -= session.nbytes
+            # Skip sessions with a writer in progress; the next call retries.
+            elif session.lock.acquire(blocking=False):
+                self._busy.add(session.session_id)
+                victims.append((session, self._path(session.session_id)))
+                excess -= session.nbytes
+        return victims
+
+    def _path(self, session_id: str) -> str:
+        if self._spill_path is None:
+            self._spill_path = tempfile.mkdtemp(prefix="bracket-city-sessions-", dir=self.spill_dir)
+        # Session IDs come from clients, so never use them as file names.
+        name = hashlib.blake2b(session_id.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self._spill_path, name)
+
+    def _spill(self, victims: list[tuple[Session, str]]):
+        """
+        Writes the sessions picked by `_enforce_budget` to disk, outside the
+        store lock, and drops them from memory. A session whose file cannot
+        be written stays in memory.
+        """
+        victims = iter(victims)
+        try:
+            for session, path in victims:
+                start = time.perf_counter()
+                written = False
+                try:
+                    data = self._dump(session)
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    written = True
+                except OSError:
+                    pass
+                finally:
+                    with self._lock:
+                        if written:
+                            self._detach(session, time.perf_counter() - start)
+                        self._end_io(session.session_id)
+                    session.lock.release()
+        finally:
+            # After an unexpected error, the remaining sessions stay in memory.
+            for session, _ in victims:
+                with self._lock:
+                    self._end_io(session.session_id)
+                session.lock.release()
+
+    def _dump(self, session: Session) -> bytes:
+        """Returns a session's state, pickled. The caller holds the session's lock."""
+        game = session.game
+        state = game.state
+        extra = self._on_spill(session) if self._on_spill is not None else None
+        return pickle.dumps((
+            _SPILL_FORMAT,
+            (state.completed_mask, state.incorrect_guesses, state.version),
+            session.checkpoints._next_id,
+            [(int(checkpoint_id[2:]), saved.completed_mask, saved.incorrect_guesses, saved.version)
+             for checkpoint_id, saved in session.checkpoints._checkpoints.items()],
+            extra,
+        ), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _detach(self, session: Session, seconds: float):
+        """Drops a session whose spill file was written from memory. The caller holds the store lock."""
+        fingerprint = session.game.fingerprint
+        # The spilled game itself serves as the puzzle's template: reloads
+        # only copy it, and rollback overwrites whatever state it is in.
+        self._templates.setdefault(fingerprint, session.game)
+        self._template_users[fingerprint] += 1
+        self._spilled[session.session_id] = (fingerprint, session.last_access, session.game.analytics)
+        del self._sessions[session.session_id]
+        self.nbytes -= session.nbytes
+        self.spills += 1
+        self._spill_seconds += seconds
+
+    def _reload(self, session_id: str, template: Game, analytics: ClueAnalytics, path: str) -> Session:
+        """
+        Reads a spilled session back from `path`, copying `template` and
+        reattaching the `analytics` kept in memory. Runs outside the store
+        lock, while the session is marked busy.
+
+        Raises:
+            OSError: If the spill file cannot be read. The session is
+                     forgotten, so its next request starts a fresh game.
+        """
+        with open(path, "rb") as f:
+            (_, (completed_mask, incorrect_guesses, version),
+             next_checkpoint_id, saved_checkpoints, extra) = pickle.load(f)
+        os.remove(path)
+
+        game = copy.deepcopy(template)
+        states: dict[int, frozenset[str]] = {}
+
+        def restore_state(mask: int, incorrect: int, state_version: int) -> GameState:
+            active = states.get(mask)
+            if active is None:
+                active = states[mask] = frozenset(game.active_clues_for_mask(mask))
+            return GameState(mask, active, incorrect, state_version)
+
+        game.incorrect_guesses = incorrect_guesses
+        game.rollback(restore_state(completed_mask, incorrect_guesses, version))
+        # Rollback publishes a new version; the game is not shared yet, so
+        # the saved snapshot can be republished as is.
+        game.state = restore_state(completed_mask, incorrect_guesses, version)
+        game.analytics = analytics
+
+        session = Session(session_id, game, self._estimate_game_bytes(game))
+        checkpoints = session.checkpoints
+        checkpoints._next_id = next_checkpoint_id
+        for number, mask, incorrect, state_version in saved_checkpoints:
+            checkpoint_id = f"cp{number}"
+            saved = checkpoints._checkpoints[checkpoint_id] = restore_state(mask, incorrect, state_version)
+            checkpoints.nbytes += _checkpoint_bytes(checkpoint_id, saved)
+        if self._on_reload is not None:
+            self._on_reload(session, extra)
+        return session
+
+    def _release_template(self, session_id: str):
+        fingerprint, _, _ = self._spilled.pop(session_id)
+        self._template_users[fingerprint] -= 1
+        if not self._template_users[fingerprint]:
+            del self._template_users[fingerprint]
+            del self._templates[fingerprint]
+
+    def remove(self, session_id: str) -> bool:
+        """Removes a session, in memory or spilled. Returns True if it existed."""
+        with self._lock:
+            while session_id in self._busy:
+                self._file_done.wait()
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self.nbytes -= session.nbytes
+                return True
+            if session_id not in self._spilled:
+                return False
+            self._release_template(session_id)
+            self._busy.add(session_id)
+            files = [(session_id, self._path(session_id))]
+        self._delete(files)
+        return True
+
+    def close(self):
+        """Deletes every spilled session and the spill directory."""
+        with self._lock:
+            if self._spill_path is not None:
+                shutil.rmtree(self._spill_path, ignore_errors=True)
+                self._spill_path = None
+            self._spilled.clear()
+            self._templates.clear()
+            self._template_users.clear()
+
+    def stats(self) -> dict:
+        """Returns session counts, estimated memory and spill/reload counters."""
+        with self._lock:
+            return {
+                "resident": len(self._sessions),
+                "spilled": len(self._spilled),
+                "bytes": self.nbytes,
+                "memory_budget": self.memory_budget,
+                "spills": self.spills,
+                "reloads": self.reloads,
+                "session_ttl": self.session_ttl,
+                "evictions": self.evictions,
+                "mean_spill_ms": round(1000 * self._spill_seconds / self.spills, 3) if self.spills else None,
+                "mean_reload_ms": round(1000 * self._reload_seconds / self.reloads, 3) if self.reloads else None,
+            }
+
+    def __iter__(self) -> Iterator[Session]:
+        """Iterates over a snapshot of the sessions in memory; spilled sessions are not reloaded."""
+        with self._lock:
+            return iter(list(self._sessions.values()))
+
+    def analytics(self) -> list[tuple[bytes, ClueAnalytics]]:
+        """
+        Returns the puzzle fingerprint and per-clue analytics of every
+        session, in memory or spilled, without reloading spilled sessions.
+        """
+        with self._lock:
+            return ([(session.game.fingerprint, session.game.analytics) for session in self._sessions.values()]
+                    + [(fingerprint, analytics) for fingerprint, _, analytics in self._spilled.values()])
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions or session_id in self._spilled
+
+    def __len__(self) -> int:
+        return len(self._sessions) + len(self._spilled)
@@ -0,0 +1,109 @@
+import base64
+import hashlib
+import hmac
+import struct
+from typing import NamedTuple
+
+from bracket_city_mcp.game.game import Game
+
+TOKEN_FORMAT_VERSION = 1
+# Bytes of the game fingerprint and of the HMAC kept in each token.
+FINGERPRINT_BYTES = 8
+SIGNATURE_BYTES = 16
+
+
+class InvalidStateToken(ValueError):
+    """Raised when a state token is malformed, forged or for another puzzle."""
+
+
+class TokenState(NamedTuple):
+    completed_mask: int
+    incorrect_guesses: int
+
+
+class StateTokenCodec:
+    def __init__(self, secret: bytes):
+        """
+        Initializes a StateTokenCodec, which turns a game's play state into a
+        compact signed string and back.
+
+        A token holds the format version, the game ID, the first bytes of the
+        game fingerprint (its version), the incorrect guess count, the
+        completed-clue bitset and a truncated HMAC-SHA256 over all of these.
+        Any process sharing `secret` can verify and decode it.
+
+        Args:
+            secret: The HMAC key.
+        """
+        self._secret = secret
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+    def encode(self, game: Game, state: TokenState) -> str:
+        """Returns the signed token for `state` in `game`."""
+        game_id = game.game_id.encode("utf-8")[:255]
+        bitset_length = (len(game.clue_ids) + 7) // 8
+        payload = (
+            struct.pack(">BB", TOKEN_FORMAT_VERSION, len(game_id))
+            + game_id
+            + game.fingerprint[:FINGERPRINT_BYTES]
+            + struct.pack(">I", state.incorrect_guesses)
+            + state.completed_mask.to_bytes(bitset_length, "little")
+        )
+        token = payload + self._sign(payload)
+        return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+    def _parse(self, token: str) -> tuple[str, bytes, bytes]:
+        """
+        Verifies a token's signature and format. Returns its game ID, its
+        fingerprint prefix and the rest of the payload (the incorrect guess
+        count and the bitset).
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (ValueError, TypeError):
+            raise InvalidStateToken("Malformed state token.")
+        if len(raw) < 2 + SIGNATURE_BYTES:
+            raise InvalidStateToken("Malformed state token.")
+        payload, signature = raw[:-SIGNATURE_BYTES], raw[-SIGNATURE_BYTES:]
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidStateToken("State token signature is invalid.")
+
+        format_version, game_id_length = struct.unpack_from(">BB", payload)
+        if format_version != TOKEN_FORMAT_VERSION:
+            raise InvalidStateToken(f"Unsupported state token version {format_version}.")
+        offset = 2 + game_id_length
+        game_id = payload[2:offset].decode("utf-8", errors="replace")
+        fingerprint = payload[offset:offset + FINGERPRINT_BYTES]
+        return game_id, fingerprint, payload[offset + FINGERPRINT_BYTES:]
+
+    def fingerprint_of(self, token: str) -> bytes:
+        """
+        Returns the puzzle fingerprint prefix (the first FINGERPRINT_BYTES of
+        `Game.fingerprint`) of a verified token, to find the puzzle it
+        belongs to.
+
+        Raises:
+            InvalidStateToken: If the token is malformed or its signature
+                               does not match.
+        """
+        return self._parse(token)[1]
+
+    def decode(self, game: Game, token: str) -> TokenState:
+        """
+        Verifies a token and returns the state it encodes.
+
+        Raises:
+            InvalidStateToken: If the token is malformed, its signature does
+                               not match, or it was issued for a different
+                               puzzle or puzzle version.
+        """
+        game_id, fingerprint, rest = self._parse(token)
+        if game_id != game.game_id[:255] or fingerprint != game.fingerprint[:FINGERPRINT_BYTES]:
+            raise InvalidStateToken("State token is for a different puzzle or puzzle version.")
+        bitset = rest[4:]
+        if len(rest) < 4 or len(bitset) != (len(game.clue_ids) + 7) // 8:
+            raise InvalidStateToken("Malformed state token.")
+        (incorrect_guesses,) = struct.unpack_from(">I", rest)
+        return TokenState(int.from_bytes(bitset, "little"), incorrect_guesses)
@@ -0,0 +1,93 @@
+import threading
+
+import anyio
+import pytest
+
+from bracket_city_mcp.admission import (
+    AdaptiveConcurrencyLimiter,
+    AdmissionController,
+    RateLimiter,
+    TokenBucket,
+)
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=2.0, burst=2.0, now=0.0)
+    assert bucket.try_acquire(0.0) == 0.0
+    assert bucket.try_acquire(0.0) == 0.0
+    assert bucket.try_acquire(0.0) == pytest.approx(0.5)
+    assert bucket.try_acquire(0.5) == 0.0
+
+def test_token_bucket_charges_cost_as_debt():
+    bucket = TokenBucket(rate=1.0, burst=10.0, now=0.0)
+    assert bucket.try_acquire(0.0, cost=25) == 0.0
+    # 15 tokens in debt: the next call waits for 16 tokens to refill.
+    assert bucket.try_acquire(0.0) == pytest.approx(16.0)
+    assert bucket.try_acquire(15.0) == pytest.approx(1.0)
+    assert bucket.try_acquire(16.0) == 0.0
+
+def test_rate_limiter_is_per_session_and_tool():
+    limiter = RateLimiter(rate=0.001, burst=2)
+    assert not limiter.check("a", "answer_clue")
+    assert not limiter.check("a", "answer_clue")
+    assert limiter.check("a", "answer_clue") > 0
+    assert not limiter.check("a", "search_clues")
+    assert not limiter.check("b", "answer_clue")
+    assert not RateLimiter().check("a", "answer_clue")  # Disabled by default.
+
+def test_concurrency_limit_adapts_to_latency():
+    limiter = AdaptiveConcurrencyLimiter(target_latency=0.1, initial_limit=4, min_limit=1)
+    assert all(limiter.try_acquire() for _ in range(4))
+    assert not limiter.try_acquire()
+    for _ in range(4):
+        limiter.release(1.0)
+    assert int(limiter.limit) == 2
+    for _ in range(100):
+        assert limiter.try_acquire()
+        limiter.release(0.01)
+    assert limiter.limit > 4
+
+async def test_guard_rejects_over_rate_and_counts():
+    controller = AdmissionController(RateLimiter(rate=0.001, burst=1))
+    guarded = controller.guard("echo", lambda value: {"value": value}, lambda: "session")
+    assert await guarded(value=1) == {"value": 1}
+    rejected = await guarded(value=2)
+    assert rejected["error"] == "rate_limited"
+    assert rejected["retry_after"] > 0
+    stats = controller.stats()
+    assert (stats["admitted"], stats["rate_limited"], stats["shed"]) == (1, 1, 0)
+
+async def test_guard_charges_batches_per_item_on_shared_key():
+    controller = AdmissionController(RateLimiter(rate=0.001, burst=5))
+    single = controller.guard("answer_clue", lambda answer: {"answer": answer}, lambda: "session")
+    batch = controller.guard("answer_batch", lambda answers: {"answers": answers}, lambda: "session",
+                             rate_key="answer_clue", cost=lambda answers: len(answers))
+    assert await single(answer="a") == {"answer": "a"}
+    assert await batch(answers=["b"] * 4) == {"answers": ["b"] * 4}
+    # The batch used the remaining four answer_clue tokens.
+    assert (await single(answer="c"))["error"] == "rate_limited"
+    assert (await batch(answers=["d"]))["error"] == "rate_limited"
+
+async def test_guard_sheds_load_when_slow():
+    release = threading.Event()
+
+    def slow():
+        release.wait(timeout=5)
+        return {"ok": True}
+
+    controller = AdmissionController(concurrency_limiter=AdaptiveConcurrencyLimiter(
+        target_latency=0.05, initial_limit=1))
+    guarded = controller.guard("slow", slow, lambda: None)
+    results = []
+
+    async def call():
+        results.append(await guarded())
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(call)
+        await anyio.sleep(0.05)  # Let the first call start in its thread.
+        shed = await guarded()
+        release.set()
+    assert shed["error"] == "overloaded"
+    assert results == [{"ok": True}]
+    assert controller.stats()["shed"] == 1
@@ -0,0 +1,63 @@
+import math
+import os
+
+import pytest
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.game.analytics import ClueAnalytics, aggregate_clue_stats
+
+VALID_GAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "valid_single_end_clue_game.json")
+
+
+def test_answers_are_recorded():
+    game = Game.from_json_file(VALID_GAME)
+    analytics = game.analytics
+    s1, m1 = game.clue_index["#S1#"], game.clue_index["#M1#"]
+    assert not math.isnan(analytics.revealed_at[s1])
+    assert math.isnan(analytics.revealed_at[m1])
+
+    game.answer_clue("#S1#", "nope")
+    game.answer_clue("#S1#", "A1")
+    assert analytics.wrong_attempts[s1] == 1
+    assert analytics.solved_at[s1] >= analytics.revealed_at[s1]
+    assert not math.isnan(analytics.revealed_at[m1])
+
+    game.reset()
+    assert game.analytics.wrong_attempts[s1] == 0
+    assert not game.analytics.attempted
+
+def test_aggregate_across_games():
+    np = pytest.importorskip("numpy")
+    clue_ids = ["#A#", "#B#"]
+    first, second, third = ClueAnalytics(2), ClueAnalytics(2), ClueAnalytics(2)
+    for analytics in (first, second, third):
+        analytics.record_reveal(0, 10.0)
+    first.record_attempt(0, False, 11.0)
+    first.record_attempt(0, True, 12.0)
+    first.record_reveal(1, 12.0)
+    second.record_attempt(0, True, 14.0)
+    third.record_attempt(0, False, 15.0)  # Abandoned with #A# unsolved.
+
+    stats = aggregate_clue_stats(clue_ids, [first, second, third])
+    assert stats["games"] == 3
+    a = stats["clues"]["#A#"]
+    assert (a["revealed"], a["solved"], a["abandoned"]) == (3, 2, 1)
+    assert a["wrong_attempts"] == 0.5
+    assert a["solve_seconds"]["mean"] == pytest.approx(3.0)
+    assert a["solve_seconds"]["p50"] == pytest.approx(3.0)
+    b = stats["clues"]["#B#"]
+    assert (b["revealed"], b["solved"], b["abandoned"]) == (1, 0, 1)
+    assert b["wrong_attempts"] is None and b["solve_seconds"] is None
+
+def test_aggregate_with_no_games():
+    pytest.importorskip("numpy")
+    stats = aggregate_clue_stats(["#A#"], [])
+    assert stats["games"] == 0
+    assert stats["clues"]["#A#"]["revealed"] == 0
+
+def test_started_at_is_first_reveal():
+    analytics = ClueAnalytics(3)
+    assert math.isnan(analytics.started_at)
+    analytics.record_reveal(1, 20.0)
+    analytics.record_reveal(0, 10.0)
+    assert analytics.started_at == 10.0
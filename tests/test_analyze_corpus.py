@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# scripts/ is not a package, so make analyze_corpus importable directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from analyze_corpus import _find_puzzles, analyze_puzzle, build_report
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_analyze_valid_puzzle():
+    result = analyze_puzzle(os.path.join(DATA_DIR, "test_game.json"))
+    assert result["errors"] == []
+    assert result["clues"] == 3
+    assert result["max_depth"] == 3
+    assert result["max_fan_in"] == 1
+    assert result["end_clues"] == 1
+    assert result["rendered_length"] > 0
+
+def test_analyze_reports_structural_problems(tmp_path):
+    multiple_ends = analyze_puzzle(os.path.join(DATA_DIR, "invalid_multiple_end_clues_game.json"))
+    assert multiple_ends["end_clues"] == 3
+    assert "exactly one end clue" in multiple_ends["errors"][0]
+
+    cyclic_path = tmp_path / "cyclic.json"
+    cyclic_path.write_text(json.dumps({"clues": {
+        "#A#": {"clue": "a #B#", "depends_on": ["#B#"]},
+        "#B#": {"clue": "b #A#", "depends_on": ["#A#"]},
+        "#C#": {"clue": "c #A#", "depends_on": ["#A#"]},
+    }}))
+    cyclic = analyze_puzzle(str(cyclic_path))
+    assert cyclic["max_depth"] is None
+    assert "Dependency graph contains a cycle." in cyclic["errors"]
+
+def test_build_report_aggregates_metrics():
+    results = [
+        analyze_puzzle(os.path.join(DATA_DIR, "test_game.json")),
+        analyze_puzzle(os.path.join(DATA_DIR, "valid_single_end_clue_game.json")),
+        analyze_puzzle(os.path.join(DATA_DIR, "does_not_exist.json")),
+    ]
+    report = build_report(results, top=1)
+    assert report["summary"]["clues"]["count"] == 2
+    assert report["summary"]["clues"]["min"] == 3
+    assert report["summary"]["clues"]["max"] == 4
+    assert report["summary"]["clues"]["p50"] == 3.5
+    assert report["worst"]["clues"] == [{"file": results[1]["file"], "value": 4.0}]
+    assert [entry["file"] for entry in report["invalid"]] == [results[2]["file"]]
+
+def test_dangling_dependency_does_not_stop_the_report(tmp_path):
+    (tmp_path / "dangling.json").write_text(json.dumps({"clues": {
+        "A": {"clue": "x B y", "depends_on": ["B"]},
+    }}))
+    (tmp_path / "valid.json").write_text(open(os.path.join(DATA_DIR, "test_game.json")).read())
+    results = [analyze_puzzle(path) for path in _find_puzzles(str(tmp_path))]
+    dangling = results[0]
+    assert dangling["missing_dependencies"] == 1
+    assert dangling["rendered_length"] is None
+    assert "1 dependencies refer to clues that do not exist." in dangling["errors"]
+    report = build_report(results)
+    assert [entry["file"] for entry in report["invalid"]] == [dangling["file"]]
+    assert report["summary"]["rendered_length"]["count"] == 1
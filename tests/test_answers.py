@@ -0,0 +1,85 @@
+import copy
+
+from bracket_city_mcp.game.answers import AnswerMatcher, AnswerNormalizer, _within_distance
+from bracket_city_mcp.game.clue import Clue
+
+
+def test_normalizer_folds_case_unicode_punctuation_and_spacing():
+    normalize = AnswerNormalizer()
+    assert normalize("  Ice   Cream ") == normalize("ice cream")
+    assert normalize("Well-Known") == normalize("well known")
+    assert normalize("ＣＡＦÉ") == normalize("café")
+    assert normalize("STRASSE") == normalize("straße")
+
+def test_whitespace_folding_is_opt_in():
+    # Ignoring spaces would make existing puzzles accept answers they rejected.
+    assert AnswerNormalizer()("ice cream") != AnswerNormalizer()("icecream")
+    assert not Clue("#C1#", "text", "ice cream", []).check_answer("icecream")
+    folding = AnswerNormalizer(fold_whitespace=True)
+    assert folding("ice cream") == folding("icecream")
+    assert Clue("#C1#", "text", "ice cream", [], normalizer=folding).check_answer("IceCream")
+
+def test_normalizer_options_can_be_disabled():
+    normalize = AnswerNormalizer(fold_punctuation=False)
+    assert normalize("  ice   cream ") == "ice cream"
+    assert normalize("well-known") != normalize("well known")
+
+def test_alternates_are_accepted():
+    clue = Clue("#C1#", "text", "color", [], alternates=["colour"])
+    assert clue.check_answer("Colour")
+    assert clue.check_answer("color")
+    assert not clue.check_answer("colr")
+
+def test_near_misses():
+    matcher = AnswerMatcher(["lighthouse"])
+    assert matcher.is_close("lighthouses")   # plural
+    assert matcher.is_close("lihgthouse")    # transposition
+    assert matcher.is_close("ligthouze")     # two edits
+    assert not matcher.is_close("lighthouse")  # exact is a match, not a near miss
+    assert not matcher.is_close("warehouse")
+
+def test_near_miss_index_is_built_on_first_wrong_guess():
+    matcher = AnswerMatcher(["lighthouse"])
+    assert matcher._near_misses is None
+    assert matcher.matches("Lighthouse")
+    assert matcher._near_misses is None
+    assert matcher.is_close("lighthouses")
+    near_misses = matcher._near_misses
+    assert near_misses is not None
+    assert not matcher.is_close("warehouse")
+    assert matcher._near_misses is near_misses
+
+def test_rebuild_matcher_applies_new_alternates_and_normalizer():
+    clue = Clue("#C1#", "text", "grey", [])
+    clue.alternates.append("gray")
+    assert not clue.check_answer("gray")
+    clue.rebuild_matcher()
+    assert clue.check_answer("gray")
+    clue.normalizer = AnswerNormalizer(casefold=False)
+    clue.rebuild_matcher()
+    assert not clue.check_answer("Grey") and clue.check_answer("grey")
+
+def test_short_answers_have_no_near_misses():
+    matcher = AnswerMatcher(["cat"])
+    assert not matcher.is_close("car")
+    assert AnswerMatcher(["cats"]).is_close("cat")
+
+def test_index_agrees_with_direct_distance():
+    words = ["river", "rivers", "driver", "rover", "riverbed", "liver", "rvier", "ri", "x" * 9]
+    matcher = AnswerMatcher(["river"], max_distance=1)
+    for word in words:
+        expected = word != "river" and _within_distance(word, "river", 1)
+        assert matcher.is_close(word) == expected, word
+
+def test_end_clue_is_never_close():
+    clue = Clue("#E#", "text", "", [], is_end_clue=True)
+    assert not clue.is_near_miss("anything")
+
+def test_matcher_stays_small():
+    matcher = AnswerMatcher(["Grey", "grey", "gray"])
+    assert matcher.accepted == ("grey", "gray")
+    assert not hasattr(matcher, "__dict__")
+
+def test_deepcopy_shares_matcher():
+    clue = Clue("#C1#", "text", "answer", [])
+    assert copy.deepcopy(clue).matcher is clue.matcher
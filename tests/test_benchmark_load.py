@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+# scripts/ is not a package, so make benchmark_load importable directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from benchmark_load import SHAPES, generate_puzzle, measure
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.game import loader
+
+BACKENDS = ["stdlib"] + (["ijson"] if loader.ijson is not None else [])
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_generated_puzzle_is_playable(tmp_path, shape):
+    path = str(tmp_path / "puzzle.json")
+    generate_puzzle(path, 50, shape)
+    game = Game.from_json_file(path)
+    assert len(game.clues) == 50
+    assert len(game.end_clues) == 1
+    for clue_id, clue in game.clues.items():
+        for dependency_id in clue.depends_on:
+            assert dependency_id in clue.clue_text
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_measure_loads_with_each_backend(tmp_path, backend):
+    path = str(tmp_path / "puzzle.json")
+    generate_puzzle(path, 200, "wide")
+    result = measure(path, backend)
+    assert result["backend"] == backend
+    assert result["clues"] == 200
+    assert result["seconds"] > 0 and result["peak_rss_mb"] > 0
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import CallToolResult, TextContent
+
+from bracket_city_mcp import main
+from bracket_city_mcp.client import ServerError, SessionPool, _unwrap
+from bracket_city_mcp.game import Game
+
+PUZZLE = "games/json/20250110.json"
+
+
+def memory_pool(**kwargs) -> SessionPool:
+    return SessionPool(connect=lambda: create_connected_server_and_client_session(main.mcp._mcp_server), **kwargs)
+
+
+def answer_for(clue_id: str) -> str:
+    return Game.from_json_file(PUZZLE).clues[clue_id].answer
+
+
+async def test_play_games_concurrently():
+    async with memory_pool(size=2) as pool:
+        assert pool.supports_batch
+        games = [await pool.new_game() for _ in range(3)]
+        first_clue = games[0].available_clues[0]
+        results = await pool.pipeline([
+            ("answer_clue", {"clue_id": first_clue, "answer": answer_for(first_clue), "state": game.state})
+            for game in games
+        ])
+        assert all(result["correct"] for result in results)
+
+        game = games[0]
+        response = await game.answer(first_clue, answer_for(first_clue))
+        assert response["correct"]
+        assert first_clue not in game.available_clues
+        assert answer_for(first_clue) in await game.text()
+
+async def test_answer_many_plays_a_whole_game():
+    reference = Game.from_json_file(PUZZLE)
+    async with memory_pool(size=1) as pool:
+        game = await pool.new_game()
+        while not game.completed:
+            batch = [(clue_id, reference.clues[clue_id].answer)
+                     for clue_id in game.available_clues if not reference.clues[clue_id].is_end_clue]
+            responses = await game.answer_many(batch)
+            assert len(responses) == len(batch)
+        assert game.score == len(reference.clues)
+        # One start_game, then one call per batch.
+        assert pool.calls < len(reference.clues)
+
+async def test_answer_many_without_batch_tool():
+    async with memory_pool(size=1) as pool:
+        pool.tools.discard("answer_batch")
+        game = await pool.new_game()
+        clue_id = game.available_clues[0]
+        responses = await game.answer_many([(clue_id, "wrong"), (clue_id, answer_for(clue_id))])
+        assert [response["correct"] for response in responses] == [False, True]
+
+class FakeSession:
+    """Answers like an overloaded server for the first `rejections` calls."""
+
+    def __init__(self, rejections: int):
+        self.rejections = rejections
+
+    async def call_tool(self, name, arguments):
+        if self.rejections:
+            self.rejections -= 1
+            value = {"error": "overloaded", "message": "Busy.", "retry_after": 0.001}
+        else:
+            value = {"ok": True}
+        return CallToolResult(content=[TextContent(type="text", text=json.dumps(value))],
+                              structuredContent={"result": value})
+
+async def test_rejected_calls_are_retried():
+    import anyio
+
+    pool = SessionPool(url="unused", max_retries=2)
+    pool._sessions = [(FakeSession(rejections=2), anyio.Semaphore(1))]
+    assert await pool.call("health") == {"ok": True}
+    assert pool.retries == 2
+
+    pool._sessions = [(FakeSession(rejections=3), anyio.Semaphore(1))]
+    with pytest.raises(ServerError, match="Busy."):
+        await pool.call("health")
+
+def test_unwrap():
+    assert _unwrap(CallToolResult(content=[TextContent(type="text", text="OK")], structuredContent={"result": "OK"})) == "OK"
+    assert _unwrap(CallToolResult(content=[TextContent(type="text", text='{"a": 1}')])) == {"a": 1}
+    assert _unwrap(CallToolResult(content=[TextContent(type="text", text="plain")])) == "plain"
+    with pytest.raises(ServerError, match="bad"):
+        _unwrap(CallToolResult(content=[TextContent(type="text", text="bad")], isError=True))
+
+def test_pool_needs_a_server():
+    with pytest.raises(ValueError):
+        SessionPool()
@@ -229,3 +229,12 @@ def test_end_clue_get_rendered_text_resolves_dependencies():
 
     # Reset for safety if other tests use these instances, though pytest usually isolates.
     end_clue.completed = False
+
+def test_puzzles_share_ids_and_answers():
+    first = Game.from_json_file("tests/data/valid_single_end_clue_game.json")
+    second = Game.from_json_file("tests/data/valid_single_end_clue_game.json")
+    clue, other = first.clues["#M1#"], second.clues["#M1#"]
+    assert clue.clue_id is other.clue_id
+    assert clue.answer is other.answer
+    assert clue.depends_on[0] is other.depends_on[0]
+    assert clue.matcher.accepted[0] is other.matcher.accepted[0]
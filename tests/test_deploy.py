@@ -0,0 +1,75 @@
+import httpx
+import pytest
+from starlette.testclient import TestClient
+
+from bracket_city_mcp.deploy import (
+    CLIENT_HEADER,
+    create_router_app,
+    decode_session_id,
+    encode_session_id,
+    parse_args,
+)
+
+
+def test_session_id_round_trip():
+    assert decode_session_id(encode_session_id(3, "abc-def"), 4) == (3, "abc-def")
+
+def test_foreign_session_id_routed_by_stable_hash():
+    index, worker_session_id = decode_session_id("not-minted-by-router", 4)
+    assert worker_session_id == "not-minted-by-router"
+    assert 0 <= index < 4
+    assert decode_session_id("not-minted-by-router", 4)[0] == index
+    # An embedded index that is out of range is treated as foreign.
+    assert decode_session_id("w9-abc", 4)[1] == "w9-abc"
+
+def test_parse_args_validates_worker_transport():
+    args = parse_args(["--workers", "4", "--port", "9000"])
+    assert args.worker_base_port == 9001
+    with pytest.raises(SystemExit):
+        parse_args(["--workers", "2", "--transport", "stdio"])
+    assert parse_args([]).prerender_workers == 0
+    with pytest.raises(SystemExit):
+        parse_args(["--prerender-workers", "-1"])
+    with pytest.raises(SystemExit):
+        parse_args(["--max-concurrency", "0"])
+    assert parse_args(["--rotate-daily", "--rotation-timezone", "UTC"]).prewarm_minutes == 10
+    with pytest.raises(SystemExit):
+        parse_args(["--rotation-timezone", "Mars/Olympus_Mons"])
+    assert parse_args(["--session-memory-mb", "512"]).session_memory_mb == 512
+    with pytest.raises(SystemExit):
+        parse_args(["--session-memory-mb", "0"])
+    assert parse_args([]).session_ttl_minutes == 24 * 60
+    with pytest.raises(SystemExit):
+        parse_args(["--session-ttl-minutes", "0"])
+
+def test_router_keeps_sessions_on_their_worker():
+    seen = []
+    clients = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.port, request.headers.get("mcp-session-id")))
+        clients.append(request.headers.get(CLIENT_HEADER))
+        headers = {}
+        if "mcp-session-id" not in request.headers:
+            headers["mcp-session-id"] = f"session-on-{request.url.port}"
+        body = f"worker {request.url.port}".encode()
+        return httpx.Response(200, headers=headers, stream=httpx.ByteStream(body))
+
+    app = create_router_app(
+        ["http://127.0.0.1:9001", "http://127.0.0.1:9002"],
+        transport=httpx.MockTransport(handler),
+    )
+    with TestClient(app) as client:
+        first = client.post("/mcp", content=b"{}")
+        second = client.post("/mcp", content=b"{}")
+        assert first.headers["mcp-session-id"] == "w0-session-on-9001"
+        assert second.headers["mcp-session-id"] == "w1-session-on-9002"
+
+        follow_up = client.post("/mcp", content=b"{}", headers={
+            "mcp-session-id": "w1-session-on-9002", CLIENT_HEADER: "203.0.113.7",
+        })
+        assert follow_up.text == "worker 9002"
+
+    assert seen[-1] == (9002, "session-on-9002")
+    # Workers see the client's address, never one the client claims.
+    assert clients == ["testclient"] * 3
@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+
+import pytest
+
+# scripts/ is not a package, so make fuzz_engines importable directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from fuzz_engines import ENGINES, MaskEngine, find_divergence, fuzz, load_engine, random_puzzle, random_steps
+
+from bracket_city_mcp.game import Game
+
+
+class UncountedWrongAnswers(MaskEngine):
+    """Deliberately wrong: forgets wrong answers to clues with the answer 'pig'."""
+
+    def answer(self, clue_id, answer):
+        result = super().answer(clue_id, answer)
+        clue = self.game.clues.get(clue_id)
+        if not result and clue is not None and clue.answer == "pig" and clue_id in self.game.active_clues_for_mask(self.completed_mask):
+            self.incorrect_guesses -= 1
+        return result
+
+
+def test_generated_puzzles_are_valid():
+    rng = random.Random(1)
+    for _ in range(50):
+        game_data = random_puzzle(rng, 15)
+        game = Game(game_data)
+        assert game.end_clues == ["#END#"]
+        assert len(random_steps(game_data, rng, 10)) == 10
+
+@pytest.mark.parametrize("name", sorted(ENGINES))
+def test_builtin_engines_match_reference(name):
+    assert fuzz(ENGINES[name], cases=40, seed=5) is None
+
+def test_failures_are_shrunk():
+    failure = fuzz(UncountedWrongAnswers, cases=100, seed=2)
+    assert failure is not None
+    assert failure["divergence"]["field"] == "incorrect_guesses"
+    # One wrongly answered clue, plus the end clue, is all it takes.
+    assert len(failure["steps"]) == 1
+    assert len(failure["game"]["clues"]) == 2
+    assert find_divergence(failure["game"], failure["steps"], UncountedWrongAnswers) is not None
+
+def test_exceptions_are_divergences():
+    class Crashes(MaskEngine):
+        def answer(self, clue_id, answer):
+            raise RuntimeError("boom")
+
+    divergence = find_divergence({"clues": {"#A#": {"clue": "a", "answer": "x", "depends_on": []}}},
+                                 [("#A#", "x")], Crashes)
+    assert (divergence["step"], divergence["field"]) == (1, "exception")
+    assert divergence["actual"] == "RuntimeError: boom"
+
+def test_load_engine():
+    assert load_engine("mask") is MaskEngine
+    assert load_engine("fuzz_engines:MaskEngine") is MaskEngine
+    with pytest.raises(ValueError):
+        load_engine("nonsense")
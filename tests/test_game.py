@@ -371,3 +371,177 @@ def test_get_rendered_game_text_complex_dependencies():
     # Hypothetically, if the end clue *was* completed
     end_clue.completed = True
     assert game.get_rendered_game_text() == "" # It would render its answer (empty string)
+
+# --- Tests for bitmask state helpers ---
+
+def test_mask_helpers_match_live_state(valid_game: Game):
+    assert valid_game.completed_mask() == 0
+    assert set(valid_game.active_clues_for_mask(0)) == valid_game.active_clues
+
+    valid_game.answer_clue("#S1#", "A1")
+    mask = valid_game.completed_mask()
+    assert valid_game.completed_ids(mask) == {"#S1#"}
+    assert set(valid_game.active_clues_for_mask(mask)) == valid_game.active_clues
+    assert valid_game.render_clue_text_for_mask("#E1#", mask) == valid_game.get_rendered_game_text()
+    # Rendering another state does not touch the live game.
+    assert valid_game.render_clue_text_for_mask("#S1#", 0) == valid_game.clues["#S1#"].clue_text
+    assert valid_game.clues["#S1#"].completed
+
+def test_mask_helpers_agree_with_dependencies_on_every_state(valid_game: Game):
+    n = len(valid_game.clue_ids)
+    for mask in range(1 << n):
+        flags = valid_game.completion_flags(mask)
+        assert len(flags) == n and valid_game.mask_from_flags(flags) == mask
+        expected = [
+            clue_id for i, clue_id in enumerate(valid_game.clue_ids)
+            if not mask >> i & 1
+            and all(mask >> valid_game.clue_index[d] & 1 for d in valid_game.rev_adj[clue_id])
+        ]
+        assert valid_game.active_clues_for_mask(mask) == expected
+        assert [c for c in valid_game.clue_ids if valid_game.is_available(c, mask)] == expected
+
+def test_dependency_indices_are_linear_in_edges(valid_game: Game):
+    edges = sum(len(valid_game.rev_adj[clue_id]) for clue_id in valid_game.clue_ids)
+    assert len(valid_game.dependency_indices) == len(valid_game.dependent_indices) == edges
+    for i, clue_id in enumerate(valid_game.clue_ids):
+        dependencies = valid_game.dependency_indices[valid_game.dependency_offsets[i]:valid_game.dependency_offsets[i + 1]]
+        assert [valid_game.clue_ids[d] for d in dependencies] == valid_game.rev_adj[clue_id]
+
+def test_is_complete_mask(valid_game: Game):
+    non_end_mask = valid_game.all_clues_mask & ~valid_game.end_clue_mask
+    assert valid_game.is_complete_mask(non_end_mask)
+    assert not valid_game.is_complete_mask(0)
+
+def test_fingerprint_identifies_puzzle_version(valid_game_json_path: str):
+    first = Game.from_json_file(valid_game_json_path)
+    second = Game.from_json_file(valid_game_json_path)
+    assert first.fingerprint == second.fingerprint
+    assert first.game_id == "valid_single_end_clue_game"
+    second.clues["#S1#"].answer = "changed"
+    second._fingerprint = None
+    assert first.fingerprint != second.fingerprint
+
+# --- Tests for published state snapshots ---
+
+def test_answer_publishes_new_snapshot(valid_game: Game):
+    before = valid_game.state
+    text_before = valid_game.render_state(before)
+
+    assert valid_game.answer_clue("#S1#", "A1")
+    after = valid_game.state
+    assert after is not before
+    assert after.version == before.version + 1
+    assert after.active_clues == frozenset(valid_game.active_clues)
+    assert valid_game.completed_ids(after.completed_mask) == {"#S1#"}
+    assert valid_game.render_state(after) == valid_game.get_rendered_game_text()
+
+    # The old snapshot is unchanged and still renders the old state.
+    assert valid_game.completed_ids(before.completed_mask) == set()
+    assert valid_game.render_state(before) == text_before
+
+    valid_game.answer_clue("#S2#", "wrong")
+    assert valid_game.state.incorrect_guesses == 1
+    valid_game.reset()
+    assert valid_game.state.completed_mask == 0
+    assert valid_game.state.active_clues == frozenset(valid_game.start_clues)
+
+def test_snapshots_are_consistent_under_concurrent_writes(valid_game: Game):
+    import threading
+
+    answers = {"#S1#": "A1", "#S2#": "A2", "#M1#": "A3"}
+    stop = threading.Event()
+    failures = []
+
+    def read():
+        while not stop.is_set():
+            state = valid_game.state
+            expected = frozenset(valid_game.active_clues_for_mask(state.completed_mask))
+            if state.active_clues != expected:
+                failures.append(state)
+            valid_game.render_state(state)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for _ in range(200):
+            for clue_id, answer in answers.items():
+                valid_game.answer_clue(clue_id, answer)
+            valid_game.reset()
+    finally:
+        stop.set()
+        reader.join()
+    assert failures == []
+
+# --- Tests for checkpoints ---
+
+def test_rollback_restores_checkpointed_state(valid_game: Game):
+    start = valid_game.checkpoint()
+    valid_game.answer_clue("#S1#", "A1")
+    after_s1 = valid_game.checkpoint()
+    valid_game.answer_clue("#M1#", "wrong")
+    valid_game.answer_clue("#M1#", "A3")
+    assert valid_game.active_clues == {"#S2#"}
+
+    valid_game.rollback(after_s1)
+    assert valid_game.active_clues == {"#S2#", "#M1#"}
+    assert not valid_game.clues["#M1#"].completed
+    assert valid_game.clues["#S1#"].completed
+    assert valid_game.state.completed_mask == after_s1.completed_mask
+    assert valid_game.state.version > after_s1.version
+
+    # Branch: a different order from the same checkpoint.
+    assert valid_game.answer_clue("#S2#", "A2")
+    valid_game.rollback(start)
+    assert valid_game.active_clues == {"#S1#", "#S2#"}
+    assert not any(clue.completed for clue in valid_game.clues.values())
+    assert valid_game.get_rendered_game_text() == valid_game.render_state(start)
+
+def test_rollback_keeps_incorrect_guesses(valid_game: Game):
+    start = valid_game.checkpoint()
+    valid_game.answer_clue("#S1#", "wrong")
+    valid_game.answer_any("wrong")
+    assert valid_game.incorrect_guesses == 2
+
+    # Wrong guesses on an abandoned branch still count.
+    valid_game.rollback(start)
+    assert valid_game.incorrect_guesses == valid_game.state.incorrect_guesses == 2
+    assert start.incorrect_guesses == 0
+    valid_game.answer_clue("#S1#", "wrong")
+    valid_game.rollback(start)
+    assert valid_game.incorrect_guesses == 3
+
+def test_rollback_rejects_foreign_checkpoint(valid_game: Game):
+    foreign = valid_game.state._replace(completed_mask=1 << len(valid_game.clues))
+    with pytest.raises(ValueError):
+        valid_game.rollback(foreign)
+
+# --- Tests for answer_any ---
+
+DUPLICATE_ANSWERS_GAME = {
+    "clues": {
+        "#A#": {"clue": "a", "answer": "pig", "depends_on": []},
+        "#B#": {"clue": "b", "answer": "Pig", "depends_on": []},
+        "#C#": {"clue": "c", "answer": "cow", "alternates": ["cattle"], "depends_on": []},
+        "#E#": {"clue": "#A# #B# #C#", "answer": "", "depends_on": ["#A#", "#B#", "#C#"]},
+    }
+}
+
+def test_answer_any_solves_first_matching_active_clue():
+    game = Game(DUPLICATE_ANSWERS_GAME)
+    assert game.clues_for_answer(" PIG ") == ["#A#", "#B#"]
+    assert game.answer_any("pig") == "#A#"
+    assert game.answer_any("pig") == "#B#"
+    # No active clue left with this answer: one incorrect guess.
+    assert game.answer_any("pig") is None
+    assert game.incorrect_guesses == 1
+    assert game.state.incorrect_guesses == 1
+    assert game.answer_any("Cattle") == "#C#"
+    assert game.is_complete
+
+def test_answer_any_ignores_locked_clues(valid_game: Game):
+    assert valid_game.clues_for_answer("a3") == ["#M1#"]
+    assert valid_game.answer_any("a3") is None
+    valid_game.answer_any("a1")
+    assert valid_game.answer_any("a3") == "#M1#"
+    # End clues are never matched.
+    assert valid_game.clues_for_answer("") == []
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.leaderboard import Leaderboard, LeaderboardStore, OrderStatisticList
+
+TEST_GAME = "tests/data/test_game.json"
+
+
+def test_order_statistic_list_matches_sorted(monkeypatch):
+    # Small blocks exercise splitting and the Fenwick tree.
+    monkeypatch.setattr("bracket_city_mcp.leaderboard._BLOCK_SIZE", 4)
+    rng = random.Random(7)
+    values = [rng.randrange(100) for _ in range(500)]
+    ordered = OrderStatisticList()
+    for value in values:
+        ordered.add(value)
+    expected = sorted(values)
+    assert list(ordered) == expected
+    assert [ordered[i] for i in range(len(expected))] == expected
+    for probe in range(-1, 102):
+        assert ordered.count_less(probe) == sum(value < probe for value in values)
+    with pytest.raises(IndexError):
+        ordered[len(expected)]
+
+def test_ranks_by_score_then_time():
+    board = Leaderboard()
+    games = [Game.from_json_file(TEST_GAME) for _ in range(4)]
+    assert board.record(games[0], 3, 90.0) == 1
+    assert board.record(games[1], 3, 60.0) == 1
+    assert board.record(games[2], 2, 10.0) == 3
+    assert board.record(games[3], 3, 60.0) == 1
+    # A game is only recorded once.
+    assert board.record(games[0], 5, 1.0) == 3
+    assert len(board) == 4
+
+    assert board.top(3) == [
+        {"rank": 1, "score": 3, "seconds": 60.0},
+        {"rank": 1, "score": 3, "seconds": 60.0},
+        {"rank": 3, "score": 3, "seconds": 90.0},
+    ]
+    assert board.rank_of(games[2]) == {"rank": 4, "score": 2, "seconds": 10.0, "percentile": 0.0}
+    assert board.rank_of(games[0])["percentile"] == 25.0
+    assert board.rank_of(Game.from_json_file(TEST_GAME)) is None
+
+def test_percentiles():
+    board = Leaderboard()
+    for score in range(1, 101):
+        board.record(Game.from_json_file(TEST_GAME), score, 1.0)
+    assert board.at_percentile(100)["score"] == 100
+    assert board.at_percentile(90)["score"] == 91
+    assert board.at_percentile(50)["score"] == 51
+    assert board.at_percentile(0)["score"] == 1
+    assert Leaderboard().at_percentile(50) is None
+
+def test_negative_scores_and_long_times():
+    board = Leaderboard()
+    game = Game.from_json_file(TEST_GAME)
+    board.record(game, -40, 10 ** 9)
+    entry = board.rank_of(game)
+    assert entry["score"] == -40
+    assert entry["seconds"] == (2 ** 32 - 1) / 1000
+
+def test_store_keeps_one_board_per_puzzle():
+    store = LeaderboardStore()
+    first, second = Game.from_json_file(TEST_GAME), Game.from_json_file(TEST_GAME)
+    other = Game.from_json_file("tests/data/valid_single_end_clue_game.json")
+    assert store.for_game(first) is store.for_game(second)
+    assert store.for_game(first) is not store.for_game(other)
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.game import loader
+from bracket_city_mcp.game.loader import load_clues
+
+BACKENDS = ["stdlib"] + (["ijson"] if loader.ijson is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(loader, "ijson", None)
+    return request.param
+
+def _write(tmp_path, content) -> str:
+    path = tmp_path / "game.json"
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return str(path)
+
+def test_load_clues_matches_json_load(backend, tmp_path):
+    game_data = {
+        "title": {"nested": [1, 2.5, None, "x]}"]},
+        "clues": {
+            "#C1#": {"clue": "first \"quoted\" ünïcode", "answer": "a1", "depends_on": []},
+            "#C2#": {"clue": "uses #C1#", "answer": "a2", "depends_on": ["#C1#"]},
+            "#C3#": {"clue": "end #C2#", "depends_on": ["#C2#"]},
+        },
+        "number": 12345,
+    }
+    path = _write(tmp_path, json.dumps(game_data, indent=4))
+    # A tiny chunk size forces values to straddle chunk boundaries.
+    clues = load_clues(path, chunk_size=3)
+    assert list(clues) == ["#C1#", "#C2#", "#C3#"]
+    assert clues["#C1#"].clue_text == "first \"quoted\" ünïcode"
+    assert clues["#C2#"].depends_on == ["#C1#"]
+    assert clues["#C3#"].answer == ""
+
+def test_from_json_file_uses_streaming_loader(backend, tmp_path):
+    path = _write(tmp_path, {"clues": {
+        "#S#": {"clue": "start", "answer": "go", "depends_on": []},
+        "#E#": {"clue": "end #S#", "answer": "", "depends_on": ["#S#"]},
+    }})
+    game = Game.from_json_file(path)
+    assert game.end_clues == ["#E#"]
+    assert game.active_clues == {"#S#"}
+    assert game.answer_clue("#S#", "GO")
+
+def test_alternates_are_loaded(backend, tmp_path):
+    path = _write(tmp_path, {"clues": {
+        "#C1#": {"clue": "x", "answer": "grey", "alternates": ["gray"], "depends_on": []},
+    }})
+    assert load_clues(path)["#C1#"].check_answer("Gray")
+
+def test_load_clues_rejects_schema_violations(backend, tmp_path):
+    path = _write(tmp_path, {"clues": {"#C1#": {"clue": "x", "depends_on": "#C2#"}}})
+    with pytest.raises(ValueError, match="'depends_on' must be a list of strings"):
+        load_clues(path)
+
+    path = _write(tmp_path, {"clues": {"#C1#": ["not", "an", "object"]}})
+    with pytest.raises(ValueError, match="Clue '#C1#' must be a JSON object"):
+        load_clues(path)
+
+    path = _write(tmp_path, {"clues": {"#C1#": {"clue": "x", "alternates": "y"}}})
+    with pytest.raises(ValueError, match="'alternates' must be a list of strings"):
+        load_clues(path)
+
+def test_load_clues_invalid_json_raises(backend, tmp_path):
+    path = _write(tmp_path, '{"clues": {"#C1#": {"clue": "x",}}}')
+    with pytest.raises(json.JSONDecodeError):
+        load_clues(path)
+
+def test_stdlib_loader_rejects_non_object_clues(monkeypatch, tmp_path):
+    monkeypatch.setattr(loader, "ijson", None)
+    with pytest.raises(ValueError, match="'clues' must be a JSON object"):
+        load_clues(_write(tmp_path, {"clues": []}))
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        load_clues(_write(tmp_path, '{"clues": {}} []'))
+
+@pytest.mark.parametrize("chunk_size", [3, 17, 1 << 16])
+def test_json_errors_report_position_in_file(backend, tmp_path, chunk_size):
+    clues = {f"#C{i}#": {"clue": f"clue {i}", "answer": f"a{i}", "depends_on": []} for i in range(50)}
+    content = json.dumps({"clues": clues}, indent=4).replace('"a49"', '"a49",')
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(content)
+    with pytest.raises(json.JSONDecodeError) as raised:
+        load_clues(_write(tmp_path, content), chunk_size=chunk_size)
+    error = raised.value
+    assert (error.msg, error.pos, error.lineno, error.colno) == \
+        (expected.value.msg, expected.value.pos, expected.value.lineno, expected.value.colno)
+    assert str(error) == str(expected.value)
@@ -3,12 +3,18 @@ from unittest.mock import MagicMock, patch
 import sys
 import os
 import copy # For deepcopying game state
+import json
+import tempfile
+import time
 
 # Adjust path to import main module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.bracket_city_mcp import main as bracket_city_main
 from src.bracket_city_mcp.game.game import Game
+from src.bracket_city_mcp.answer_log import AnswerLog
+from src.bracket_city_mcp.leaderboard import LeaderboardStore
+from src.bracket_city_mcp.sessions import CheckpointStore
 # Clue import is not strictly needed here anymore as we use a real Game object
 # from src.bracket_city_mcp.game.clue import Clue
 
@@ -93,7 +99,8 @@ class TestAnswerClueTool(unittest.TestCase):
             "correct": False,
             "message": "Incorrect answer.",
             "available_clues": initial_active_clues, # No change in active clues
-            "game_completed": False
+            "game_completed": False,
+            "close": False
         }
         response["available_clues"].sort()
         self.assertEqual(response, expected_response)
@@ -101,6 +108,21 @@ class TestAnswerClueTool(unittest.TestCase):
         self.assertFalse(self.game_instance.clues[clue_id].completed)
         self.assertEqual(self.game_instance.incorrect_guesses, 1)
 
+    def test_answer_clue_near_miss_is_flagged(self):
+        response = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_anser1")
+        self.assertFalse(response["correct"])
+        self.assertTrue(response["close"])
+        self.assertEqual(response["message"], "Incorrect answer, but close.")
+        self.assertEqual(self.game_instance.incorrect_guesses, 1)
+
+    def test_answer_any(self):
+        miss = bracket_city_main.answer_any("dummy_answer2")
+        self.assertFalse(miss["correct"])
+        self.assertEqual(self.game_instance.incorrect_guesses, 1)
+        hit = bracket_city_main.answer_any("dummy_answer1")
+        self.assertEqual(hit["clue_id"], "#DUMMY_CLUE1#")
+        self.assertEqual(hit["available_clues"], ["#DUMMY_CLUE2#"])
+
     def test_answer_clue_not_found(self):
         clue_id = "#NON_EXISTENT_CLUE#"
         answer = "any_answer"
@@ -215,11 +237,435 @@ class TestAnswerClueTool(unittest.TestCase):
         self.assertIn("#END_CLUE#", final_response["available_clues"])
         self.assertEqual(len(final_response["available_clues"]), 1) # Only end clue should be "active"
 
+class TestSessionIsolation(unittest.TestCase):
+    def setUp(self):
+        self.game_instance = Game.from_json_file('tests/data/test_game.json')
+        self.game_patcher = patch('src.bracket_city_mcp.main.game', self.game_instance)
+        self.game_patcher.start()
+        self.sessions_patcher = patch(
+            'src.bracket_city_mcp.main.sessions',
+            bracket_city_main.SessionStore(bracket_city_main._new_session_game),
+        )
+        self.sessions_patcher.start()
+        self.session_id_patcher = patch('src.bracket_city_mcp.main._current_session_id')
+        self.mock_session_id = self.session_id_patcher.start()
+
+    def tearDown(self):
+        self.session_id_patcher.stop()
+        self.sessions_patcher.stop()
+        self.game_patcher.stop()
+
+    def test_sessions_play_independent_games(self):
+        self.mock_session_id.return_value = "session-a"
+        response_a = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+        self.assertTrue(response_a["correct"])
+
+        self.mock_session_id.return_value = "session-b"
+        self.assertEqual(bracket_city_main.get_available_clues(), ["#DUMMY_CLUE1#"])
+        response_b = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "wrong")
+        self.assertFalse(response_b["correct"])
+
+        session_a_game = bracket_city_main.sessions.get("session-a").game
+        session_b_game = bracket_city_main.sessions.get("session-b").game
+        self.assertEqual(session_a_game.active_clues, {"#DUMMY_CLUE2#"})
+        self.assertEqual(session_a_game.incorrect_guesses, 0)
+        self.assertEqual(session_b_game.incorrect_guesses, 1)
+        # The shared template game is never played on by sessions.
+        self.assertFalse(self.game_instance.clues["#DUMMY_CLUE1#"].completed)
+
+    def test_clue_stats_aggregate_sessions(self):
+        self.mock_session_id.return_value = "session-a"
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "wrong")
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+        self.mock_session_id.return_value = "session-b"
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+        self.mock_session_id.return_value = "session-c"
+        bracket_city_main.get_available_clues()  # Joined but never answered.
+
+        stats = bracket_city_main.get_clue_stats()
+        self.assertEqual(stats["games"], 2)
+        self.assertEqual(stats["clues"]["#DUMMY_CLUE1#"]["solved"], 2)
+        self.assertEqual(stats["clues"]["#DUMMY_CLUE1#"]["wrong_attempts"], 0.5)
+        self.assertEqual(stats["clues"]["#DUMMY_CLUE2#"]["abandoned"], 2)
+
+    def test_clue_stats_include_spilled_sessions(self):
+        store = bracket_city_main.sessions
+        store.memory_budget = 1
+        store.min_idle = 0
+        with tempfile.TemporaryDirectory() as spill_dir:
+            store.spill_dir = spill_dir
+            self.mock_session_id.return_value = "session-a"
+            bracket_city_main.answer_clue("#DUMMY_CLUE1#", "wrong")
+            bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+            self.mock_session_id.return_value = "session-b"
+            bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+            self.assertEqual(store.stats()["spilled"], 1)
+
+            stats = bracket_city_main.get_clue_stats()
+            self.assertEqual(stats["games"], 2)
+            self.assertEqual(stats["clues"]["#DUMMY_CLUE1#"]["wrong_attempts"], 0.5)
+            self.assertEqual(stats["clues"]["#DUMMY_CLUE2#"]["abandoned"], 2)
+
+            # Reloading "session-a" spills "session-b"; both are still counted once.
+            self.mock_session_id.return_value = "session-a"
+            bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2")
+            stats = bracket_city_main.get_clue_stats()
+            self.assertEqual(stats["games"], 2)
+            self.assertEqual(stats["clues"]["#DUMMY_CLUE2#"]["solved"], 1)
+            self.assertEqual(stats["clues"]["#DUMMY_CLUE1#"]["wrong_attempts"], 0.5)
+            store.close()
+
+class TestCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.game_instance = Game.from_json_file('tests/data/test_game.json')
+        self.game_patcher = patch('src.bracket_city_mcp.main.game', self.game_instance)
+        self.game_patcher.start()
+        self.checkpoints_patcher = patch('src.bracket_city_mcp.main._default_checkpoints', CheckpointStore())
+        self.checkpoints_patcher.start()
+
+    def tearDown(self):
+        self.checkpoints_patcher.stop()
+        self.game_patcher.stop()
+
+    def test_checkpoint_and_rollback(self):
+        saved = bracket_city_main.checkpoint()
+        self.assertEqual(saved["available_clues"], ["#DUMMY_CLUE1#"])
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+        bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2")
+        self.assertTrue(self.game_instance.is_complete)
+
+        response = bracket_city_main.rollback(saved["checkpoint"])
+        self.assertTrue(response["success"])
+        self.assertEqual(response["available_clues"], ["#DUMMY_CLUE1#"])
+        self.assertFalse(response["game_completed"])
+        self.assertFalse(self.game_instance.clues["#DUMMY_CLUE1#"].completed)
+        # A checkpoint can be reused.
+        self.assertTrue(bracket_city_main.rollback(saved["checkpoint"])["success"])
+
+    def test_rollback_unknown_checkpoint(self):
+        response = bracket_city_main.rollback("cp999")
+        self.assertFalse(response["success"])
+        self.assertEqual(response["message"], "Checkpoint 'cp999' not found.")
+
+class TestStateTokens(unittest.TestCase):
+    def setUp(self):
+        self.game_instance = Game.from_json_file('tests/data/test_game.json')
+        self.patcher = patch('src.bracket_city_mcp.main.game', self.game_instance)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_play_through_with_tokens(self):
+        started = bracket_city_main.start_game()
+        self.assertEqual(started["available_clues"], ["#DUMMY_CLUE1#"])
+        state = started["state"]
+
+        wrong = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "nope", state=state)
+        self.assertFalse(wrong["correct"])
+        self.assertEqual(wrong["message"], "Incorrect answer.")
+
+        premature = bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2", state=wrong["state"])
+        self.assertEqual(premature["message"], "Clue '#DUMMY_CLUE2#' is not currently available. Solve its dependencies first.")
+
+        first = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1", state=wrong["state"])
+        self.assertTrue(first["correct"])
+        self.assertEqual(first["available_clues"], ["#DUMMY_CLUE2#"])
+        self.assertEqual(bracket_city_main.get_clue_text_for_state(first["state"], "#DUMMY_CLUE1#"), "dummy_answer1")
+
+        second = bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2", state=first["state"])
+        self.assertTrue(second["game_completed"])
+        self.assertEqual(second["score"], len(self.game_instance.clues) - 1)
+        self.assertEqual(bracket_city_main.get_available_clues_for_state(second["state"]), ["#END_CLUE#"])
+
+        final = bracket_city_main.answer_clue("#END_CLUE#", "", state=second["state"])
+        self.assertEqual(final["message"], "You've reached the final clue! Congratulations, the game is complete!")
+
+        # Nothing was stored server-side: the shared game is untouched and old
+        # tokens remain valid snapshots of their own state.
+        self.assertFalse(self.game_instance.clues["#DUMMY_CLUE1#"].completed)
+        self.assertEqual(bracket_city_main.get_available_clues_for_state(state), ["#DUMMY_CLUE1#"])
+
+    def test_answer_any_with_token(self):
+        started = bracket_city_main.start_game()
+        miss = bracket_city_main.answer_any("dummy_answer2", state=started["state"])
+        self.assertFalse(miss["correct"])
+        self.assertIsNone(miss["clue_id"])
+        hit = bracket_city_main.answer_any("DUMMY_ANSWER1", state=miss["state"])
+        self.assertTrue(hit["correct"])
+        self.assertEqual(hit["clue_id"], "#DUMMY_CLUE1#")
+        done = bracket_city_main.answer_any("dummy_answer2", state=hit["state"])
+        self.assertTrue(done["game_completed"])
+        self.assertEqual(done["score"], len(self.game_instance.clues) - 1)
+
+    def test_search_clues_with_token(self):
+        started = bracket_city_main.start_game()
+        response = bracket_city_main.search_clues("dummy", state=started["state"])
+        self.assertEqual(response["total"], 1)
+        self.assertEqual(response["matches"][0]["clue_id"], "#DUMMY_CLUE1#")
+        self.assertIn("text", response["matches"][0])
+        self.assertIn("message", bracket_city_main.search_clues("dummy", state="bogus"))
+
+    def test_invalid_token_is_rejected(self):
+        response = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1", state="bogus")
+        self.assertFalse(response["correct"])
+        self.assertNotIn("state", response)
+        self.assertIn("state token", response["message"].lower())
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.game_instance = Game.from_json_file('tests/data/test_game.json')
+        self.game_patcher = patch('src.bracket_city_mcp.main.game', self.game_instance)
+        self.game_patcher.start()
+        self.leaderboards_patcher = patch('src.bracket_city_mcp.main.leaderboards', LeaderboardStore())
+        self.leaderboards_patcher.start()
+        self.spill_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.spill_dir.cleanup()
+        self.leaderboards_patcher.stop()
+        self.game_patcher.stop()
+
+    def test_completion_is_ranked(self):
+        self.assertIsNone(bracket_city_main.leaderboard_rank()["rank"])
+        self.assertIsNone(bracket_city_main.leaderboard_percentile(50)["entry"])
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "wrong")
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+        response = bracket_city_main.answer_any("dummy_answer2")
+        self.assertTrue(response["game_completed"])
+        self.assertEqual(response["rank"], 1)
+
+        rank = bracket_city_main.leaderboard_rank()
+        self.assertEqual(rank["rank"], 1)
+        self.assertEqual(rank["score"], len(self.game_instance.clues) - 1)
+        self.assertEqual(rank["completions"], 1)
+        top = bracket_city_main.leaderboard(limit=5)
+        self.assertEqual(top["completions"], 1)
+        self.assertEqual(top["top"][0]["score"], rank["score"])
+        self.assertEqual(bracket_city_main.leaderboard_percentile(50)["entry"]["rank"], 1)
+
+    def test_rollback_does_not_launder_wrong_guesses(self):
+        with patch('src.bracket_city_mcp.main._default_checkpoints', CheckpointStore()):
+            saved = bracket_city_main.checkpoint()["checkpoint"]
+            for guess in ("wrong", "also wrong", "still wrong"):
+                bracket_city_main.answer_clue("#DUMMY_CLUE1#", guess)
+            self.assertTrue(bracket_city_main.rollback(saved)["success"])
+            bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+            response = bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2")
+        self.assertTrue(response["game_completed"])
+        self.assertEqual(response["score"], len(self.game_instance.clues) - 3)
+        self.assertEqual(bracket_city_main.leaderboard_rank()["score"], response["score"])
+
+    def test_token_completions_are_not_ranked(self):
+        started = bracket_city_main.start_game()
+        first = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1", state=started["state"])
+        done = bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2", state=first["state"])
+        self.assertTrue(done["game_completed"])
+        self.assertNotIn("rank", done)
+        self.assertEqual(bracket_city_main.leaderboard()["completions"], 0)
+
+    def test_rank_survives_session_spill(self):
+        store = bracket_city_main.SessionStore(
+            bracket_city_main._new_session_game,
+            on_spill=bracket_city_main._session_spilled,
+            on_reload=bracket_city_main._session_reloaded,
+        )
+        store.memory_budget = 1
+        store.spill_dir = self.spill_dir.name
+        store.min_idle = 0
+        with patch('src.bracket_city_mcp.main.sessions', store), \
+                patch('src.bracket_city_mcp.main._current_session_id') as mock_session_id:
+            mock_session_id.return_value = "session-a"
+            bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+            self.assertEqual(bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2")["rank"], 1)
+            mock_session_id.return_value = "session-b"
+            bracket_city_main.get_available_clues()
+            self.assertEqual(store.stats()["spilled"], 1)
+
+            mock_session_id.return_value = "session-a"
+            self.assertEqual(bracket_city_main.leaderboard_rank()["rank"], 1)
+            # Completing again after the reload does not add a second entry.
+            bracket_city_main.answer_clue("#END_CLUE#", "")
+            self.assertEqual(bracket_city_main.leaderboard()["completions"], 1)
+        store.close()
+
+class TestAnswerLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log = AnswerLog(self.directory.name)
+        self.patchers = [
+            patch('src.bracket_city_mcp.main.game', Game.from_json_file('tests/data/test_game.json')),
+            patch('src.bracket_city_mcp.main.answer_log', self.log),
+            patch('src.bracket_city_mcp.main._previous_puzzles', {}),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.log.close()
+        self.directory.cleanup()
+
+    def test_session_answers_are_recorded(self):
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "nope")
+        bracket_city_main.answer_any("dummy_answer1")
+        # Token-based play is not recorded.
+        bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1", state=bracket_city_main.start_game()["state"])
+        self.log.flush()
+        with open(self.log.path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([(r["tool"], r["clue_id"], r["correct"], r["incorrect_guesses"]) for r in records], [
+            ("answer_clue", "#DUMMY_CLUE1#", False, 1),
+            ("answer_any", "#DUMMY_CLUE1#", True, 1),
+        ])
+        self.assertEqual(records[0]["session"], "default")
+
+    def test_rollbacks_and_puzzle_switches_are_recorded(self):
+        with patch('src.bracket_city_mcp.main._default_checkpoints', CheckpointStore()):
+            saved = bracket_city_main.checkpoint()["checkpoint"]
+            bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+            bracket_city_main.rollback(saved)
+            bracket_city_main.rollback("cp999")
+            new_game = Game.from_json_file('tests/data/valid_single_end_clue_game.json')
+            bracket_city_main._switch_puzzle(new_game)
+        self.log.flush()
+        with open(self.log.path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([(r["tool"], r.get("checkpoint"), r["correct"], r["game"]) for r in records], [
+            ("checkpoint", saved, True, "test_game"),
+            ("answer_clue", None, True, "test_game"),
+            ("rollback", saved, True, "test_game"),
+            ("rollback", "cp999", False, "test_game"),
+            ("switch", None, True, "valid_single_end_clue_game"),
+        ])
+        self.assertEqual(records[-1]["session"], "default")
+
+class TestPuzzleSwitch(unittest.TestCase):
+    def setUp(self):
+        self.old_game = Game.from_json_file('tests/data/test_game.json')
+        self.game_patcher = patch('src.bracket_city_mcp.main.game', self.old_game)
+        self.game_patcher.start()
+        self.checkpoints_patcher = patch('src.bracket_city_mcp.main._default_checkpoints', CheckpointStore())
+        self.checkpoints_patcher.start()
+        self.previous_patcher = patch('src.bracket_city_mcp.main._previous_puzzles', {})
+        self.previous_patcher.start()
+
+    def tearDown(self):
+        self.previous_patcher.stop()
+        self.checkpoints_patcher.stop()
+        self.game_patcher.stop()
+
+    def test_switch_serves_new_puzzle(self):
+        old_token = bracket_city_main.start_game()["state"]
+        bracket_city_main.checkpoint()
+        new_game = Game.from_json_file('tests/data/valid_single_end_clue_game.json')
+        bracket_city_main._switch_puzzle(new_game)
+
+        self.assertIs(bracket_city_main._puzzle(), new_game)
+        self.assertEqual(len(bracket_city_main._default_checkpoints), 0)
+        self.assertEqual(bracket_city_main.start_game()["available_clues"], new_game.active_clues_for_mask(0))
+        # New sessions start on the new puzzle.
+        self.assertEqual(bracket_city_main._new_session_game().fingerprint, new_game.fingerprint)
+
+        # Tokens for the old puzzle keep playing it during the grace period.
+        response = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1", state=old_token)
+        self.assertTrue(response["correct"])
+        self.assertEqual(response["available_clues"], ["#DUMMY_CLUE2#"])
+        self.assertEqual(bracket_city_main.get_available_clues_for_state(response["state"]), ["#DUMMY_CLUE2#"])
+        response = bracket_city_main.answer_clue("#DUMMY_CLUE2#", "dummy_answer2", state=response["state"])
+        self.assertTrue(response["game_completed"])
+        self.assertEqual(bracket_city_main.search_clues("clue", state=old_token)["total"], 1)
+
+        # Afterwards they are rejected rather than misapplied to the new puzzle.
+        with patch('src.bracket_city_mcp.main.time.monotonic',
+                   return_value=time.monotonic() + bracket_city_main.PREVIOUS_PUZZLE_GRACE_SECONDS):
+            response = bracket_city_main.answer_clue("#DUMMY_CLUE1#", "dummy_answer1", state=old_token)
+        self.assertNotIn("state", response)
+        self.assertIn("different puzzle", response["message"])
+
+class TestRateLimitKeys(unittest.TestCase):
+    def request(self, host, headers=()):
+        return bracket_city_main.Request({
+            "type": "http", "method": "POST", "path": "/mcp", "query_string": b"",
+            "headers": [(name.encode(), value.encode()) for name, value in headers],
+            "client": (host, 50000),
+        })
+
+    def key_for(self, request):
+        with patch('src.bracket_city_mcp.main._current_request', return_value=request):
+            return bracket_city_main._rate_limit_key()
+
+    def test_sessionless_clients_do_not_share_buckets(self):
+        first = self.key_for(self.request("203.0.113.1"))
+        second = self.key_for(self.request("203.0.113.2"))
+        self.assertNotEqual(first, second)
+        limiter = bracket_city_main.AdmissionController().rate_limiter
+        limiter.rate, limiter.burst = 0.001, 1
+        self.assertFalse(limiter.check(first, "answer_clue"))
+        self.assertTrue(limiter.check(first, "answer_clue"))
+        self.assertFalse(limiter.check(second, "answer_clue"))
+
+    def test_sessions_and_router_clients(self):
+        session = self.request("203.0.113.1", [("mcp-session-id", "abc")])
+        self.assertEqual(self.key_for(session), "abc")
+        routed = self.request("127.0.0.1", [(bracket_city_main.CLIENT_HEADER, "203.0.113.7")])
+        self.assertEqual(self.key_for(routed), "client:203.0.113.7")
+        # Only the router, on the loopback address, may name another client.
+        spoofed = self.request("203.0.113.1", [(bracket_city_main.CLIENT_HEADER, "203.0.113.7")])
+        self.assertEqual(self.key_for(spoofed), "client:203.0.113.1")
+        self.assertIsNone(self.key_for(None))
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.patchers = [
+            patch('src.bracket_city_mcp.main.game', None),
+            patch('src.bracket_city_mcp.main.puzzle_file', 'tests/data/test_game.json'),
+            patch('src.bracket_city_mcp.main._default_checkpoints', CheckpointStore()),
+            patch('src.bracket_city_mcp.main._loader', None),
+            patch('src.bracket_city_mcp.main._loading_done', bracket_city_main.threading.Event()),
+            patch('src.bracket_city_mcp.main._load_error', None),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+
+    def readyz(self):
+        import anyio
+        return anyio.run(bracket_city_main.readyz, None)
+
+    def test_puzzle_loads_on_first_use(self):
+        self.assertFalse(bracket_city_main.ready()["ready"])
+        self.assertEqual(self.readyz().status_code, 503)
+        self.assertEqual(bracket_city_main.health(), "OK")
+
+        self.assertEqual(bracket_city_main.start_game()["available_clues"], ["#DUMMY_CLUE1#"])
+        self.assertEqual(bracket_city_main.ready(), {"ready": True, "puzzle": "test_game", "error": None})
+        self.assertEqual(self.readyz().status_code, 200)
+
+    def test_background_load(self):
+        bracket_city_main.start_loading()
+        bracket_city_main._loader.join()
+        self.assertTrue(bracket_city_main.ready()["ready"])
+        self.assertEqual(bracket_city_main._puzzle().game_id, "test_game")
+
+    def test_failed_background_load(self):
+        with patch('src.bracket_city_mcp.main.puzzle_file', 'tests/data/does_not_exist.json'):
+            bracket_city_main.start_loading()
+            bracket_city_main._loader.join()
+        status = bracket_city_main.ready()
+        self.assertFalse(status["ready"])
+        self.assertIn("does_not_exist.json", status["error"])
+        with self.assertRaises(RuntimeError):
+            bracket_city_main._puzzle()
+        # The server stays alive to report the failure.
+        self.assertEqual(bracket_city_main.health(), "OK")
+
 if __name__ == '__main__':
     # This allows running the tests directly from this file: python tests/test_main.py
-    # Note: The dummy game file 'games/json/20250110.json' is still loaded when
-    # 'from src.bracket_city_mcp import main as bracket_city_main' is executed.
-    # This is separate from 'tests/data/test_game.json' used by these tests.
-    # Ensure 'games/json/20250110.json' exists or the import will fail.
-    # A dummy version was created in a previous step.
+    # Importing main does not load a puzzle; these tests patch in
+    # 'tests/data/test_game.json' where they need one.
     unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+
+import pytest
+
+# scripts/ is not a package, so make parse_game importable directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+import parse_game
+from parse_game import BracketParseError, batch_convert, parse_bracket_city, parse_clues
+
+
+def test_parse_assigns_ids_innermost_last_open_first():
+    clues = json.loads(parse_bracket_city("[a [b] c [d]]"))["clues"]
+    assert list(clues) == ["#C1#", "#C2#", "#C3#"]
+    assert clues["#C1#"] == {"clue": "d", "answer": "", "depends_on": []}
+    assert clues["#C2#"] == {"clue": "b", "answer": "", "depends_on": []}
+    assert clues["#C3#"] == {"clue": "a #C2# c #C1#", "answer": "", "depends_on": ["#C1#", "#C2#"]}
+
+def test_parse_is_independent_of_chunking():
+    game_string = "x [one [two\n[three]] four] y [five]"
+    expected = parse_clues([game_string])
+    for size in (1, 2, 5):
+        chunks = [game_string[i:i + size] for i in range(0, len(game_string), size)]
+        assert parse_clues(chunks) == expected
+
+def test_parse_unmatched_close_bracket_reports_position():
+    with pytest.raises(BracketParseError, match=r"Unmatched '\]' at line 2, column 3") as exc_info:
+        parse_clues(["[a]\nbc]"])
+    assert exc_info.value.offset == 6
+
+def test_parse_unclosed_open_bracket_reports_position():
+    with pytest.raises(BracketParseError, match=r"Unclosed '\[' at line 1, column 4") as exc_info:
+        parse_clues(["ab [c [d]"])
+    assert exc_info.value.offset == 3
+
+def test_batch_convert_skips_unchanged_files(tmp_path):
+    raw_dir = tmp_path / "raw"
+    json_dir = tmp_path / "json"
+    (raw_dir / "nested").mkdir(parents=True)
+    (raw_dir / "one.md").write_text("[a [b]]", encoding="utf-8")
+    (raw_dir / "nested" / "two.md").write_text("[c]", encoding="utf-8")
+    (raw_dir / "bad.md").write_text("[d", encoding="utf-8")
+
+    summary = batch_convert(str(raw_dir), str(json_dir), workers=2)
+    assert len(summary["converted"]) == 2
+    assert summary["failed"] == [str(raw_dir / "bad.md")]
+    assert "Unclosed '['" in summary["errors"][str(raw_dir / "bad.md")]
+    assert json.loads((json_dir / "one.json").read_text())["clues"]["#C2#"]["clue"] == "a #C1#"
+    assert (json_dir / "nested" / "two.json").exists()
+
+    (raw_dir / "one.md").write_text("[e]", encoding="utf-8")
+    summary = batch_convert(str(raw_dir), str(json_dir), workers=2)
+    assert summary["converted"] == [str(raw_dir / "one.md")]
+    assert summary["skipped"] == [str(raw_dir / "nested" / "two.md")]
+    assert json.loads((json_dir / "one.json").read_text())["clues"] == {
+        "#C1#": {"clue": "e", "answer": "", "depends_on": []}
+    }
+
+    summary = batch_convert(str(raw_dir), str(json_dir), workers=2, force=True)
+    assert len(summary["converted"]) == 2
+    assert summary["skipped"] == []
+
+def test_tokenizer_changes_invalidate_the_manifest(tmp_path, monkeypatch):
+    raw_dir = tmp_path / "raw"
+    json_dir = tmp_path / "json"
+    raw_dir.mkdir()
+    (raw_dir / "one.md").write_text("[a [b]]", encoding="utf-8")
+    assert len(batch_convert(str(raw_dir), str(json_dir), workers=1)["converted"]) == 1
+    assert len(batch_convert(str(raw_dir), str(json_dir), workers=1)["skipped"]) == 1
+
+    # Stand in for an edit to bracket_city_mcp/game/parser.py.
+    tokenizer = tmp_path / "parser.py"
+    tokenizer.write_text("# changed tokenizer\n", encoding="utf-8")
+    monkeypatch.setattr(parse_game, "CONVERSION_SOURCES", (parse_game.CONVERSION_SOURCES[0], str(tokenizer)))
+    assert len(batch_convert(str(raw_dir), str(json_dir), workers=1)["converted"]) == 1
@@ -0,0 +1,47 @@
+import pytest
+
+from bracket_city_mcp.game import BracketParseError, Game, parse_clues
+from bracket_city_mcp.game.parser import parse_clue_definitions
+
+
+def test_parse_clue_definitions_order_and_dependencies():
+    definitions = parse_clue_definitions(["[a [b] c [d]]"])
+    assert definitions == [
+        ("#C1#", "d", []),
+        ("#C2#", "b", []),
+        ("#C3#", "a #C2# c #C1#", ["#C1#", "#C2#"]),
+    ]
+
+def test_parse_clues_matches_json_format():
+    assert parse_clues(["[x [y]]"]) == {
+        "#C1#": {"clue": "y", "answer": "", "depends_on": []},
+        "#C2#": {"clue": "x #C1#", "answer": "", "depends_on": ["#C1#"]},
+    }
+
+def test_game_from_bracket_string_matches_json_round_trip():
+    game_string = "[the [first] and [second] clue]"
+    answers = {"#C1#": "second", "#C2#": "first"}
+    direct = Game.from_bracket_string(game_string, answers)
+
+    game_data = {"clues": parse_clues([game_string])}
+    for clue_id, answer in answers.items():
+        game_data["clues"][clue_id]["answer"] = answer
+    via_json = Game(game_data)
+
+    assert direct.end_clues == via_json.end_clues == ["#C3#"]
+    assert direct.active_clues == via_json.active_clues == {"#C1#", "#C2#"}
+    assert direct.get_rendered_game_text() == via_json.get_rendered_game_text()
+    assert direct.answer_clue("#C2#", "First")
+    assert direct.get_rendered_game_text() == "the first and [second] clue"
+
+def test_game_from_bracket_string_unbalanced_raises():
+    with pytest.raises(BracketParseError):
+        Game.from_bracket_string("[a [b]")
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 16])
+def test_unbalanced_error_position_is_absolute_across_chunks(chunk_size):
+    text = "[one]\n[two [three]]\n  x] [four]"
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    with pytest.raises(BracketParseError) as raised:
+        parse_clue_definitions(chunks)
+    assert (raised.value.offset, raised.value.line, raised.value.column) == (text.index("x]") + 1, 3, 4)
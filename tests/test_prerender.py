@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.prerender import Prerenderer
+from bracket_city_mcp.render_cache import RenderCache
+
+GAME_DATA = {
+    "clues": {
+        "#A#": {"clue": "a", "answer": "w", "depends_on": []},
+        "#B#": {"clue": "b", "answer": "x", "depends_on": []},
+        "#C#": {"clue": "c", "answer": "y", "depends_on": []},
+        "#D#": {"clue": "d", "answer": "z", "depends_on": []},
+        "#E#": {"clue": "[#A#] [#B#] [#C#] [#D#]", "answer": "", "depends_on": ["#A#", "#B#", "#C#", "#D#"]},
+    }
+}
+
+
+class BlockingRenderCache(RenderCache):
+    """A RenderCache whose renders wait until `release` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def render(self, game, completed_mask, clue_id=None):
+        self.entered.set()
+        self.release.wait(timeout=5)
+        return super().render(game, completed_mask, clue_id)
+
+
+@pytest.fixture
+def game() -> Game:
+    return Game(GAME_DATA)
+
+def test_successor_states_are_cached(game):
+    cache = RenderCache()
+    prerenderer = Prerenderer(cache, max_workers=2)
+    game.answer_clue("#A#", "w")
+    prerenderer.schedule(game, game.state)
+    prerenderer.shutdown(cancel_pending=False)
+
+    assert prerenderer.rendered == 3
+    game.answer_clue("#C#", "y")
+    cache.render(game, game.state.completed_mask)
+    assert cache.hits == 1 and cache.misses == 3
+
+def test_disabled_by_default(game):
+    cache = RenderCache()
+    prerenderer = Prerenderer(cache)
+    prerenderer.schedule(game, game.state)
+    prerenderer.shutdown(cancel_pending=False)
+    assert len(cache) == 0
+    assert prerenderer.scheduled == 0
+
+def test_budget_limits_successors(game):
+    prerenderer = Prerenderer(RenderCache(), max_workers=1, budget=2)
+    prerenderer.schedule(game, game.state)
+    prerenderer.shutdown(cancel_pending=False)
+    assert prerenderer.scheduled == 2
+
+def test_moving_on_cancels_queued_work(game):
+    cache = BlockingRenderCache()
+    prerenderer = Prerenderer(cache, max_workers=1)
+    prerenderer.schedule(game, game.state)  # 4 renders; the first blocks.
+    assert cache.entered.wait(timeout=5)
+    game.answer_clue("#A#", "w")
+    prerenderer.schedule(game, game.state)
+    cache.release.set()
+    prerenderer.shutdown(cancel_pending=False)
+
+    assert prerenderer.cancelled == 3
+    assert prerenderer.scheduled == 4 + 3
+    assert prerenderer.stats()["queued"] == 0
@@ -0,0 +1,58 @@
+import copy
+
+import pytest
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.render_cache import RenderCache
+
+GAME_DATA = {
+    "clues": {
+        "#A#": {"clue": "a", "answer": "x", "depends_on": []},
+        "#B#": {"clue": "b", "answer": "y", "depends_on": []},
+        "#E#": {"clue": "[#A#] [#B#]", "answer": "", "depends_on": ["#A#", "#B#"]},
+    }
+}
+
+
+@pytest.fixture
+def game() -> Game:
+    return Game(GAME_DATA)
+
+def test_render_matches_uncached_rendering(game):
+    cache = RenderCache()
+    for mask in range(4):
+        assert cache.render(game, mask) == game.render_clue_text_for_mask("#E#", mask)
+        assert cache.render(game, mask, "#A#") == game.render_clue_text_for_mask("#A#", mask)
+
+def test_sessions_share_entries(game):
+    cache = RenderCache()
+    other_session = copy.deepcopy(game)
+    cache.render(game, 0b001)
+    cache.render(other_session, 0b001)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+def test_clue_entry_ignores_unrelated_progress(game):
+    cache = RenderCache()
+    cache.render(game, 0b000, "#A#")
+    # Solving #B# does not change how #A# renders.
+    cache.render(game, 0b010, "#A#")
+    assert cache.hits == 1
+    assert len(cache) == 1
+
+def test_lru_eviction(game):
+    cache = RenderCache(max_entries=2)
+    cache.render(game, 0b00)
+    cache.render(game, 0b01)
+    cache.render(game, 0b00)  # Now most recently used.
+    cache.render(game, 0b10)
+    assert cache.key_for(game, 0b00) in cache
+    assert cache.key_for(game, 0b01) not in cache
+    assert cache.evictions == 1
+
+def test_unknown_clue_raises(game):
+    cache = RenderCache()
+    with pytest.raises(ValueError):
+        cache.render(game, 0, "#Z#")
+    assert len(cache) == 0
@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+
+# scripts/ is not a package, so make replay_sessions importable directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from replay_sessions import load_sessions, replay
+
+from bracket_city_mcp.answer_log import AnswerLog
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.game.answers import AnswerNormalizer
+from bracket_city_mcp.sessions import CheckpointStore
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def record_sessions(directory) -> str:
+    """Plays two sessions of tests/data/test_game.json, logging every answer as the server does."""
+    log = AnswerLog(str(directory))
+    for session_id, answers in [
+        ("s1", [("#DUMMY_CLUE1#", "DUMMY_ANSWER1"), ("#DUMMY_CLUE2#", "wrong"), ("#DUMMY_CLUE2#", "dummy_answer2"),
+                ("#END_CLUE#", "")]),
+        ("s2", [("#DUMMY_CLUE2#", "dummy_answer2"), (None, "dummy_answer1"), ("#NOPE#", "x")]),
+    ]:
+        game = Game.from_json_file(os.path.join(DATA_DIR, "test_game.json"))
+        for clue_id, answer in answers:
+            if clue_id is None:
+                solved = game.answer_any(answer)
+                log.record(session_id, game, "answer_any", solved, answer, solved is not None)
+            elif game.clues.get(clue_id) is not None and game.clues[clue_id].is_end_clue:
+                log.record(session_id, game, "answer_clue", clue_id, answer, game.is_complete)
+            else:
+                log.record(session_id, game, "answer_clue", clue_id, answer, game.answer_clue(clue_id, answer))
+    log.close()
+    return log.path
+
+
+def test_load_sessions_groups_answers(tmp_path):
+    sessions = load_sessions([record_sessions(tmp_path)])
+    assert [(s["session"], len(s["events"])) for s in sessions] == [("s1", 4), ("s2", 3)]
+    assert sessions[1]["events"][1][:2] == ("answer_any", "#DUMMY_CLUE1#")
+
+def test_replay_reproduces_recording(tmp_path):
+    result = replay([record_sessions(tmp_path)], DATA_DIR, workers=1)
+    assert (result["sessions"], result["events"], result["skipped"]) == (2, 7, 0)
+    assert result["differences"] == []
+
+def test_replay_under_rule_change(tmp_path):
+    # Case-sensitive answers: s1's first answer no longer counts.
+    result = replay([record_sessions(tmp_path)], DATA_DIR, AnswerNormalizer(casefold=False), workers=1)
+    [difference] = result["differences"]
+    assert difference["session"] == "s1"
+    assert difference["first_difference"] == {"event": 0, "field": "correct", "recorded": True, "replayed": False}
+    assert difference["recorded"] == {"completed": True, "score": 2}
+    assert difference["replayed"] == {"completed": False, "score": None}
+    assert result["rescored"] == 1
+
+def test_tampered_and_unknown_records(tmp_path):
+    path = record_sessions(tmp_path)
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    records[1]["incorrect_guesses"] = 0
+    records[-1]["game"] = "missing_puzzle"
+    records[-1]["session"] = "s3"
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+
+    result = replay([path], DATA_DIR, workers=1)
+    assert result["skipped"] == 1
+    [difference] = result["differences"]
+    assert difference["first_difference"]["field"] == "incorrect_guesses"
+    assert result["rescored"] == 0
+
+def test_replay_follows_rollbacks_and_puzzle_switches(tmp_path):
+    # The default session checkpoints, guesses, rolls back and completes its
+    # puzzle. Then the daily puzzle switches and it starts on the new one.
+    log = AnswerLog(str(tmp_path))
+    checkpoints = CheckpointStore()
+    game = Game.from_json_file(os.path.join(DATA_DIR, "test_game.json"))
+    start = checkpoints.add(game.checkpoint())
+    log.record(None, game, "checkpoint", None, "", True, checkpoint=start)
+    log.record(None, game, "answer_clue", "#DUMMY_CLUE1#", "dummy_answer1",
+               game.answer_clue("#DUMMY_CLUE1#", "dummy_answer1"))
+    log.record(None, game, "answer_clue", "#DUMMY_CLUE2#", "wrong", game.answer_clue("#DUMMY_CLUE2#", "wrong"))
+    game.rollback(checkpoints.get(start))
+    log.record(None, game, "rollback", None, "", True, checkpoint=start)
+    log.record(None, game, "rollback", None, "", False, checkpoint="cp9")
+    for clue_id, answer in [("#DUMMY_CLUE1#", "dummy_answer1"), ("#DUMMY_CLUE2#", "dummy_answer2")]:
+        log.record(None, game, "answer_clue", clue_id, answer, game.answer_clue(clue_id, answer))
+
+    game = Game.from_json_file(os.path.join(DATA_DIR, "valid_single_end_clue_game.json"))
+    log.record(None, game, "switch", None, "", True)
+    log.record(None, game, "answer_clue", "#S1#", "A1", game.answer_clue("#S1#", "A1"))
+    log.close()
+
+    sessions = load_sessions([log.path])
+    assert [(s["session"], s["game"], len(s["events"])) for s in sessions] == [
+        ("default", "test_game", 7), ("default", "valid_single_end_clue_game", 1)]
+    assert sessions[0]["events"][3][:3] == ("rollback", None, "cp1")
+    result = replay([log.path], DATA_DIR, workers=1)
+    assert (result["sessions"], result["events"], result["skipped"]) == (2, 8, 0)
+    assert result["differences"] == []
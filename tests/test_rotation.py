@@ -0,0 +1,99 @@
+import datetime as dt
+import shutil
+import time
+
+from bracket_city_mcp.render_cache import RenderCache
+from bracket_city_mcp.rotation import PuzzleRotation, puzzle_path
+
+SOURCE = "tests/data/test_game.json"
+
+
+class FakeClock:
+    def __init__(self, now: dt.datetime):
+        self.now = now
+
+    def __call__(self) -> dt.datetime:
+        return self.now
+
+
+def make_rotation(directory, clock, **kwargs):
+    served = []
+    rotation = PuzzleRotation(str(directory), served.append, now=clock, lead_time=600, retry_interval=60, **kwargs)
+    return rotation, served
+
+
+def test_puzzle_path():
+    assert puzzle_path("games/json", dt.date(2025, 1, 10)) == "games/json/20250110.json"
+
+def test_switches_to_today_and_prewarms_tomorrow(tmp_path):
+    shutil.copy(SOURCE, tmp_path / "20250110.json")
+    shutil.copy(SOURCE, tmp_path / "20250111.json")
+    clock = FakeClock(dt.datetime(2025, 1, 10, 12, 0))
+    cache = RenderCache()
+    rotation, served = make_rotation(tmp_path, clock, render_cache=cache)
+
+    # Far from midnight: serve today's puzzle and wake up at most every retry interval.
+    assert rotation.tick() == 60
+    assert [game.game_id for game in served] == ["20250110"]
+    assert rotation.stats()["current_date"] == "2025-01-10"
+
+    # Within the lead time: tomorrow's puzzle is loaded and rendered, not served.
+    clock.now = dt.datetime(2025, 1, 10, 23, 55)
+    assert rotation.tick() == 60
+    assert rotation.stats()["prepared_date"] == "2025-01-11"
+    assert len(served) == 1
+    hits_before = cache.stats()["hits"]
+
+    # At midnight the prepared puzzle is switched in, its renders already cached.
+    clock.now = dt.datetime(2025, 1, 11, 0, 0, 1)
+    rotation.tick()
+    tomorrow = served[-1]
+    assert tomorrow.game_id == "20250111"
+    assert rotation.stats()["prepared_date"] is None
+    cache.render(tomorrow, 0)
+    assert cache.stats()["hits"] == hits_before + 1
+
+def test_sleeps_until_midnight_once_prepared(tmp_path):
+    shutil.copy(SOURCE, tmp_path / "20250110.json")
+    shutil.copy(SOURCE, tmp_path / "20250111.json")
+    clock = FakeClock(dt.datetime(2025, 1, 10, 23, 59, 30))
+    rotation, served = make_rotation(tmp_path, clock)
+    rotation.tick()
+    assert rotation.tick() == 30
+
+def test_missing_puzzle_keeps_current_and_retries(tmp_path):
+    shutil.copy(SOURCE, tmp_path / "20250110.json")
+    clock = FakeClock(dt.datetime(2025, 1, 10, 23, 59, 50))
+    rotation, served = make_rotation(tmp_path, clock)
+    rotation.tick()
+    # Tomorrow's file is missing: retry before midnight.
+    assert rotation.tick() == 10
+    assert rotation.stats()["failures"] == 1
+    assert "FileNotFoundError" in rotation.stats()["last_error"]
+
+    clock.now = dt.datetime(2025, 1, 11, 0, 0, 5)
+    assert rotation.tick() == 60
+    assert len(served) == 1
+    assert rotation.stats()["current_date"] == "2025-01-10"
+
+    # The file arrives late; the next attempt switches to it.
+    shutil.copy(SOURCE, tmp_path / "20250111.json")
+    rotation.tick()
+    assert served[-1].game_id == "20250111"
+
+def test_invalid_puzzle_is_not_served(tmp_path):
+    (tmp_path / "20250110.json").write_text('{"clues": {"#A#": {"clue": 1}}}')
+    rotation, served = make_rotation(tmp_path, FakeClock(dt.datetime(2025, 1, 10, 9, 0)))
+    rotation.tick()
+    assert served == []
+    assert "ValueError" in rotation.stats()["last_error"]
+
+def test_start_and_stop(tmp_path):
+    shutil.copy(SOURCE, tmp_path / "20250110.json")
+    rotation, served = make_rotation(tmp_path, FakeClock(dt.datetime(2025, 1, 10, 9, 0)))
+    rotation.start()
+    deadline = time.monotonic() + 5
+    while not served and time.monotonic() < deadline:
+        time.sleep(0.01)
+    rotation.stop()
+    assert [game.game_id for game in served] == ["20250110"]
@@ -0,0 +1,42 @@
+import copy
+import os
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.game.search import tokenize
+
+VALID_GAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "valid_single_end_clue_game.json")
+
+
+def test_tokenize():
+    assert tokenize("Start Clue 1, depends on S2") == ["start", "clue", "1", "depends", "on", "s2"]
+
+def test_search_only_returns_visible_clues():
+    game = Game.from_json_file(VALID_GAME)
+    assert game.search_clues("start clue") == ["#S1#", "#S2#"]
+    assert game.search_clues("START 2") == ["#S2#"]
+    # #M1# mentions "depends" but is not unlocked yet.
+    assert game.search_clues("depends") == []
+
+    game.answer_clue("#S1#", "A1")
+    assert game.search_clues("start") == ["#S2#"]
+    assert game.search_clues("depends") == ["#M1#"]
+
+def test_search_with_explicit_visible_set():
+    game = Game.from_json_file(VALID_GAME)
+    assert game.search_clues("clue", set(game.clues)) == ["#S1#", "#S2#", "#M1#", "#E1#"]
+    assert game.search_clues("clue nothing", set(game.clues)) == []
+    assert game.search_clues("   ", set(game.clues)) == []
+
+def test_dependency_ids_are_not_searchable():
+    game = Game.from_bracket_string("[north [gate] of the [old] CITY-C9 wall]")
+    assert game.clues["#C3#"].clue_text == "north #C2# of the #C1# CITY-C9 wall"
+    everything = set(game.clues)
+    assert game.search_clues("c1", everything) == []
+    assert game.search_clues("c2", everything) == []
+    # Text that merely looks like an ID is still indexed.
+    assert game.search_clues("city c9", everything) == ["#C3#"]
+    assert game.search_clues("north wall", everything) == ["#C3#"]
+
+def test_index_is_shared_by_copies():
+    game = Game.from_json_file(VALID_GAME)
+    assert copy.deepcopy(game).search_index is game.search_index
@@ -0,0 +1,166 @@
+import copy
+import os
+import threading
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.sessions import CheckpointStore, SessionStore, estimate_copy_bytes
+
+PUZZLE = Game.from_json_file("tests/data/test_game.json")
+
+
+def new_game() -> Game:
+    game = copy.deepcopy(PUZZLE)
+    game.reset()
+    return game
+
+
+def spilling_store(tmp_path, **kwargs) -> SessionStore:
+    """A store that spills every session it can, as soon as it is idle."""
+    store = SessionStore(new_game, **kwargs)
+    store.memory_budget = 1
+    store.spill_dir = str(tmp_path)
+    store.min_idle = 0
+    return store
+
+
+def test_estimate_excludes_shared_objects():
+    game = new_game()
+    size = estimate_copy_bytes(game)
+    assert 0 < size < estimate_copy_bytes(game.clues) + estimate_copy_bytes(vars(game))
+    # The search index is shared by every copy, so it is not counted.
+    assert estimate_copy_bytes(game.search_index) > 0
+    assert estimate_copy_bytes([game.search_index]) == estimate_copy_bytes([None])
+
+def test_memory_accounting():
+    store = SessionStore(new_game)
+    first = store.get("a")
+    assert store.nbytes == first.nbytes == first.game_bytes > 0
+    store.get("b")
+    assert store.nbytes == 2 * first.game_bytes
+
+    first.checkpoints.add(first.game.checkpoint())
+    assert first.checkpoints.nbytes > 0
+    assert store.nbytes == 2 * first.game_bytes + first.checkpoints.nbytes
+    store.remove("a")
+    assert store.nbytes == first.game_bytes
+
+def test_checkpoints_forget_oldest_bytes():
+    checkpoints = CheckpointStore(max_checkpoints=2)
+    state = new_game().state
+    for _ in range(5):
+        checkpoints.add(state)
+    assert len(checkpoints) == 2
+    assert checkpoints.get("cp1") is None and checkpoints.get("cp5") is state
+    only_two = CheckpointStore()
+    only_two.add(state)
+    only_two.add(state)
+    assert checkpoints.nbytes == only_two.nbytes
+
+def test_idle_sessions_spill_and_reload(tmp_path):
+    store = spilling_store(tmp_path)
+    session = store.get("a")
+    game = session.game
+    game.answer_clue("#DUMMY_CLUE1#", "wrong")
+    start = session.checkpoints.add(game.checkpoint())
+    game.answer_clue("#DUMMY_CLUE1#", "dummy_answer1")
+    state, analytics = game.state, game.analytics
+
+    # Creating another session puts the store over budget and spills "a".
+    store.get("b")
+    assert "a" in store and len(store) == 2
+    assert store.stats()["spilled"] == 1
+    assert len(os.listdir(store._spill_path)) == 1
+    assert store.nbytes == store.get("b").nbytes
+
+    reloaded = store.get("a")
+    assert reloaded is not session
+    assert reloaded.game.state == state
+    assert reloaded.game.active_clues == {"#DUMMY_CLUE2#"}
+    assert reloaded.game.clues["#DUMMY_CLUE1#"].completed
+    assert reloaded.game.analytics.wrong_attempts == analytics.wrong_attempts
+    # NaN marks unrecorded times, so compare the raw bytes.
+    assert reloaded.game.analytics.solved_at.tobytes() == analytics.solved_at.tobytes()
+    assert reloaded.game.analytics.revealed_at.tobytes() == analytics.revealed_at.tobytes()
+    # Checkpoints survive, and new IDs carry on where they left off.
+    reloaded.game.rollback(reloaded.checkpoints.get(start))
+    assert reloaded.game.active_clues == {"#DUMMY_CLUE1#"}
+    assert reloaded.game.incorrect_guesses == 1
+    assert reloaded.checkpoints.add(reloaded.game.checkpoint()) == "cp2"
+    assert store.stats()["reloads"] == 1
+
+def test_busy_and_recent_sessions_stay_in_memory(tmp_path):
+    store = spilling_store(tmp_path)
+    busy = store.get("busy")
+    with busy.lock:
+        store.get("other")
+        assert store.get("busy") is busy
+
+    store.min_idle = 60
+    recent = store.get("recent")
+    store.get("another")
+    assert store.get("recent") is recent
+
+def test_spill_hooks_carry_extra_state(tmp_path):
+    reloaded = []
+    store = spilling_store(tmp_path, on_spill=lambda session: session.session_id.upper(),
+                           on_reload=lambda session, extra: reloaded.append(extra))
+    store.get("a")
+    store.get("b")
+    store.get("a")
+    assert reloaded == ["A"]
+
+def test_remove_and_close_delete_spill_files(tmp_path):
+    store = spilling_store(tmp_path)
+    store.get("a")
+    store.get("b")
+    store.get("c")
+    spill_path = store._spill_path
+    assert len(os.listdir(spill_path)) == 2
+    assert store.remove("a")
+    assert "a" not in store
+    assert len(os.listdir(spill_path)) == 1
+    assert not store.remove("a")
+    store.close()
+    assert not os.path.exists(spill_path)
+
+def test_expired_sessions_are_removed_with_their_spill_files(tmp_path):
+    store = spilling_store(tmp_path)
+    store.get("a")
+    store.get("b")
+    store.session_ttl = 60
+    store.get("c")
+    assert len(store) == 3 and store.stats()["evictions"] == 0
+
+    # Every session is now past its TTL: "a" and "b" are spilled, "c" is in memory.
+    store.session_ttl = 0
+    store.get("d")
+    assert "a" not in store and "c" not in store
+    assert len(store) == 1 and store.stats()["evictions"] == 3
+    assert os.listdir(store._spill_path) == []
+    assert store.nbytes == store.get("d").nbytes
+
+def test_spill_files_are_written_outside_the_store_lock(tmp_path):
+    writing, proceed = threading.Event(), threading.Event()
+
+    def on_spill(session):
+        writing.set()
+        assert proceed.wait(5)
+
+    store = spilling_store(tmp_path, on_spill=on_spill)
+    first = store.get("a")
+    spiller = threading.Thread(target=store.get, args=("b",))
+    spiller.start()
+    assert writing.wait(5)
+    # Other requests are served while "a" is being written out...
+    assert store.stats()["resident"] == 2
+    # ...but a request for "a" waits until it is on disk, then reloads it.
+    reloaded = []
+    reader = threading.Thread(target=lambda: reloaded.append(store.get("a")))
+    reader.start()
+    reader.join(0.2)
+    assert reader.is_alive()
+    proceed.set()
+    spiller.join(5)
+    reader.join(5)
+    assert reloaded[0] is not first and reloaded[0].game.state == first.game.state
+    assert store.stats()["reloads"] == 1
@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# scripts/ is not a package, so make simulate_difficulty importable directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from simulate_difficulty import simulate_orders, simulate_puzzle
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_orders_match_exact_probabilities():
+    # A and B start; C depends on A. Solving A first (probability 1/2)
+    # leaves {B, C} active; solving B first leaves only A.
+    dependencies = [[], [], [0]]
+    orders = simulate_orders(dependencies, [0, 1, 2], 40_000, np.random.default_rng(0), batch_size=7_000)
+    histogram = orders["active_histogram"]
+    assert histogram.sum(axis=1).tolist() == [40_000] * 3
+    assert histogram[0].tolist() == [0, 0, 40_000, 0]
+    assert histogram[1, 1] / 40_000 == pytest.approx(0.5, abs=0.02)
+    assert histogram[2].tolist() == [0, 40_000, 0, 0]
+    forced_rates = orders["forced"] / 40_000
+    assert forced_rates == pytest.approx([0.5, 0.25, 0.75], abs=0.02)
+
+def test_simulate_chain_puzzle():
+    result = simulate_puzzle(os.path.join(DATA_DIR, "test_game.json"), plays=500, seed=1)
+    assert result["errors"] == []
+    # Each clue depends on the previous one, so every move is forced.
+    assert result["openness"] == 1.0
+    assert result["forced_move_rate"] == 1.0
+    assert result["guesses"]["perfect"]["mean"] == result["clues"]
+    assert result["guesses"]["uniform"]["mean"] > result["clues"]
+    json.dumps(result)
+
+def test_simulate_is_reproducible_with_seed():
+    path = os.path.join(DATA_DIR, "valid_single_end_clue_game.json")
+    assert simulate_puzzle(path, plays=200, seed=3) == simulate_puzzle(path, plays=200, seed=3)
+
+def test_simulate_reports_unplayable_puzzle():
+    result = simulate_puzzle(os.path.join(DATA_DIR, "invalid_multiple_end_clues_game.json"), plays=10)
+    assert "exactly one end clue" in result["errors"][0]
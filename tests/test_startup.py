@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+# Budget for importing bracket_city_mcp.main, on top of the MCP SDK itself
+# (imported first). Registering the tools with FastMCP takes most of it.
+IMPORT_BUDGET_US = 300_000
+# Heavy modules the server must only import when they are first needed.
+DEFERRED_MODULES = ("numpy",)
+
+
+def import_times(cwd) -> dict[str, int]:
+    """
+    Imports the server in a fresh interpreter with `-X importtime`, from
+    `cwd`, and returns the cumulative import time of each module in
+    microseconds. The import itself must not load the puzzle.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import mcp.server.fastmcp; import bracket_city_mcp.main as main; assert main.game is None"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:"):
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_stays_within_budget(tmp_path):
+    # Run from elsewhere: the import must not depend on the working directory.
+    times = import_times(tmp_path)
+    assert times["bracket_city_mcp.main"] < IMPORT_BUDGET_US
+    for module in DEFERRED_MODULES:
+        assert module not in times, f"{module} is imported at startup"
@@ -0,0 +1,45 @@
+import pytest
+
+from bracket_city_mcp.game import Game
+from bracket_city_mcp.state_token import InvalidStateToken, StateTokenCodec, TokenState
+
+GAME_DATA = {
+    "clues": {
+        "#A#": {"clue": "a", "answer": "x", "depends_on": []},
+        "#B#": {"clue": "b", "answer": "y", "depends_on": []},
+        "#E#": {"clue": "#A# #B#", "answer": "", "depends_on": ["#A#", "#B#"]},
+    }
+}
+
+
+@pytest.fixture
+def game() -> Game:
+    game = Game(GAME_DATA)
+    game.game_id = "20250101"
+    return game
+
+def test_token_round_trip(game):
+    codec = StateTokenCodec(b"secret")
+    state = TokenState(completed_mask=0b011, incorrect_guesses=7)
+    token = codec.encode(game, state)
+    assert "=" not in token and "/" not in token
+    assert codec.decode(game, token) == state
+
+def test_token_rejects_tampering_and_other_keys(game):
+    codec = StateTokenCodec(b"secret")
+    token = codec.encode(game, TokenState(0b001, 0))
+    tampered = token[:-2] + ("A" if token[-2] != "A" else "B") + token[-1]
+    with pytest.raises(InvalidStateToken, match="signature"):
+        codec.decode(game, tampered)
+    with pytest.raises(InvalidStateToken, match="signature"):
+        StateTokenCodec(b"other").decode(game, token)
+    with pytest.raises(InvalidStateToken, match="Malformed"):
+        codec.decode(game, "!!")
+
+def test_token_rejects_other_puzzle_version(game):
+    codec = StateTokenCodec(b"secret")
+    token = codec.encode(game, TokenState(0, 0))
+    changed = Game({"clues": dict(GAME_DATA["clues"], **{"#A#": {"clue": "a", "answer": "z", "depends_on": []}})})
+    changed.game_id = "20250101"
+    with pytest.raises(InvalidStateToken, match="different puzzle"):
+        codec.decode(changed, token)